@@ -0,0 +1,276 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import print_function, unicode_literals
+
+import sys
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+
+import click
+import simplejson
+from flask import current_app
+from pytz import utc
+from speaklater import _LazyString
+
+from indico.cli.core import cli_group
+from indico.core.db import db
+from indico.modules.categories import Category
+from indico.modules.events import Event
+from indico.modules.events.contributions import Contribution
+from indico.modules.events.models.events import EventType
+from indico.modules.events.registration.models.forms import RegistrationForm
+from indico.modules.events.registration.models.registrations import Registration, RegistrationState
+from indico.modules.events.registration.util import create_personal_data_fields
+from indico.modules.events.timetable.legacy import TimetableSerializer
+from indico.modules.events.timetable.models.entries import TimetableEntry
+from indico.modules.rb.models.locations import Location
+from indico.modules.rb.models.reservations import RepeatFrequency, Reservation
+from indico.modules.rb.models.rooms import Room
+from indico.modules.rb.operations.bookings import get_rooms_availability
+from indico.modules.users import User
+from indico.util.benchmark import load_baseline, print_results, run_benchmark, save_baseline
+from indico.util.console import cformat, verbose_iterator
+from indico.util.json import dumps
+
+
+click.disable_unicode_literals_warning = True
+
+BENCHMARK_CATEGORY_TITLE = 'Benchmark data'
+BENCHMARK_LOCATION_NAME = 'Benchmark'
+BENCHMARK_START_DATE = date(2020, 1, 6)
+
+
+@cli_group()
+def cli():
+    pass
+
+
+def _get_benchmark_category():
+    return Category.query.filter_by(title=BENCHMARK_CATEGORY_TITLE, is_deleted=False).first()
+
+
+def _get_benchmark_location():
+    return Location.query.filter_by(name=BENCHMARK_LOCATION_NAME, is_deleted=False).first()
+
+
+def _create_category_tree(parent, depth, fanout, path=()):
+    if not depth:
+        return [parent]
+    leaves = []
+    for i in xrange(fanout):
+        child_path = path + (i + 1,)
+        child = Category(parent=parent, title='Category {}'.format('.'.join(map(unicode, child_path))),
+                         timezone='UTC', acl_entries=set())
+        leaves += _create_category_tree(child, depth - 1, fanout, child_path)
+    return leaves
+
+
+def _create_event(n, category, creator, num_contributions, num_registrations):
+    start_dt = utc.localize(datetime.combine(BENCHMARK_START_DATE + timedelta(days=n % 365), time(8)))
+    duration = timedelta(minutes=30)
+    event = Event(creator=creator, category=category, title='Event {}'.format(n), type_=EventType.conference,
+                  start_dt=start_dt, end_dt=start_dt + max(duration * num_contributions, timedelta(hours=1)),
+                  timezone='UTC', acl_entries=set())
+    for i in xrange(num_contributions):
+        contrib = Contribution(event=event, title='Contribution {}'.format(i + 1), duration=duration)
+        db.session.add(TimetableEntry(event=event, object=contrib, start_dt=start_dt + duration * i))
+    regform = RegistrationForm(event=event, title='Registration', currency='EUR')
+    create_personal_data_fields(regform)
+    for i in xrange(num_registrations):
+        Registration(event=event, registration_form=regform, first_name='Guinea', last_name='Pig {}'.format(i),
+                     email='pig{}-{}@example.com'.format(n, i), currency='EUR', state=RegistrationState.complete)
+    db.session.add(event)
+    return event
+
+
+def _create_rooms(owner, num_rooms, num_bookings):
+    location = Location(name=BENCHMARK_LOCATION_NAME)
+    db.session.add(location)
+    for i in xrange(num_rooms):
+        room = Room(location=location, owner=owner, building='1', floor='1', number=unicode(i + 1))
+        for j in xrange(num_bookings):
+            start_dt = datetime.combine(BENCHMARK_START_DATE + timedelta(days=j // 4), time(8 + 2 * (j % 4)))
+            reservation = Reservation(room=room, start_dt=start_dt, end_dt=start_dt + timedelta(hours=1),
+                                      repeat_frequency=RepeatFrequency.NEVER, repeat_interval=0,
+                                      booking_reason='Benchmark', booked_for_user=owner, created_by_user=owner)
+            reservation.create_occurrences(skip_conflicts=False)
+        db.session.add(room)
+
+
+@cli.command()
+@click.option('-u', '--user', 'user_id', type=int, required=True, metavar='USER_ID',
+              help='The user who will be used as the creator of the events and owner of the rooms')
+@click.option('--depth', type=click.IntRange(1), default=4, help='Depth of the category tree')
+@click.option('--fanout', type=click.IntRange(1), default=4, help='Number of subcategories per category')
+@click.option('--events', 'num_events', type=click.IntRange(1), default=2000, help='Number of events')
+@click.option('--contributions', 'num_contributions', type=click.IntRange(0), default=20,
+              help='Number of timetable contributions per event')
+@click.option('--registrations', 'num_registrations', type=click.IntRange(0), default=50,
+              help='Number of registrations per event')
+@click.option('--rooms', 'num_rooms', type=click.IntRange(1), default=50, help='Number of rooms')
+@click.option('--bookings', 'num_bookings', type=click.IntRange(0), default=200, help='Number of bookings per room')
+def seed(user_id, depth, fanout, num_events, num_contributions, num_registrations, num_rooms, num_bookings):
+    """Creates a large synthetic dataset for benchmarks.
+
+    This is meant to be used on a local development database; never
+    run it on a production instance!
+    """
+    if _get_benchmark_category() or _get_benchmark_location():
+        click.secho('The benchmark data already exists', fg='yellow')
+        sys.exit(1)
+    user = User.get(user_id, is_deleted=False)
+    if user is None:
+        click.secho('This user does not exist', fg='red')
+        sys.exit(1)
+    click.confirm('This will add a lot of data to the database ({}). Continue?'
+                  .format(current_app.config['SQLALCHEMY_DATABASE_URI']), abort=True)
+    root = Category(parent=Category.get_root(), title=BENCHMARK_CATEGORY_TITLE, timezone='UTC', acl_entries=set())
+    leaves = _create_category_tree(root, depth, fanout)
+    db.session.add(root)
+    _create_rooms(user, num_rooms, num_bookings)
+    db.session.commit()
+    leaf_ids = [c.id for c in leaves]
+    for n in verbose_iterator(xrange(num_events), num_events, lambda n: n, lambda n: '', print_every=100):
+        if n % 100 == 0:
+            # keep the identity map small to avoid slowing down the flushes
+            db.session.commit()
+            db.session.expunge_all()
+            user = User.get(user_id)
+        _create_event(n, Category.get(leaf_ids[n % len(leaf_ids)]), user, num_contributions, num_registrations)
+    db.session.commit()
+    click.secho('Benchmark data created in category {}'.format(_get_benchmark_category().id), fg='green')
+
+
+def _get_events(category_id, limit=None):
+    return (Event.query
+            .filter(Event.category_chain_overlaps(category_id), ~Event.is_deleted)
+            .order_by(Event.id)
+            .limit(limit)
+            .all())
+
+
+def _get_url(client, url):
+    resp = client.get(url)
+    if resp.status_code != 200:
+        raise click.ClickException('Request to {} failed with status {}'.format(url, resp.status))
+
+
+def _scenario_can_access(category_id, location_id, user_id):
+    def _run():
+        user = User.get(user_id) if user_id else None
+        for event in _get_events(category_id, 500):
+            event.can_access(user)
+    return _run
+
+
+def _scenario_category_display(category_id, location_id, user_id):
+    leaf_id = _get_events(category_id, 1)[0].category_id
+    client = current_app.test_client()
+    return lambda: _get_url(client, '/category/{}/'.format(leaf_id))
+
+
+def _scenario_http_api(category_id, location_id, user_id):
+    client = current_app.test_client()
+    return lambda: _get_url(client, '/export/categ/{}.json?limit=500'.format(category_id))
+
+
+def _scenario_room_availability(category_id, location_id, user_id):
+    start_dt = datetime.combine(BENCHMARK_START_DATE, time(9))
+    end_dt = datetime.combine(BENCHMARK_START_DATE + timedelta(days=30), time(10))
+
+    def _run():
+        rooms = Room.query.filter_by(location_id=location_id, is_deleted=False).all()
+        get_rooms_availability(rooms, start_dt, end_dt, RepeatFrequency.DAY, 1)
+    return _run
+
+
+def _scenario_timetable(category_id, location_id, user_id):
+    event_id = _get_events(category_id, 1)[0].id
+    return lambda: TimetableSerializer(Event.get(event_id)).serialize_timetable()
+
+
+class _ReferenceJSONEncoder(simplejson.JSONEncoder):
+    """The straightforward JSON encoder `indico.util.json` used to have."""
+
+    def default(self, o):
+        if isinstance(o, _LazyString):
+            return o.value
+        elif isinstance(o, datetime):
+            return {'date': str(o.date()), 'time': str(o.time()), 'tz': str(o.tzinfo)}
+        elif isinstance(o, date):
+            return str(o)
+        return simplejson.JSONEncoder.default(self, o)
+
+
+def _get_json_payload(category_id):
+    return {'count': 2000,
+            'results': [{'id': event.id, 'title': event.title, 'url': '/event/{}/'.format(event.id),
+                         'type': event.type_.title, 'startDate': event.start_dt, 'endDate': event.end_dt,
+                         'creationDate': event.created_dt.date(), 'timezone': event.timezone,
+                         'keywords': event.keywords}
+                        for event in _get_events(category_id, 2000)]}
+
+
+def _scenario_json(category_id, location_id, user_id):
+    payload = _get_json_payload(category_id)
+    return lambda: dumps(payload)
+
+
+def _scenario_json_reference(category_id, location_id, user_id):
+    payload = _get_json_payload(category_id)
+    return lambda: simplejson.dumps(payload, cls=_ReferenceJSONEncoder, separators=(',', ':')).replace('/', '\\/')
+
+
+SCENARIOS = OrderedDict([
+    ('can_access', _scenario_can_access),
+    ('category_display', _scenario_category_display),
+    ('http_api', _scenario_http_api),
+    ('json', _scenario_json),
+    ('json_reference', _scenario_json_reference),
+    ('room_availability', _scenario_room_availability),
+    ('timetable', _scenario_timetable),
+])
+
+
+@cli.command()
+@click.argument('scenarios', nargs=-1, type=click.Choice(SCENARIOS))
+@click.option('-r', '--repeat', type=click.IntRange(1), default=5, help='How many times each scenario is measured')
+@click.option('-u', '--user', 'user_id', type=int, default=None, metavar='USER_ID',
+              help='The user used for access checks (default: anonymous)')
+@click.option('-b', '--baseline', type=click.Path(exists=True, dir_okay=False),
+              help='Compare the results against a baseline file')
+@click.option('-s', '--save-baseline', 'save_baseline_path', type=click.Path(dir_okay=False),
+              help='Save the results as a baseline file')
+@click.option('-t', '--tolerance', type=float, default=0.2,
+              help='How much slower than the baseline a scenario may be before it is a regression (default: 0.2)')
+def run(scenarios, repeat, user_id, baseline, save_baseline_path, tolerance):
+    """Runs benchmark scenarios.
+
+    By default all scenarios are run; specify scenario names to only
+    run some of them.  When comparing against a baseline, the command
+    fails if any of the scenarios got slower or runs more queries.
+    """
+    category = _get_benchmark_category()
+    location = _get_benchmark_location()
+    if category is None or location is None:
+        click.secho('There is no benchmark data; run `indico benchmark seed` first', fg='red')
+        sys.exit(1)
+    if user_id and User.get(user_id, is_deleted=False) is None:
+        click.secho('This user does not exist', fg='red')
+        sys.exit(1)
+    results = []
+    for name in (scenarios or SCENARIOS):
+        click.echo(cformat('Running %{white!}{}%{reset}...').format(name))
+        func = SCENARIOS[name](category.id, location.id, user_id)
+        results.append(run_benchmark(name, func, repeat=repeat, setup=db.session.expunge_all))
+        db.session.rollback()
+    regression = print_results(results, load_baseline(baseline) if baseline else None, tolerance)
+    if save_baseline_path:
+        save_baseline(results, save_baseline_path)
+    if regression:
+        sys.exit(1)
@@ -86,6 +86,11 @@ def maint():
     """Perform maintenance operations."""
 
 
+@cli.group(cls=LazyGroup, import_name='indico.cli.benchmark:cli')
+def benchmark():
+    """Run performance benchmarks."""
+
+
 @cli.command(context_settings={'ignore_unknown_options': True, 'allow_extra_args': True}, add_help_option=False)
 @click.pass_context
 def celery(ctx):
@@ -173,3 +178,17 @@ def run(info, **kwargs):
 def shell(verbose, request_context):
     from .shell import shell_cmd
     shell_cmd(verbose, request_context)
+
+
+@cli.command(with_appcontext=False, short_help='Profile the startup of Indico.')
+@click.option('-l', '--limit', type=click.IntRange(1), default=30, help='How many imports to show (default: 30)')
+@click.option('-m', '--per-module', is_flag=True, help='Show the import time of each module instead of each package')
+def startup_profile(limit, per_module):
+    """Profile the startup of Indico.
+
+    This creates the Indico app like a web or celery worker does and
+    shows how long each step of the app creation takes, as well as the
+    modules and packages which are the slowest to import.
+    """
+    from .startup_profile import startup_profile_cmd
+    startup_profile_cmd(limit, per_module)
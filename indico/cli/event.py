@@ -13,6 +13,7 @@ import click
 
 from indico.cli.core import cli_group
 from indico.core.db import db
+from indico.modules.categories import Category
 from indico.modules.events import Event, EventLogKind, EventLogRealm
 from indico.modules.events.export import export_event, import_event
 from indico.modules.users.models.users import User
@@ -48,6 +49,36 @@ def restore(event_id, user_id, message):
     click.secho('Event undeleted: "{}"'.format(event.title), fg='green')
 
 
+@cli.command()
+@click.argument('event_ids', type=int, nargs=-1)
+@click.option('-c', '--category', 'category_id', type=int, metavar='CATEGORY_ID',
+              help='Delete all events directly inside this category.')
+@click.option('-u', '--user', 'user_id', type=int, default=None, metavar='USER_ID',
+              help='The user which will be shown on the log as having deleted the events (default: no user).')
+@click.option('-r', '--reason', default='Deleted using the CLI', help='The reason shown in the event logs')
+@click.option('-y', '--yes', is_flag=True, help='Delete the events without prompting')
+def delete(event_ids, category_id, user_id, reason, yes):
+    """Deletes events."""
+    query = Event.query.filter(~Event.is_deleted)
+    if category_id is not None:
+        query = query.filter(Event.category_id == category_id)
+    elif event_ids:
+        query = query.filter(Event.id.in_(event_ids))
+    else:
+        click.secho('You need to specify event ids or a category', fg='red')
+        sys.exit(1)
+    events = query.all()
+    if not events:
+        click.secho('No events to delete', fg='yellow')
+        sys.exit(1)
+    user = User.get(user_id) if user_id else None
+    if not yes:
+        click.confirm('Delete {} events?'.format(len(events)), abort=True)
+    Event.delete_many(events, reason, user)
+    db.session.commit()
+    click.secho('{} events deleted'.format(len(events)), fg='green')
+
+
 @cli.command()
 @click.argument('event_id', type=int)
 @click.argument('target_file', type=click.File('wb'))
@@ -68,6 +99,33 @@ def export(event_id, target_file):
     export_event(event, target_file)
 
 
+@cli.command('export-marcxml')
+@click.argument('category_id', type=int)
+@click.argument('target_file', type=click.File('wb'))
+@click.option('--contributions', is_flag=True, help='Also export the contributions and subcontributions')
+@click.option('--no-material', 'material', flag_value=False, default=True, help='Do not export attachments')
+@click.option('-u', '--user', 'user_id', type=int, default=None, metavar='USER_ID',
+              help='The user whose permissions are used to check access to attachments (default: anonymous)')
+def export_marcxml(category_id, target_file, contributions, material, user_id):
+    """Exports all events in a category tree as MARCXML.
+
+    The records are written incrementally so even very large
+    categories can be exported with a bounded amount of memory.
+    """
+    from indico.legacy.common.output import outputGenerator
+    category = Category.get(category_id, is_deleted=False)
+    if category is None:
+        click.secho('This category does not exist', fg='red')
+        sys.exit(1)
+    user = User.get(user_id) if user_id else None
+    events = (Event.query
+              .filter(Event.category_chain_overlaps(category.id), ~Event.is_deleted)
+              .order_by(Event.id)
+              .yield_per(100))
+    outputGenerator(user).eventsToXMLMarc21Stream(events, target_file, includeContribution=contributions,
+                                                  includeMaterial=material)
+
+
 @cli.command('import')
 @click.argument('source_file', type=click.File('rb'))
 @click.option('--create-users/--no-create-users', default=None,
@@ -0,0 +1,78 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from lxml import etree
+
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.legacy.common.output import MARC_NS, outputGenerator
+from indico.legacy.common.xmlGen import XMLGen
+from indico.modules.attachments.models.attachments import Attachment, AttachmentType
+from indico.modules.attachments.models.folders import AttachmentFolder
+from indico.modules.auth import Identity
+from indico.modules.events.contributions import Contribution
+from indico.modules.events.contributions.models.subcontributions import SubContribution
+from indico.util.string import encode_if_unicode
+
+
+def _export_in_memory(user, objects, include_material):
+    xg = XMLGen()
+    generator = outputGenerator(user, xg)
+    xg.openTag('marc:collection', [['xmlns:marc', MARC_NS]])
+    for obj in objects:
+        xg.openTag('marc:record')
+        if isinstance(obj, SubContribution):
+            generator.subContribToXMLMarc21(obj, includeMaterial=include_material)
+        elif isinstance(obj, Contribution):
+            generator.contribToXMLMarc21(obj, includeMaterial=include_material)
+        else:
+            generator.confToXMLMarc21(obj, includeMaterial=include_material)
+        xg.closeTag('marc:record')
+    xg.closeTag('marc:collection')
+    return encode_if_unicode(xg.getXml())
+
+
+def _get_records(xml):
+    # the in-memory generator adds whitespace around all elements
+    return [[(element.tag, dict(element.attrib), (element.text or '').strip()) for element in record.iter()]
+            for record in etree.fromstring(xml)]
+
+
+@pytest.mark.parametrize('include_contributions', (False, True))
+@pytest.mark.parametrize('include_material', (False, True))
+def test_export_marcxml_stream(db, create_event, create_contribution, create_user, include_contributions,
+                               include_material):
+    user = create_user(1)
+    user.identities.add(Identity(provider='ldap', identifier='guinea'))
+    events = [create_event(i, title='Event {}'.format(i)) for i in xrange(1, 4)]
+    events[1].protection_mode = ProtectionMode.protected
+    events[1].update_principal(user, read_access=True)
+    contrib = create_contribution(events[0], 'Contribution', timedelta(minutes=20))
+    contrib.protection_mode = ProtectionMode.protected
+    contrib.update_principal(user, read_access=True)
+    subcontrib = SubContribution(contribution=contrib, title='Subcontribution', duration=timedelta(minutes=10))
+    folder = AttachmentFolder(object=events[0], title='Slides')
+    Attachment(folder=folder, user=user, title='Link', type=AttachmentType.link, link_url='https://example.com')
+    db.session.flush()
+
+    objects = [events[0]]
+    if include_contributions:
+        objects += [contrib, subcontrib]
+    objects += events[1:]
+    expected = _export_in_memory(user, objects, include_material)
+
+    stream = BytesIO()
+    outputGenerator(user).eventsToXMLMarc21Stream(events, stream, includeContribution=include_contributions,
+                                                  includeMaterial=include_material, batch_size=2)
+    records = _get_records(stream.getvalue())
+    assert len(records) == len(objects)
+    assert records == _get_records(expected)
@@ -7,12 +7,17 @@
 
 from __future__ import unicode_literals
 
+import sys
+
 import click
+from jinja2.filters import do_filesizeformat
 
 from indico.cli.core import cli_group
+from indico.core.config import config
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.util.models import get_simple_column_attrs
+from indico.core.storage.backend import ContentAddressedFileSystemStorage
 from indico.modules.attachments import Attachment, AttachmentFolder
 from indico.modules.attachments.models.principals import AttachmentFolderPrincipal, AttachmentPrincipal
 from indico.modules.events.contributions import Contribution
@@ -106,3 +111,48 @@ def fix_event_role_acls():
                   default=True, abort=True)
     db.session.commit()
     click.secho('Success!', fg='green')
+
+
+@cli.command()
+@click.argument('backend_name', metavar='BACKEND')
+def dedup_storage(backend_name):
+    """Deduplicates the files of a storage backend.
+
+    This converts the folder of an existing `fs` storage backend so it
+    can be used with the `fs-cas` backend, which stores files with the
+    same content only once.  Identical files are replaced with links to
+    the same file, so it is safe to run this while Indico is running and
+    to keep using the `fs` backend until the config has been updated.
+
+    Files deleted through the `fs` backend leave behind the data they
+    shared with other files; running this again removes it.
+    """
+    try:
+        definition = config.STORAGE_BACKENDS[backend_name]
+    except KeyError:
+        click.secho('Storage backend does not exist: {}'.format(backend_name), fg='red')
+        sys.exit(1)
+    name, path = definition.split(':', 1)
+    if name not in ('fs', 'fs-cas'):
+        click.secho('Only file system storage backends can be deduplicated', fg='red')
+        sys.exit(1)
+    storage = ContentAddressedFileSystemStorage(path)
+    num_files = num_deduplicated = saved = 0
+    for file_id, size in storage.deduplicate():
+        num_files += 1
+        if size:
+            num_deduplicated += 1
+            saved += size
+        if num_files % 1000 == 0:
+            click.echo('{} files processed'.format(num_files))
+    click.secho('Deduplicated {} of {} files, saving {}'
+                .format(num_deduplicated, num_files, do_filesizeformat(saved)), fg='green')
+    num_removed = removed = 0
+    for size in storage.collect_garbage():
+        num_removed += 1
+        removed += size
+    if num_removed:
+        click.secho('Removed {} unused blobs, freeing {}'.format(num_removed, do_filesizeformat(removed)),
+                    fg='green')
+    if name == 'fs':
+        click.echo("Update the backend definition to 'fs-cas:{}' so new files are deduplicated as well".format(path))
@@ -0,0 +1,137 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import __builtin__
+import resource
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from importlib import import_module
+
+import click
+
+
+#: The steps of `make_app` which are timed separately
+APP_STEPS = ('configure_app', 'setup_jinja', 'configure_db', 'add_blueprints', 'setup_jinja_customization',
+             'add_plugin_blueprints')
+
+
+class ImportTimer(object):
+    """Measure how long it takes to import each module.
+
+    The time spent executing a module is attributed to it; the time
+    spent importing other modules from within it is attributed to those
+    modules instead.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self._stack = []
+        self._orig_import = None
+
+    def _import(self, name, *args, **kwargs):
+        known = set(sys.modules)
+        start = time.time()
+        # time and modules of the imports triggered by this import
+        self._stack.append([0, set()])
+        try:
+            return self._orig_import(name, *args, **kwargs)
+        finally:
+            children_duration, children_modules = self._stack.pop()
+            duration = time.time() - start
+            # python 2 adds `None` entries for failed implicit relative imports
+            new_modules = {n for n in set(sys.modules) - known if sys.modules[n] is not None}
+            if self._stack:
+                self._stack[-1][0] += duration
+                self._stack[-1][1] |= new_modules
+            own_modules = new_modules - children_modules
+            if own_modules:
+                self.times[max(own_modules, key=len)] += duration - children_duration
+
+    def exclude(self, duration):
+        """Do not count time spent on something else than importing."""
+        if self._stack:
+            self._stack[-1][0] += duration
+
+    @contextmanager
+    def __call__(self):
+        self._orig_import = __builtin__.__import__
+        __builtin__.__import__ = self._import
+        try:
+            yield self
+        finally:
+            __builtin__.__import__ = self._orig_import
+
+
+def _get_package(module_name):
+    parts = module_name.split('.')
+    if parts[0] != 'indico':
+        return parts[0]
+    elif parts[1:3] == ['modules', 'events'] and len(parts) > 4:
+        return '.'.join(parts[:4])
+    elif parts[1] == 'modules' and len(parts) > 3:
+        return '.'.join(parts[:3])
+    return '.'.join(parts[:2])
+
+
+def _get_memory():
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _time_step(name, steps, func, timer=None):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.time() - start
+            steps[name] = steps.get(name, 0) + duration
+            if timer:
+                timer.exclude(duration)
+    return wrapper
+
+
+def startup_profile_cmd(limit=30, per_module=False):
+    timer = ImportTimer()
+    steps = OrderedDict()
+    start_memory = _get_memory()
+    start = time.time()
+    with timer():
+        # the mappers are configured whenever a model is used for the first
+        # time, which often happens while importing some module
+        sa_mapper = import_module('sqlalchemy.orm.mapper')
+        sa_mapper.configure_mappers = _time_step('configure_mappers', steps, sa_mapper.configure_mappers, timer)
+        from indico.web.flask import app as app_module
+        from indico.core.plugins import plugin_engine
+        steps['import'] = time.time() - start
+        app_module.configure_mappers = sa_mapper.configure_mappers
+        for name in APP_STEPS:
+            setattr(app_module, name, _time_step(name, steps, getattr(app_module, name)))
+        plugin_engine.load_plugins = _time_step('load_plugins', steps, plugin_engine.load_plugins)
+        app_module.make_app(set_path=True)
+    total = time.time() - start
+
+    click.echo(click.style('App creation', fg='white', bold=True))
+    for name, duration in steps.iteritems():
+        click.echo('  {:>8.3f}s  {}'.format(duration, name))
+    click.echo('  {:>8.3f}s  {}'.format(total, click.style('total', bold=True)))
+    click.echo('  {:>8}MB  memory'.format(_get_memory() - start_memory))
+
+    import_times = defaultdict(float)
+    for module_name, duration in timer.times.iteritems():
+        import_times[module_name if per_module else _get_package(module_name)] += duration
+    click.echo(click.style('\nSlowest imports', fg='white', bold=True))
+    for name, duration in sorted(import_times.iteritems(), key=lambda x: -x[1])[:limit]:
+        click.echo('  {:>8.3f}s  {}'.format(duration, name))
+    total_label = click.style('total ({} modules)'.format(len(timer.times)), bold=True)
+    click.echo('  {:>8.3f}s  {}'.format(sum(import_times.itervalues()), total_label))
@@ -9,7 +9,7 @@ from __future__ import unicode_literals
 
 from sqlalchemy import DDL, Index, text
 from sqlalchemy.event import listens_for
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from sqlalchemy.sql.elements import conv
 
 from indico.util.string import to_unicode
@@ -40,7 +40,20 @@ def create_unaccent_function(conn):
     DDL(SQL_FUNCTION_UNACCENT).execute_if(callable_=_should_create_function).execute(conn)
 
 
-def define_unaccented_lowercase_index(column):
+def unaccented_lowercase(*columns):
+    """Get the unaccented lowercase version of one or more columns.
+
+    If more than one column is specified, their values are joined
+    with a space.  This is the same expression used for indexes
+    created with :func:`define_unaccented_lowercase_index`.
+    """
+    expr = columns[0]
+    for column in columns[1:]:
+        expr = expr + literal_column("' '") + column
+    return func.indico.indico_unaccent(func.lower(expr))
+
+
+def define_unaccented_lowercase_index(*columns):
     """Defines an index that uses the indico_unaccent function.
 
     Since this is usually used for searching, the column's value is
@@ -52,16 +65,23 @@ def define_unaccented_lowercase_index(column):
     The index will use the trgm operators which allow very efficient LIKE
     even when searching e.g. ``LIKE '%something%'``.
 
-    :param column: The column the index should be created on, e.g.
-                   ``User.first_name``
+    When passing multiple columns, the index is created on their values
+    joined with a space; use :func:`unaccented_lowercase` to get the
+    matching expression for queries.
+
+    :param columns: The column(s) the index should be created on, e.g.
+                    ``User.first_name``
     """
-    @listens_for(column.table, 'after_create')
+    table = columns[0].table
+
+    @listens_for(table, 'after_create')
     def _after_create(target, conn, **kw):
-        assert target is column.table
-        col_func = func.indico.indico_unaccent(func.lower(column))
+        assert target is table
+        col_func = unaccented_lowercase(*columns)
         index_kwargs = {'postgresql_using': 'gin',
                         'postgresql_ops': {col_func.key: 'gin_trgm_ops'}}
-        Index(conv('ix_{}_{}_unaccent'.format(column.table.name, column.name)), col_func, **index_kwargs).create(conn)
+        index_name = 'ix_{}_{}_unaccent'.format(table.name, '_'.join(column.name for column in columns))
+        Index(conv(index_name), col_func, **index_kwargs).create(conn)
 
 
 def unaccent_match(column, value, exact):
@@ -125,4 +125,5 @@ def apply_db_loggers(app, force=False):
                                                 'req_url': request.url if has_request_context() else None,
                                                 'req_path': request.path if has_request_context() else None,
                                                 'req_duration': stats['req_duration'],
-                                                'req_query_duration': stats['query_duration']})
+                                                'req_query_duration': stats['query_duration'],
+                                                'req_phases': stats['phases']})
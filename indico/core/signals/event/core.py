@@ -18,6 +18,14 @@ Called when an event is deleted. The *sender* is the event object.
 The `user` kwarg contains the user performing the deletion if available.
 """)
 
+deleted_many = _signals.signal('deleted-many', """
+Called when many events are deleted at once using `Event.delete_many`.
+The *sender* is the list of deleted events.  The `user` kwarg contains
+the user performing the deletion if available.  The `deleted` signal is
+NOT sent for the individual events in this case, so any code reacting to
+event deletions should handle this signal as well.
+""")
+
 updated = _signals.signal('updated', """
 Called when basic data of an event is updated. The *sender* is the event.
 A dict of changes is passed in the `changes` kwarg, with ``(old, new)``
@@ -5,9 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from .backend import FileSystemStorage, ReadOnlyFileSystemStorage, Storage, StorageError, StorageReadOnlyError
+from .backend import (ContentAddressedFileSystemStorage, FileSystemStorage, ReadOnlyFileSystemStorage, Storage,
+                      StorageError, StorageReadOnlyError)
 from .models import StoredFileMixin, VersionedResourceMixin
 
 
 __all__ = ('Storage', 'FileSystemStorage', 'StorageError', 'StorageReadOnlyError', 'ReadOnlyFileSystemStorage',
-           'VersionedResourceMixin', 'StoredFileMixin')
+           'ContentAddressedFileSystemStorage', 'VersionedResourceMixin', 'StoredFileMixin')
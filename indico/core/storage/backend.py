@@ -7,20 +7,23 @@
 
 from __future__ import unicode_literals
 
+import errno
 import os
+import shutil
 import sys
 from contextlib import contextmanager
-from hashlib import md5
+from hashlib import md5, sha256
 from io import BytesIO
 from tempfile import NamedTemporaryFile
 
+from werkzeug.exceptions import HTTPException
 from werkzeug.security import safe_join
 
 from indico.core import signals
 from indico.core.config import config
 from indico.util.signals import named_objects_from_signal
 from indico.util.string import return_ascii
-from indico.web.flask.util import send_file
+from indico.web.flask.util import make_conditional_response, send_file
 
 
 def get_storage(backend_name):
@@ -97,10 +100,13 @@ class Storage(object):
         """Ensures that fileobj is a file-like object and not a string"""
         return BytesIO(fileobj) if not hasattr(fileobj, 'read') else fileobj
 
-    def _copy_file(self, source, target, chunk_size=1024*1024):
+    def _copy_file(self, source, target, chunk_size=1024*1024, hashes=()):
         """Copy a file, in chunks, from ``source`` to ``target``.
 
         The return value will be the MD5 checksum of the file (hex).
+
+        :param hashes: Additional hashlib objects which are updated with
+                       the file's data while copying it.
         """
         checksum = md5()
         while True:
@@ -109,6 +115,8 @@ class Storage(object):
                 break
             target.write(chunk)
             checksum.update(chunk)
+            for hash_ in hashes:
+                hash_.update(chunk)
         return checksum.hexdigest().decode('ascii')
 
     def open(self, file_id):  # pragma: no cover
@@ -167,6 +175,22 @@ class Storage(object):
         """
         raise NotImplementedError
 
+    def copy(self, file_id, name, content_type, filename):
+        """Creates a copy of a file in the storage.
+
+        Backends which can copy files more efficiently than by reading
+        and saving them again (e.g. without transferring the data or by
+        sharing it between both files) should override this method.
+
+        :param file_id: The ID of the file within the storage backend.
+        :param name: A unique name for the new file (see `save`).
+        :param content_type: The content-type of the file.
+        :param filename: The original filename of the file.
+        :return: unicode -- A unique identifier for the new file.
+        """
+        with self.open(file_id) as fd:
+            return self.save(name, content_type, filename, fd)[0]
+
     def delete(self, file_id):  # pragma: no cover
         """Deletes a file from the storage.
 
@@ -202,6 +226,31 @@ class Storage(object):
         """
         raise NotImplementedError
 
+    def send_file_conditional(self, file_id, content_type, filename, inline=True, etag=None, last_modified=None):
+        """Sends the file to the client, honoring conditional requests.
+
+        This works like :meth:`send_file`, but clients that already have
+        the file get an empty 304 response and clients sending a
+        ``Range`` header only get the requested bytes.
+
+        The default implementation processes the response returned by
+        :meth:`send_file`, which works for any backend sending the file
+        data through Indico.  Backends which can serve ranges natively
+        (or redirect to an external service which does) should override
+        this method.
+
+        :param file_id: The ID of the file within the storage backend.
+        :param content_type: The content-type of the file.
+        :param filename: The file name to use when sending the file.
+        :param inline: Whether the file should be displayed inline or
+                       downloaded.
+        :param etag: The ETag of the file, usually its MD5 hash.
+        :param last_modified: A datetime indicating when the file was
+                              last modified.
+        """
+        rv = self.send_file(file_id, content_type, filename, inline=inline)
+        return make_conditional_response(rv, etag, last_modified)
+
     def __repr__(self):
         return '<{}()>'.format(type(self).__name__)
 
@@ -272,6 +321,15 @@ class FileSystemStorage(Storage):
         except Exception as e:
             raise StorageError('Could not send "{}": {}'.format(file_id, e)), None, sys.exc_info()[2]
 
+    def send_file_conditional(self, file_id, content_type, filename, inline=True, etag=None, last_modified=None):
+        try:
+            return send_file(filename, self._resolve_path(file_id).encode('utf-8'), content_type, inline=inline,
+                             etag=etag, last_modified=last_modified)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise StorageError('Could not send "{}": {}'.format(file_id, e)), None, sys.exc_info()[2]
+
     @return_ascii
     def __repr__(self):
         return '<FileSystemStorage: {}>'.format(self.path)
@@ -285,10 +343,251 @@ class ReadOnlyFileSystemStorage(ReadOnlyStorageMixin, FileSystemStorage):
         return '<ReadOnlyFileSystemStorage: {}>'.format(self.path)
 
 
+class ContentAddressedFileSystemStorage(FileSystemStorage):
+    """File system storage which stores identical files only once.
+
+    The data of each file is stored in a blob named after the SHA-256
+    hash of its content in the ``.cas`` folder of the storage.  The file
+    itself is a hard link to that blob, so the file IDs are the same as
+    in the plain `FileSystemStorage` and both backends can be used with
+    the same folder.  The link count of a blob is its reference count;
+    the blob is removed when the last file using it is deleted.
+
+    Since all links to a blob share its inode, the hash of each blob is
+    also stored in an index keyed by the inode, so the blob of a file
+    can be found without reading the file.
+    """
+
+    name = 'fs-cas'
+    blob_dir = '.cas'
+
+    def _get_blob_path(self, content_hash):
+        return os.path.join(self.path, self.blob_dir, content_hash[:2], content_hash[2:4], content_hash)
+
+    def _get_index_path(self, inode):
+        inode = '{:x}'.format(inode)
+        return os.path.join(self.path, self.blob_dir, 'inodes', inode[-2:], inode)
+
+    def _get_tmp_path(self, prefix):
+        path = os.path.join(self.path, self.blob_dir, 'tmp', prefix + os.urandom(8).encode('hex'))
+        self._ensure_dir(path)
+        return path
+
+    def _hash_file(self, path):
+        content_hash = sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024*1024), b''):
+                content_hash.update(chunk)
+        return content_hash.hexdigest()
+
+    def _ensure_dir(self, path):
+        basedir = os.path.dirname(path)
+        try:
+            os.makedirs(basedir)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                raise
+
+    def _link(self, source, target):
+        try:
+            os.link(source, target)
+        except OSError as exc:
+            if exc.errno != errno.EMLINK:
+                raise
+            # too many links to the same blob, so we have no choice but
+            # to store the file separately
+            shutil.copyfile(source, target)
+
+    def _index_blob(self, blob_path, content_hash):
+        """Remember the hash of the blob stored under its inode."""
+        index_path = self._get_index_path(os.stat(blob_path).st_ino)
+        tmp_path = self._get_tmp_path('index-')
+        os.symlink(content_hash, tmp_path)
+        self._ensure_dir(index_path)
+        # replaces a stale entry in case the inode has been reused
+        os.rename(tmp_path, index_path)
+
+    def _store_blob(self, path, content_hash, target):
+        """Link a new file to the blob with its content.
+
+        The blob is created from the file at `path` unless it already
+        exists.  That file is kept until `target` has been linked, so the
+        blob is never unused while the new file is being stored, even if
+        a file with the same content is deleted at the same time.
+
+        :return: The path of the blob
+        """
+        blob_path = self._get_blob_path(content_hash)
+        self._ensure_dir(blob_path)
+        while True:
+            try:
+                self._link(blob_path, target)
+            except EnvironmentError as exc:
+                if exc.errno != errno.ENOENT:
+                    raise
+            else:
+                return blob_path
+            # the blob does not exist (anymore, if the last file using it
+            # has just been deleted), so create it from our file
+            try:
+                os.link(path, blob_path)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+                # created by someone else in the meantime
+                continue
+            self._index_blob(blob_path, content_hash)
+
+    def _find_blob(self, path):
+        """Get the blob path of a file if it is stored as a blob"""
+        stat = os.stat(path)
+        if stat.st_nlink < 2:
+            return None
+        try:
+            blob_path = self._get_blob_path(os.readlink(self._get_index_path(stat.st_ino)))
+        except OSError:
+            blob_path = None
+        if blob_path and os.path.exists(blob_path) and os.path.samefile(path, blob_path):
+            return blob_path
+        # not indexed, e.g. because the storage folder has been restored
+        # from a backup, which changes the inodes
+        content_hash = self._hash_file(path)
+        blob_path = self._get_blob_path(content_hash)
+        if not os.path.exists(blob_path) or not os.path.samefile(path, blob_path):
+            return None
+        self._index_blob(blob_path, content_hash)
+        return blob_path
+
+    def _remove_blob_if_unused(self, blob_path):
+        """Remove a blob which is not used by any file anymore.
+
+        :return: The size of the removed blob or ``None`` if it is used.
+        """
+        stat = os.stat(blob_path)
+        if stat.st_nlink != 1:
+            return None
+        os.remove(blob_path)
+        index_path = self._get_index_path(stat.st_ino)
+        try:
+            if os.readlink(index_path) == os.path.basename(blob_path):
+                os.remove(index_path)
+        except OSError:
+            pass
+        return stat.st_size
+
+    def save(self, name, content_type, filename, fileobj):
+        try:
+            fileobj = self._ensure_fileobj(fileobj)
+            filepath = self._resolve_path(name)
+            if os.path.exists(filepath):
+                raise ValueError('A file with this name already exists')
+            self._ensure_dir(filepath)
+            content_hash = sha256()
+            with open(self._get_tmp_path('upload-'), 'wb') as f:
+                try:
+                    checksum = self._copy_file(fileobj, f, hashes=[content_hash])
+                except Exception:
+                    os.remove(f.name)
+                    raise
+            try:
+                self._store_blob(f.name, content_hash.hexdigest(), filepath)
+            finally:
+                os.remove(f.name)
+            return name, checksum
+        except Exception as e:
+            raise StorageError('Could not save "{}": {}'.format(name, e)), None, sys.exc_info()[2]
+
+    def copy(self, file_id, name, content_type, filename):
+        try:
+            filepath = self._resolve_path(name)
+            if os.path.exists(filepath):
+                raise ValueError('A file with this name already exists')
+            self._ensure_dir(filepath)
+            self._link(self._resolve_path(file_id), filepath)
+            return name
+        except Exception as e:
+            raise StorageError('Could not copy "{}": {}'.format(file_id, e)), None, sys.exc_info()[2]
+
+    def delete(self, file_id):
+        try:
+            path = self._resolve_path(file_id)
+            blob_path = self._find_blob(path)
+            os.remove(path)
+            if blob_path:
+                self._remove_blob_if_unused(blob_path)
+        except Exception as e:
+            raise StorageError('Could not delete "{}": {}'.format(file_id, e)), None, sys.exc_info()[2]
+
+    def deduplicate(self):
+        """Deduplicate the files which are not stored as blobs yet.
+
+        This is used to convert an existing `FileSystemStorage` folder.
+        Files with the same content are replaced with hard links to the
+        same blob.
+
+        :return: An iterator yielding a ``(file_id, size)`` tuple for
+                 each file; `size` is the number of bytes saved by
+                 deduplicating the file.
+        """
+        for dirpath, dirnames, filenames in os.walk(self.path):
+            if dirpath == self.path and self.blob_dir in dirnames:
+                dirnames.remove(self.blob_dir)
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                file_id = os.path.relpath(path, self.path)
+                if self._find_blob(path):
+                    yield file_id, 0
+                    continue
+                content_hash = self._hash_file(path)
+                blob_path = self._get_blob_path(content_hash)
+                if not os.path.exists(blob_path):
+                    self._ensure_dir(blob_path)
+                    os.link(path, blob_path)
+                    self._index_blob(blob_path, content_hash)
+                    yield file_id, 0
+                    continue
+                # replace the file with a link to the existing blob
+                size = os.path.getsize(path)
+                tmp_path = self._get_tmp_path('dedup-')
+                try:
+                    os.link(blob_path, tmp_path)
+                except OSError as exc:
+                    # too many links, or the blob has just been removed
+                    if exc.errno not in (errno.EMLINK, errno.ENOENT):
+                        raise
+                    yield file_id, 0
+                    continue
+                os.rename(tmp_path, path)
+                yield file_id, size
+
+    def collect_garbage(self):
+        """Remove the blobs which are not used by any file anymore.
+
+        This happens when files are deleted using a storage backend
+        which does not know about the blobs, such as the plain
+        `FileSystemStorage`.
+
+        :return: An iterator yielding the size of each removed blob.
+        """
+        blob_root = os.path.join(self.path, self.blob_dir)
+        for dirpath, dirnames, filenames in os.walk(blob_root):
+            if dirpath == blob_root:
+                dirnames[:] = [d for d in dirnames if d not in ('tmp', 'inodes')]
+            for filename in filenames:
+                size = self._remove_blob_if_unused(os.path.join(dirpath, filename))
+                if size is not None:
+                    yield size
+
+    @return_ascii
+    def __repr__(self):
+        return '<ContentAddressedFileSystemStorage: {}>'.format(self.path)
+
+
 @signals.get_storage_backends.connect
 def _get_storage_backends(sender, **kwargs):
     yield FileSystemStorage
     yield ReadOnlyFileSystemStorage
+    yield ContentAddressedFileSystemStorage
 
 
 @signals.app_created.connect
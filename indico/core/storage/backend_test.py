@@ -8,12 +8,13 @@
 from __future__ import unicode_literals
 
 import os
+import shutil
 from io import BytesIO
 
 import pytest
 
-from indico.core.storage import (FileSystemStorage, ReadOnlyFileSystemStorage, Storage, StorageError,
-                                 StorageReadOnlyError)
+from indico.core.storage import (ContentAddressedFileSystemStorage, FileSystemStorage, ReadOnlyFileSystemStorage,
+                                 Storage, StorageError, StorageReadOnlyError)
 
 
 @pytest.fixture
@@ -21,6 +22,17 @@ def fs_storage(tmpdir):
     return FileSystemStorage(tmpdir.strpath)
 
 
+@pytest.fixture
+def cas_storage(tmpdir):
+    return ContentAddressedFileSystemStorage(tmpdir.strpath)
+
+
+def _count_blobs(storage):
+    blob_root = os.path.join(storage.path, '.cas')
+    return sum(len(files) for dirpath, dirnames, files in os.walk(blob_root)
+               if os.path.relpath(dirpath, blob_root).split(os.sep)[0] not in ('tmp', 'inodes'))
+
+
 @pytest.mark.parametrize('data', ('foo', 'foo=bar,', ','))
 def test_parse_data_invalid(data):
     with pytest.raises(ValueError):
@@ -128,6 +140,46 @@ def test_fs_send_file(fs_storage):
     assert ''.join(response.response) == 'hello world'
 
 
+@pytest.mark.parametrize('native', (True, False))
+@pytest.mark.parametrize(('headers', 'status', 'body'), (
+    ({}, 200, 'hello world'),
+    ({'If-None-Match': '"abc"'}, 304, ''),
+    ({'If-None-Match': '"xyz"'}, 200, 'hello world'),
+    ({'Range': 'bytes=6-'}, 206, 'world'),
+    ({'Range': 'bytes=0-4', 'If-Range': '"abc"'}, 206, 'hello'),
+    ({'Range': 'bytes=0-4', 'If-Range': '"xyz"'}, 200, 'hello world'),
+))
+def test_fs_send_file_conditional(app, fs_storage, native, headers, status, body):
+    class CustomStorage(FileSystemStorage):
+        def send_file_conditional(self, *args, **kwargs):
+            return Storage.send_file_conditional(self, *args, **kwargs)
+
+    storage = fs_storage if native else CustomStorage(fs_storage.path)
+    f, __ = storage.save('test.txt', 'unused/unused', 'unused', b'hello world')
+    with app.test_request_context(headers=headers):
+        response = storage.send_file_conditional(f, 'text/plain', 'test.txt', etag='abc')
+        assert response.status_code == status
+        assert response.headers['ETag'] == '"abc"'
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        if status != 304:
+            assert ''.join(response.response) == body
+
+
+def test_fs_send_file_conditional_xsendfile(app, fs_storage, mocker):
+    mocker.patch.dict(app.config, {'USE_X_SENDFILE': True})
+    f, __ = fs_storage.save('test.txt', 'unused/unused', 'unused', b'x' * 1000)
+    with app.test_request_context(headers={'Range': 'bytes=0-9'}):
+        response = fs_storage.send_file_conditional(f, 'text/plain', 'test.txt', etag='abc')
+        # the web server sends the file so it needs to handle the range as well
+        assert response.status_code == 200
+        assert 'Content-Range' not in response.headers
+        assert response.headers['X-Sendfile'] == fs_storage._resolve_path(f)
+    with app.test_request_context(headers={'If-None-Match': '"abc"'}):
+        response = fs_storage.send_file_conditional(f, 'text/plain', 'test.txt', etag='abc')
+        assert response.status_code == 304
+        assert 'X-Sendfile' not in response.headers
+
+
 @pytest.mark.usefixtures('request_context')
 def test_fs_readonly(fs_storage):
     f, __ = fs_storage.save('test.txt', 'unused/unused', 'unused', b'hello world')
@@ -164,3 +216,90 @@ def test_storage_get_local_path(fs_storage):
         with open(path, 'rb') as fd:
             assert fd.read() == b'hello world'
     assert not os.path.exists(path)
+
+
+def test_cas_save_dedup(cas_storage):
+    f1, checksum1 = cas_storage.save('a/test.txt', 'unused/unused', 'unused', b'hello test')
+    f2, checksum2 = cas_storage.save('b/test.txt', 'unused/unused', 'unused', BytesIO(b'hello test'))
+    f3, checksum3 = cas_storage.save('c/test.txt', 'unused/unused', 'unused', b'something else')
+    assert checksum1 == checksum2 != checksum3
+    assert cas_storage.open(f1).read() == cas_storage.open(f2).read() == b'hello test'
+    assert cas_storage.open(f3).read() == b'something else'
+    assert os.path.samefile(cas_storage._resolve_path(f1), cas_storage._resolve_path(f2))
+    assert _count_blobs(cas_storage) == 2
+    assert not os.listdir(os.path.join(cas_storage.path, '.cas', 'tmp'))
+
+
+def test_cas_delete(cas_storage):
+    f1, __ = cas_storage.save('a.txt', 'unused/unused', 'unused', b'hello test')
+    f2 = cas_storage.copy(f1, 'b.txt', 'unused/unused', 'unused')
+    assert os.path.samefile(cas_storage._resolve_path(f1), cas_storage._resolve_path(f2))
+    cas_storage.delete(f1)
+    assert _count_blobs(cas_storage) == 1
+    assert cas_storage.open(f2).read() == b'hello test'
+    cas_storage.delete(f2)
+    assert _count_blobs(cas_storage) == 0
+    with pytest.raises(StorageError):
+        cas_storage.copy(f2, 'c.txt', 'unused/unused', 'unused')
+
+
+def test_cas_delete_uses_index(mocker, cas_storage):
+    f1, __ = cas_storage.save('a.txt', 'unused/unused', 'unused', b'hello test')
+    f2, __ = cas_storage.save('b.txt', 'unused/unused', 'unused', b'hello test')
+    hash_file = mocker.spy(cas_storage, '_hash_file')
+    cas_storage.delete(f1)
+    assert not hash_file.called
+    # without the index (e.g. after restoring a backup) the file is hashed
+    shutil.rmtree(os.path.join(cas_storage.path, '.cas', 'inodes'))
+    cas_storage.delete(f2)
+    assert hash_file.call_count == 1
+    assert _count_blobs(cas_storage) == 0
+
+
+def test_cas_save_concurrent_delete(mocker, cas_storage):
+    f1, __ = cas_storage.save('a.txt', 'unused/unused', 'unused', b'hello test')
+    orig_link = cas_storage._link
+
+    def _link(source, target):
+        # the only file using the blob is deleted while saving a new one
+        if target.endswith('b.txt') and os.path.exists(cas_storage._resolve_path(f1)):
+            cas_storage.delete(f1)
+        orig_link(source, target)
+
+    mocker.patch.object(cas_storage, '_link', side_effect=_link)
+    f2, __ = cas_storage.save('b.txt', 'unused/unused', 'unused', b'hello test')
+    assert cas_storage.open(f2).read() == b'hello test'
+    assert _count_blobs(cas_storage) == 1
+    assert cas_storage._find_blob(cas_storage._resolve_path(f2))
+
+
+def test_cas_deduplicate(fs_storage):
+    fs_storage.save('a/test.txt', 'unused/unused', 'unused', b'hello test')
+    fs_storage.save('b/test.txt', 'unused/unused', 'unused', b'hello test')
+    fs_storage.save('c/test.txt', 'unused/unused', 'unused', b'something else')
+    cas_storage = ContentAddressedFileSystemStorage(fs_storage.path)
+    result = dict(cas_storage.deduplicate())
+    assert set(result) == {'a/test.txt', 'b/test.txt', 'c/test.txt'}
+    assert result['c/test.txt'] == 0
+    assert sorted([result['a/test.txt'], result['b/test.txt']]) == [0, 10]
+    assert os.path.samefile(cas_storage._resolve_path('a/test.txt'), cas_storage._resolve_path('b/test.txt'))
+    assert cas_storage.open('b/test.txt').read() == b'hello test'
+    assert _count_blobs(cas_storage) == 2
+    # running it again does not change anything
+    assert set(cas_storage.deduplicate()) == {('a/test.txt', 0), ('b/test.txt', 0), ('c/test.txt', 0)}
+    cas_storage.delete('a/test.txt')
+    cas_storage.delete('b/test.txt')
+    assert _count_blobs(cas_storage) == 1
+
+
+def test_cas_collect_garbage(fs_storage):
+    fs_storage.save('a/test.txt', 'unused/unused', 'unused', b'hello test')
+    fs_storage.save('b/test.txt', 'unused/unused', 'unused', b'something else')
+    cas_storage = ContentAddressedFileSystemStorage(fs_storage.path)
+    list(cas_storage.deduplicate())
+    # deleting a file without the cas backend leaves its blob behind
+    fs_storage.delete('a/test.txt')
+    assert _count_blobs(cas_storage) == 2
+    assert list(cas_storage.collect_garbage()) == [10]
+    assert _count_blobs(cas_storage) == 1
+    assert cas_storage.open('b/test.txt').read() == b'something else'
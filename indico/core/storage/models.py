@@ -198,6 +198,29 @@ class StoredFileMixin(object):
         self.storage_file_id, self.md5 = self.storage.save(path, self.content_type, self.filename, data)
         self.size = self.storage.getsize(self.storage_file_id)
 
+    def save_copy(self, other):
+        """Saves a copy of the file of another stored file.
+
+        If both files use the same storage backend, the backend may
+        copy the file without transferring its data (see
+        :meth:`.Storage.copy`).
+
+        :param other: A `StoredFileMixin` object containing the file
+                      to copy
+        """
+        assert self.storage_backend is None and self.storage_file_id is None and self.size is None
+        if self.version_of:
+            assert getattr(self, self.version_of) is not None
+        storage_backend, path = self._build_storage_path()
+        if storage_backend != other.storage_backend:
+            with other.open() as fd:
+                self.save(fd)
+            return
+        self.storage_backend = storage_backend
+        self.storage_file_id = self.storage.copy(other.storage_file_id, path, self.content_type, self.filename)
+        self.md5 = other.md5
+        self.size = other.size
+
     def open(self):
         """Returns the stored file as a file-like object"""
         if self.storage_file_id is None:
@@ -205,10 +228,16 @@ class StoredFileMixin(object):
         return self.storage.open(self.storage_file_id)
 
     def send(self, inline=True):
-        """Sends the file to the user"""
+        """Sends the file to the user.
+
+        The MD5 hash of the file is used as its ETag, so clients which
+        already have the file get a 304 response.  Range requests are
+        supported as well.
+        """
         if self.storage_file_id is None:
             raise Exception('There is no file to send')
-        return self.storage.send_file(self.storage_file_id, self.content_type, self.filename, inline=inline)
+        return self.storage.send_file_conditional(self.storage_file_id, self.content_type, self.filename,
+                                                  inline=inline, etag=self.md5, last_modified=self.created_dt)
 
     def delete(self, delete_from_db=False):
         """Delete the file from storage"""
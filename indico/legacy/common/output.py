@@ -11,19 +11,30 @@ import string
 from collections import defaultdict
 from datetime import datetime
 
-from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm import contains_eager, joinedload, load_only, selectinload
 
-from indico.legacy.common.xmlGen import XMLGen
+from indico.core.db.sqlalchemy.links import LinkType
+from indico.legacy.common.xmlGen import XMLFileGen, XMLGen
 from indico.modules.attachments.models.attachments import Attachment, AttachmentType
 from indico.modules.attachments.models.folders import AttachmentFolder
+from indico.modules.auth import Identity
+from indico.modules.events import Event
+from indico.modules.events.contributions import Contribution
+from indico.modules.events.contributions.models.subcontributions import SubContribution
 from indico.modules.groups import GroupProxy
 from indico.modules.groups.legacy import LDAPGroupWrapper
 from indico.modules.users import User
 from indico.modules.users.legacy import AvatarUserWrapper
 from indico.util.event import uniqueId
+from indico.util.struct.iterables import grouper
 from indico.web.flask.util import url_for
 
 
+MARC_NS = 'http://www.loc.gov/MARC21/slim'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+MARC_SCHEMA_LOCATION = 'http://www.loc.gov/MARC21/slim http://www.loc.gov/standards/marcxml/schema/MARC21slim.xsd'
+
+
 def get_map_url(item):
     return item.room.map_url if item.room else None
 
@@ -38,6 +49,104 @@ class outputGenerator(object):
         self.text = ""
         self.time_XML = 0
         self.time_HTML = 0
+        self._clear_preloaded_data()
+
+    def _clear_preloaded_data(self):
+        self._access_lists = {}
+        self._user_logins = {}
+        self._attachments = None
+
+    def _get_access_list(self, obj):
+        """Get the access list of an object.
+
+        This mirrors `ProtectionMixin.get_access_list` but memoizes the
+        result for every object in the protection chain, so exporting
+        many objects with the same parents only walks the chain once.
+        """
+        try:
+            return self._access_lists[obj]
+        except KeyError:
+            pass
+        access_list = {x.principal for x in obj.acl_entries if x.read_access}
+        if obj.is_self_protected:
+            access_list |= obj.get_manager_list(recursive=True)
+        elif obj.is_inheriting and obj.is_protected:
+            access_list |= obj.get_manager_list()
+            if obj.protection_parent:
+                access_list |= self._get_access_list(obj.protection_parent)
+        else:
+            access_list = set()
+        self._access_lists[obj] = access_list
+        return access_list
+
+    def _get_user_logins(self, user):
+        try:
+            return self._user_logins[user.id]
+        except KeyError:
+            return {identifier for provider, identifier in user.iter_identifiers() if provider != 'indico'}
+
+    def _iter_linked_objects(self, events, include_contributions):
+        for event in events:
+            yield event
+            if not include_contributions:
+                continue
+            for contrib in event.contributions:
+                yield contrib
+                for subcontrib in contrib.subcontributions:
+                    yield subcontrib
+
+    def _preload_data(self, events, include_contributions=True, include_material=True):
+        """Preload access and attachment data for a batch of events.
+
+        The access lists of all exported objects are computed and the
+        external identities of all users in them are loaded using a
+        single query.  If material is exported, the attachments of all
+        the events are loaded at once as well.
+        """
+        self._clear_preloaded_data()
+        event_ids = {e.id for e in events}
+        # populate the relationships of the already-loaded objects
+        event_options = [selectinload('acl_entries'), selectinload('person_links')]
+        if include_contributions:
+            event_options.append(selectinload('contributions'))
+        Event.query.filter(Event.id.in_(event_ids)).options(*event_options).all()
+        if include_contributions:
+            (Contribution.query
+             .filter(Contribution.event_id.in_(event_ids), ~Contribution.is_deleted)
+             .options(selectinload('acl_entries'), selectinload('subcontributions'))
+             .all())
+        for obj in self._iter_linked_objects(events, include_contributions):
+            self._get_access_list(obj.contribution if isinstance(obj, SubContribution) else obj)
+        if include_material:
+            self._attachments = defaultdict(list)
+            # only the material of exported objects is needed
+            link_types = [LinkType.event]
+            if include_contributions:
+                link_types += [LinkType.contribution, LinkType.subcontribution]
+            query = (Attachment.query
+                     .join(Attachment.folder)
+                     .filter(AttachmentFolder.event_id.in_(event_ids),
+                             AttachmentFolder.link_type.in_(link_types),
+                             ~AttachmentFolder.is_deleted,
+                             ~Attachment.is_deleted)
+                     .options(contains_eager(Attachment.folder),
+                              joinedload(Attachment.legacy_mapping)))
+            for attachment in query:
+                self._attachments[attachment.folder.object].append(attachment)
+            for attachments in self._attachments.itervalues():
+                for attachment in attachments:
+                    self._attachment_access_list(attachment)
+        user_ids = {principal.id
+                    for access_list in self._access_lists.itervalues()
+                    for principal in access_list
+                    if isinstance(principal, User)}
+        if user_ids:
+            self._user_logins = {user_id: set() for user_id in user_ids}
+            query = (Identity.query
+                     .filter(Identity.user_id.in_(user_ids), Identity.provider != 'indico')
+                     .options(load_only('user_id', 'identifier')))
+            for identity in query:
+                self._user_logins[identity.user_id].add(identity.identifier)
 
     def _getRecordCollection(self, obj):
         if obj.is_protected:
@@ -77,7 +186,7 @@ class outputGenerator(object):
         """
 
         if acl is None:
-            acl = obj.get_access_list()
+            acl = self._get_access_list(obj)
 
         # Populate two lists holding email/group strings instead of
         # Avatar/Group objects
@@ -89,9 +198,7 @@ class outputGenerator(object):
                 if isinstance(user_obj, AvatarUserWrapper):
                     user_obj = user_obj.user
                 # user names for all non-local accounts
-                for provider, identifier in user_obj.iter_identifiers():
-                    if provider != 'indico':
-                        allowed_logins.add(identifier)
+                allowed_logins |= self._get_user_logins(user_obj)
             elif isinstance(user_obj, LDAPGroupWrapper):
                 allowed_groups.append(user_obj.getId())
             elif isinstance(user_obj, GroupProxy) and not user_obj.is_local:
@@ -112,10 +219,42 @@ class outputGenerator(object):
     def confToXMLMarc21(self, event, includeSession=1, includeContribution=1, includeMaterial=1, out=None):
         if not out:
             out = self._XMLGen
-        temp = XMLGen(init=False)
-        self._event_to_xml_marc_21(event, includeSession, includeContribution, includeMaterial, out=temp)
-        xml = temp.getXml()
-        out.writeXML(xml)
+        self._event_to_xml_marc_21(event, includeSession, includeContribution, includeMaterial, out=out)
+
+    def eventsToXMLMarc21Stream(self, events, fileobj, includeContribution=False, includeMaterial=True,
+                                batch_size=100):
+        """Write a MARCXML collection containing the given events.
+
+        The XML is written to `fileobj` incrementally, so the memory
+        usage does not depend on the number of exported records.
+        Access and attachment data is preloaded for each batch of
+        `batch_size` events.
+
+        :param events: An iterable (e.g. a query) of events
+        :param fileobj: A file-like object to write the XML to
+        :param includeContribution: Whether to also export records for
+                                    the contributions and subcontributions
+                                    of the events
+        :param includeMaterial: Whether to include attachments
+        """
+        with XMLFileGen(fileobj) as out:
+            out.openTag('{%s}collection' % MARC_NS, [['{%s}schemaLocation' % XSI_NS, MARC_SCHEMA_LOCATION]],
+                        nsmap={'marc': MARC_NS, 'xsi': XSI_NS})
+            for batch in grouper(events, batch_size, skip_missing=True):
+                self._preload_data(batch, include_contributions=includeContribution,
+                                   include_material=includeMaterial)
+                for obj in self._iter_linked_objects(batch, includeContribution):
+                    out.openTag('{%s}record' % MARC_NS)
+                    if isinstance(obj, SubContribution):
+                        self._subcontrib_to_marc_xml_21(obj, includeMaterial, out=out)
+                    elif isinstance(obj, Contribution):
+                        self._contrib_to_marc_xml_21(obj, includeMaterial, out=out)
+                    else:
+                        self._event_to_xml_marc_21(obj, includeMaterial=includeMaterial, out=out)
+                    out.closeTag('{%s}record' % MARC_NS)
+                out.flush()
+            out.closeTag('{%s}collection' % MARC_NS)
+        self._clear_preloaded_data()
 
     def _generate_category_path(self, event, out):
         path = [unicode(c.id) for c in event.category.chain_query.options(load_only('id'))]
@@ -231,10 +370,7 @@ class outputGenerator(object):
     def contribToXMLMarc21(self, contrib, includeMaterial=1, out=None):
         if not out:
             out = self._XMLGen
-        temp = XMLGen(init=False)
-        self._contrib_to_marc_xml_21(contrib, includeMaterial, out=temp)
-        xml = temp.getXml()
-        out.writeXML(xml)
+        self._contrib_to_marc_xml_21(contrib, includeMaterial, out=out)
 
     def _contrib_to_marc_xml_21(self, contrib, include_material=1, out=None):
         if not out:
@@ -365,10 +501,7 @@ class outputGenerator(object):
     def subContribToXMLMarc21(self,subCont,includeMaterial=1, out=None):
         if not out:
             out = self._XMLGen
-        temp = XMLGen(init=False)
-        self._subcontrib_to_marc_xml_21(subCont,includeMaterial, out=temp)
-        xml = temp.getXml()
-        out.writeXML(xml)
+        self._subcontrib_to_marc_xml_21(subCont,includeMaterial, out=out)
 
     def _subcontrib_to_marc_xml_21(self, subcontrib, includeMaterial=1, out=None):
         if not out:
@@ -443,9 +576,13 @@ class outputGenerator(object):
     def materialToXMLMarc21(self, obj, out=None):
         if not out:
             out = self._XMLGen
-        for attachment in (Attachment.find(~AttachmentFolder.is_deleted, AttachmentFolder.object == obj,
+        if self._attachments is not None:
+            attachments = self._attachments.get(obj, [])
+        else:
+            attachments = (Attachment.find(~AttachmentFolder.is_deleted, AttachmentFolder.object == obj,
                                            is_deleted=False, _join=AttachmentFolder)
-                                     .options(joinedload(Attachment.legacy_mapping))):
+                                     .options(joinedload(Attachment.legacy_mapping)))
+        for attachment in attachments:
             if attachment.can_access(self.__user):
                 self.resourceToXMLMarc21(attachment, out)
                 self._generateAccessList(acl=self._attachment_access_list(attachment), out=out,
@@ -468,15 +605,21 @@ class outputGenerator(object):
         return 'INDICO.{}'.format(unique_id) if add_prefix else unique_id
 
     def _attachment_access_list(self, attachment):
+        try:
+            return self._access_lists[attachment]
+        except KeyError:
+            pass
         linked_object = attachment.folder.object
         manager_list = set(linked_object.get_manager_list(recursive=True))
 
         if attachment.is_self_protected:
-            return {e for e in attachment.acl} | manager_list
-        if attachment.is_inheriting and attachment.folder.is_self_protected:
-            return {e for e in attachment.folder.acl} | manager_list
+            access_list = {e for e in attachment.acl} | manager_list
+        elif attachment.is_inheriting and attachment.folder.is_self_protected:
+            access_list = {e for e in attachment.folder.acl} | manager_list
         else:
-            return linked_object.get_access_list()
+            access_list = self._get_access_list(linked_object)
+        self._access_lists[attachment] = access_list
+        return access_list
 
     def resourceLinkToXMLMarc21(self, attachment, out=None):
         if not out:
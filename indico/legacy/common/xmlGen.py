@@ -7,10 +7,17 @@
 
 # flake8: noqa
 
+import re
+from collections import OrderedDict
 from xml.sax import saxutils
 
+from lxml import etree
+
 from indico.legacy.common.utils import encodeUnicode
-from indico.util.string import encode_if_unicode
+from indico.util.string import encode_if_unicode, to_unicode
+
+
+_illegal_xml_chars_re = re.compile(u'[\x00-\x08\x0b\x0c\x0e-\x1f]')
 
 
 class XMLGen:
@@ -86,3 +93,70 @@ class XMLGen:
             else:
                 cm.append(chr(c))
         return str(encode_if_unicode(text)).translate("".join(cm))
+
+
+class XMLFileGen(object):
+    """Streaming counterpart of :class:`XMLGen`.
+
+    It provides the same tag-writing API, but uses lxml's incremental
+    `xmlfile` writer so each element is written to `fileobj` as soon
+    as it has been closed instead of keeping the whole document in
+    memory.  It needs to be used as a context manager::
+
+        with XMLFileGen(f) as out:
+            out.openTag('foo')
+            out.writeTag('bar', 'test')
+            out.closeTag('foo')
+    """
+
+    def __init__(self, fileobj, encoding='utf-8'):
+        self._xmlfile = etree.xmlfile(fileobj, encoding=encoding)
+        self._writer = None
+        self._stack = []
+
+    def __enter__(self):
+        self._writer = self._xmlfile.__enter__()
+        self._writer.write_declaration()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        while self._stack:
+            self._stack.pop()[1].__exit__(exc_type, exc_val, exc_tb)
+        return self._xmlfile.__exit__(exc_type, exc_val, exc_tb)
+
+    def _clean(self, value):
+        return _illegal_xml_chars_re.sub(u' ', to_unicode(value))
+
+    def _attrib(self, listAttrib):
+        return OrderedDict((name, self._clean(value)) for name, value in listAttrib)
+
+    def openTag(self, name, listAttrib=(), single=False, nsmap=None):
+        context = self._writer.element(name, self._attrib(listAttrib), nsmap=nsmap)
+        context.__enter__()
+        self._stack.append((name, context))
+
+    def closeTag(self, name, single=False):
+        open_name, context = self._stack.pop()
+        if open_name != name:
+            raise ValueError('Cannot close {} while {} is open'.format(name, open_name))
+        context.__exit__(None, None, None)
+
+    def writeText(self, text, single=False):
+        if text != '':
+            self._writer.write(self._clean(text))
+
+    def writeTag(self, name, value, ListAttrib=()):
+        element = etree.Element(name, self._attrib(ListAttrib))
+        element.text = self._clean(value)
+        self._writer.write(element)
+
+    def writeXML(self, text):
+        fragment = etree.fromstring('<fragment>{}</fragment>'.format(encode_if_unicode(text)))
+        if fragment.text:
+            self._writer.write(fragment.text)
+        for element in fragment:
+            self._writer.write(element)
+
+    def flush(self):
+        """Write all pending data to the underlying file."""
+        self._writer.flush()
@@ -8,6 +8,7 @@
 # flake8: noqa
 
 import re
+from collections import defaultdict
 from copy import deepcopy
 from datetime import timedelta
 from operator import attrgetter
@@ -21,8 +22,8 @@ from reportlab.platypus import Table, TableStyle
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.rl_config import defaultPageSize
 from speaklater import is_lazy_string
+from sqlalchemy.orm import joinedload, subqueryload
 
-from indico.core.db import db
 from indico.legacy.common import utils
 from indico.legacy.pdfinterface.base import PageBreak, Paragraph, PDFBase, PDFWithTOC, Spacer, escape, modifiedFontSize
 from indico.modules.events.layout.util import get_menu_entry_by_name
@@ -220,6 +221,40 @@ class TimetablePDFFormat:
         return self.tableContents
 
 
+def _get_timetable_entries_by_day(event, load_children=True):
+    """Get the top-level timetable entries of an event for each day.
+
+    All entries are loaded at once together with the objects shown in
+    the PDF, instead of querying each day and each object separately.
+
+    :param load_children: Whether to also load the entries inside
+                          session blocks and the subcontributions.
+    """
+    event.preload_all_acl_entries()
+    block_strategy = joinedload('session_block')
+    block_strategy.joinedload('session')
+    block_strategy.subqueryload('person_links')
+    contrib_strategy = joinedload('contribution')
+    contrib_strategy.subqueryload('person_links')
+    options = [block_strategy, contrib_strategy, joinedload('break_')]
+    if load_children:
+        contrib_strategy.subqueryload('subcontributions').subqueryload('person_links')
+        children_strategy = subqueryload('children')
+        children_strategy.joinedload('break_')
+        children_contrib_strategy = children_strategy.joinedload('contribution')
+        children_contrib_strategy.subqueryload('person_links')
+        children_contrib_strategy.subqueryload('subcontributions').subqueryload('person_links')
+        options.append(children_strategy)
+    entries = (event.timetable_entries
+               .filter(TimetableEntry.parent_id.is_(None))
+               .options(*options)
+               .order_by(TimetableEntry.start_dt))
+    entries_by_day = defaultdict(list)
+    for entry in entries:
+        entries_by_day[entry.start_dt.astimezone(event.tzinfo).date()].append(entry)
+    return entries_by_day
+
+
 class TimeTablePlain(PDFWithTOC):
     def __init__(self, event, user, showSessions=None, showDays=None, sortingCrit=None, ttPDFFormat=None,
                  pagesize='A4', fontsize='normal', firstPageNumber=1, showSpeakerAffiliation=False,
@@ -527,11 +562,7 @@ class TimeTablePlain(PDFWithTOC):
                               ("TOPPADDING", (0, 0), (-1, -1), 0),
                               ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
                               ('GRID', (0, 0), (0, -1), 1, colors.lightgrey)])
-        entries = (self.event.timetable_entries
-                   .filter(db.cast(TimetableEntry.start_dt.astimezone(self.event.tzinfo), db.Date) == day,
-                           TimetableEntry.parent_id.is_(None))
-                   .order_by(TimetableEntry.start_dt)
-                   .all())
+        entries = self._entries_by_day.get(day, [])
         for entry in entries:
             # Session slot
             if entry.type == TimetableEntryType.SESSION_BLOCK:
@@ -718,6 +749,7 @@ class TimeTablePlain(PDFWithTOC):
 
     def getBody(self, story=None):
         self._defineStyles()
+        self._entries_by_day = _get_timetable_entries_by_day(self.event)
         if not story:
             story = self._story
         if not self._ttPDFFormat.showCoverPage():
@@ -807,10 +839,7 @@ class SimplifiedTimeTablePlain(PDFBase):
     def _processDayEntries(self, day, story):
         lastSessions = []  # this is to avoid checking if the slots have titles for all the slots
         res = []
-        entries = (self.event.timetable_entries
-                   .filter(db.cast(TimetableEntry.start_dt.astimezone(self.event.tzinfo), db.Date) == day,
-                           TimetableEntry.parent_id.is_(None))
-                   .order_by(TimetableEntry.start_dt))
+        entries = self._entries_by_day.get(day, [])
         for entry in entries:
             if entry.type == TimetableEntryType.SESSION_BLOCK:
                 session_slot = entry.object
@@ -880,6 +909,7 @@ class SimplifiedTimeTablePlain(PDFBase):
 
     def getBody(self, story=None):
         self._defineStyles()
+        self._entries_by_day = _get_timetable_entries_by_day(self.event, load_children=False)
         if not story:
             story = self._story
 
@@ -1088,10 +1118,12 @@ class RegistrantsListToBookPDF(PDFWithTOC):
 
 
 class RegistrantsListToPDF(PDFBase):
-    def __init__(self, event, doc=None, story=[], reglist=None, display=[], static_items=None):
+    def __init__(self, event, doc=None, story=[], reglist=None, display=[], static_items=None,
+                 registration_data=None):
         self.event = event
         self._regList = reglist
         self._display = display
+        self._registration_data = registration_data
         PDFBase.__init__(self, doc, story, printLandscape=True)
         self._title = _("Registrants List")
         self._PAGE_HEIGHT = landscape(A4)[1]
@@ -1171,7 +1203,10 @@ class RegistrantsListToPDF(PDFBase):
             lp.append(Paragraph(registration.friendly_id, text_format))
             lp.append(Paragraph("{} {}".format(registration.first_name.encode('utf-8'),
                                                registration.last_name.encode('utf-8')), text_format))
-            data = registration.data_by_field
+            if self._registration_data is not None:
+                data = self._registration_data[registration.id]
+            else:
+                data = registration.data_by_field
             for item in self._display:
                 friendly_data = data.get(item.id).friendly_data if data.get(item.id) else ''
                 if item.input_type == 'accommodation':
@@ -0,0 +1,29 @@
+"""Add user full name search indexes
+
+Revision ID: 2f8b0fa332a3
+Revises: 18a1088f1ea8
+Create Date: 2020-04-06 11:30:12.417923
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '2f8b0fa332a3'
+down_revision = '18a1088f1ea8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('''
+        CREATE INDEX ix_users_first_name_last_name_unaccent ON users.users
+        USING gin (indico.indico_unaccent(lower(first_name || ' ' || last_name)) gin_trgm_ops);
+        CREATE INDEX ix_users_last_name_first_name_unaccent ON users.users
+        USING gin (indico.indico_unaccent(lower(last_name || ' ' || first_name)) gin_trgm_ops);
+    ''')
+
+
+def downgrade():
+    op.drop_index('ix_users_last_name_first_name_unaccent', table_name='users', schema='users')
+    op.drop_index('ix_users_first_name_last_name_unaccent', table_name='users', schema='users')
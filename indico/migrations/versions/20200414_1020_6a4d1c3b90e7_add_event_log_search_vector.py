@@ -0,0 +1,48 @@
+"""Add search vector to event log entries
+
+Revision ID: 6a4d1c3b90e7
+Revises: 2f8b0fa332a3
+Create Date: 2020-04-14 10:20:41.183529
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6a4d1c3b90e7'
+down_revision = '2f8b0fa332a3'
+branch_labels = None
+depends_on = None
+
+
+def _data_value(key):
+    # lists (e.g. email recipients) are indexed as their space-separated items,
+    # like in EventLogEntry.make_search_vector
+    return '''
+        CASE json_typeof(l.data->'{0}')
+            WHEN 'array' THEN (SELECT string_agg(x, ' ') FROM json_array_elements_text(l.data->'{0}') x)
+            ELSE l.data->>'{0}'
+        END
+    '''.format(key)
+
+
+def upgrade():
+    op.add_column('logs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True), schema='events')
+    op.execute('''
+        UPDATE events.logs l
+        SET search_vector = to_tsvector('simple', indico.indico_unaccent(concat_ws(
+            ' ', l.module, l.type, l.summary,
+            (SELECT u.first_name || ' ' || u.last_name FROM users.users u WHERE u.id = l.user_id),
+            {}
+        )));
+    '''.format(', '.join(_data_value(key) for key in ('body', 'subject', 'from', 'to', 'cc'))))
+    op.create_index(None, 'logs', ['search_vector'], unique=False, schema='events', postgresql_using='gin')
+    op.create_index(None, 'logs', ['event_id', 'logged_dt', 'id'], unique=False, schema='events')
+
+
+def downgrade():
+    op.drop_index('ix_logs_event_id_logged_dt_id', table_name='logs', schema='events')
+    op.drop_index('ix_logs_search_vector', table_name='logs', schema='events')
+    op.drop_column('logs', 'search_vector', schema='events')
@@ -0,0 +1,26 @@
+"""Add period index to reservation occurrences
+
+Revision ID: c2a7e6f0b3d1
+Revises: 6a4d1c3b90e7
+Create Date: 2020-04-20 14:15:08.412307
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2a7e6f0b3d1'
+down_revision = '6a4d1c3b90e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('''
+        CREATE INDEX ix_reservation_occurrences_period
+        ON roombooking.reservation_occurrences USING gist (tsrange(start_dt, end_dt));
+    ''')
+
+
+def downgrade():
+    op.drop_index('ix_reservation_occurrences_period', table_name='reservation_occurrences', schema='roombooking')
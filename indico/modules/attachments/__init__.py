@@ -7,7 +7,7 @@
 
 from __future__ import unicode_literals
 
-from flask import session
+from flask import g, has_app_context, session
 
 from indico.core import signals
 from indico.core.logger import Logger
@@ -36,6 +36,23 @@ def _merge_users(target, source, **kwargs):
     AttachmentFolderPrincipal.merge_users(target, source, 'folder')
 
 
+@signals.attachments.attachment_created.connect
+@signals.attachments.attachment_updated.connect
+def _attachment_changed(attachment, **kwargs):
+    from indico.modules.attachments.models.attachments import AttachmentType
+    from indico.modules.attachments.preview import get_cacheable_file_previewer
+    if attachment.type == AttachmentType.file and get_cacheable_file_previewer(attachment.file):
+        # the previews are generated once the new file has been committed
+        g.setdefault('attachment_preview_ids', set()).add(attachment.id)
+
+
+@signals.after_commit.connect
+def _generate_attachment_previews(sender, **kwargs):
+    from indico.modules.attachments.tasks import generate_attachment_previews
+    if has_app_context() and g.get('attachment_preview_ids'):
+        generate_attachment_previews.delay(sorted(g.pop('attachment_preview_ids')))
+
+
 @signals.menu.items.connect_via('event-management-sidemenu')
 def _extend_event_management_menu(sender, event, **kwargs):
     if not can_manage_attachments(event, session.user):
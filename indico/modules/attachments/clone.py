@@ -8,6 +8,7 @@
 from __future__ import unicode_literals
 
 from sqlalchemy.orm import joinedload, subqueryload
+from werkzeug.utils import cached_property
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.links import LinkType
@@ -57,21 +58,31 @@ class AttachmentCloner(EventCloner):
                                                              LinkType.subcontribution])))
         return query
 
+    @cached_property
+    def _old_event_folders(self):
+        return self._query_folders(self.old_event.attachment_folders, True).all()
+
+    @cached_property
+    def _old_nested_folders(self):
+        folders = []
+        for folder in self._query_folders(self.old_event.all_attachment_folders, False):
+            obj = folder.object
+            if obj.is_deleted or (isinstance(obj, db.m.SubContribution) and obj.contribution.is_deleted):
+                continue
+            folders.append(folder)
+        return folders
+
     def _clone_attachments(self, new_event):
         # event attachments
-        for old_folder in self._query_folders(self.old_event.attachment_folders, True):
+        for old_folder in self._old_event_folders:
             self._clone_attachment_folder(old_folder, new_event)
         # session/contrib/subcontrib attachments
         if self._clone_nested_attachments:
             mapping = {LinkType.session: self._session_map,
                        LinkType.contribution: self._contrib_map,
                        LinkType.subcontribution: self._subcontrib_map}
-            query = self._query_folders(self.old_event.all_attachment_folders, False)
-            for old_folder in query:
-                obj = old_folder.object
-                if obj.is_deleted or (isinstance(obj, db.m.SubContribution) and obj.contribution.is_deleted):
-                    continue
-                self._clone_attachment_folder(old_folder, mapping[old_folder.link_type][obj])
+            for old_folder in self._old_nested_folders:
+                self._clone_attachment_folder(old_folder, mapping[old_folder.link_type][old_folder.object])
 
     def _clone_attachment_folder(self, old_folder, new_object):
         folder_attrs = get_simple_column_attrs(AttachmentFolder)
@@ -88,5 +99,4 @@ class AttachmentCloner(EventCloner):
                 old_file = old_attachment.file
                 attachment.file = AttachmentFile(attachment=attachment, user=old_file.user, filename=old_file.filename,
                                                  content_type=old_file.content_type)
-                with old_file.open() as fd:
-                    attachment.file.save(fd)
+                attachment.file.save_copy(old_file)
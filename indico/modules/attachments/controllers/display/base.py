@@ -38,7 +38,7 @@ class DownloadAttachmentMixin(SpecificAttachmentMixin):
             if not previewer:
                 raise NoReportError.wrap_exc(BadRequest(_('There is no preview available for this file type. '
                                                           'Please refresh the page.')))
-            preview_content = previewer.generate_content(self.attachment)
+            preview_content = previewer.get_content(self.attachment)
             return jsonify_template('attachments/preview.html', attachment=self.attachment,
                                     preview_content=preview_content)
         else:
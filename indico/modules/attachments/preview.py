@@ -12,10 +12,19 @@ import re
 from flask import render_template, session
 
 from indico.core import signals
+from indico.legacy.common.cache import GenericCache
 from indico.util.signals import values_from_signal
 from indico.util.string import fix_broken_string
 
 
+preview_cache = GenericCache('attachment-preview')
+
+#: How long a generated preview is cached (in seconds)
+PREVIEW_CACHE_TTL = 7 * 86400
+#: Generated previews larger than this (in bytes) are not cached
+PREVIEW_CACHE_MAX_SIZE = 256 * 1024
+
+
 class Previewer(object):
     """Base class for file previewers
 
@@ -25,6 +34,9 @@ class Previewer(object):
     ALLOWED_CONTENT_TYPE = None
     TEMPLATES_DIR = 'attachments/previewers/'
     TEMPATE = None
+    #: Whether the generated content only depends on the file's content
+    #: so it can be cached and generated in advance
+    CACHEABLE = False
 
     @classmethod
     def can_preview(cls, attachment_file):
@@ -38,6 +50,24 @@ class Previewer(object):
         """Generates the HTML output of the file preview"""
         return render_template(cls.TEMPLATES_DIR + cls.TEMPLATE, attachment=attachment)
 
+    @classmethod
+    def get_content(cls, attachment):
+        """Gets the HTML output of the file preview.
+
+        For cacheable previewers the output is cached based on the
+        file's id and hash, so the file is only read and rendered
+        once for all the users previewing it.
+        """
+        if not cls.CACHEABLE:
+            return cls.generate_content(attachment)
+        key = (cls.__name__, attachment.file.id, attachment.file.md5)
+        content = preview_cache.get(key)
+        if content is None:
+            content = cls.generate_content(attachment)
+            if len(content) <= PREVIEW_CACHE_MAX_SIZE:
+                preview_cache.set(key, content, time=PREVIEW_CACHE_TTL)
+        return content
+
 
 class ImagePreviewer(Previewer):
     ALLOWED_CONTENT_TYPE = re.compile(r'^image/')
@@ -57,6 +87,7 @@ class PDFPreviewer(Previewer):
 
 class MarkdownPreviewer(Previewer):
     ALLOWED_CONTENT_TYPE = re.compile(r'^text/markdown$')
+    CACHEABLE = True
 
     @classmethod
     def generate_content(cls, attachment):
@@ -67,6 +98,7 @@ class MarkdownPreviewer(Previewer):
 
 class TextPreviewer(Previewer):
     ALLOWED_CONTENT_TYPE = re.compile(r'^text/plain$')
+    CACHEABLE = True
 
     @classmethod
     def generate_content(cls, attachment):
@@ -84,6 +116,17 @@ def get_file_previewer(attachment_file):
             return previewer()
 
 
+def get_cacheable_file_previewer(attachment_file):
+    """Returns a cacheable file previewer for the given attachment file.
+
+    Unlike `get_file_previewer` this does not depend on the current
+    user, so it can be used outside a request.
+    """
+    for previewer in get_file_previewers():
+        if previewer.CACHEABLE and previewer.can_preview(attachment_file):
+            return previewer()
+
+
 def get_file_previewers():
     return values_from_signal(signals.attachments.get_file_previewers.send())
 
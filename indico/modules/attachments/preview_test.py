@@ -0,0 +1,61 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+from mock import MagicMock
+
+from indico.modules.attachments.preview import Previewer
+
+
+class DummyPreviewer(Previewer):
+    calls = 0
+
+    @classmethod
+    def generate_content(cls, attachment):
+        cls.calls += 1
+        return attachment.content
+
+
+@pytest.fixture
+def mock_cache(mocker):
+    cache = {}
+    preview_cache = mocker.patch('indico.modules.attachments.preview.preview_cache')
+    preview_cache.get.side_effect = cache.get
+    preview_cache.set.side_effect = lambda key, value, time: cache.__setitem__(key, value)
+    return cache
+
+
+def _make_attachment(content, md5='md5'):
+    attachment = MagicMock(content=content)
+    attachment.file.id = 123
+    attachment.file.md5 = md5
+    return attachment
+
+
+@pytest.mark.usefixtures('mock_cache')
+@pytest.mark.parametrize(('cacheable', 'content', 'expected_calls'), (
+    (False, 'test', 3),
+    (True, 'test', 1),
+    (True, 'x' * 1024 * 1024, 3),
+))
+def test_get_content_cached(mocker, cacheable, content, expected_calls):
+    mocker.patch.object(DummyPreviewer, 'CACHEABLE', cacheable)
+    mocker.patch.object(DummyPreviewer, 'calls', 0)
+    attachment = _make_attachment(content)
+    for __ in xrange(3):
+        assert DummyPreviewer.get_content(attachment) == content
+    assert DummyPreviewer.calls == expected_calls
+
+
+@pytest.mark.usefixtures('mock_cache')
+def test_get_content_cached_new_file(mocker):
+    mocker.patch.object(DummyPreviewer, 'CACHEABLE', True)
+    assert DummyPreviewer.get_content(_make_attachment('old')) == 'old'
+    assert DummyPreviewer.get_content(_make_attachment('new')) == 'old'
+    assert DummyPreviewer.get_content(_make_attachment('new', md5='new')) == 'new'
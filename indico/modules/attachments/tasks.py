@@ -0,0 +1,33 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from indico.core.celery import celery
+from indico.modules.attachments import logger
+from indico.modules.attachments.models.attachments import Attachment, AttachmentType
+from indico.modules.attachments.preview import get_cacheable_file_previewer
+
+
+@celery.task(request_context=True)
+def generate_attachment_previews(attachment_ids):
+    """Generate the cached previews of newly uploaded files.
+
+    This way the file does not need to be read and rendered when the
+    first user previews it.
+    """
+    attachments = Attachment.query.filter(Attachment.id.in_(attachment_ids),
+                                          Attachment.type == AttachmentType.file,
+                                          ~Attachment.is_deleted)
+    for attachment in attachments:
+        previewer = get_cacheable_file_previewer(attachment.file)
+        if previewer is None:
+            continue
+        try:
+            previewer.get_content(attachment)
+        except Exception:
+            logger.exception('Could not generate preview of %r', attachment)
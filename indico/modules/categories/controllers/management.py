@@ -373,8 +373,7 @@ class RHDeleteEvents(RHManageCategorySelectedEventsBase):
                             .count())
             return jsonify_template('events/management/delete_events.html',
                                     events=self.events, num_bookings=num_bookings)
-        for ev in self.events[:]:
-            ev.delete('Bulk-deleted by category manager', session.user)
+        Event.delete_many(self.events, 'Bulk-deleted by category manager', session.user)
         flash(ngettext('You have deleted one event', 'You have deleted {} events', len(self.events))
               .format(len(self.events)), 'success')
         return jsonify_data(flash=False, redirect=url_for('.manage_content', self.category))
@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from datetime import timedelta
 
 from celery.schedules import crontab
+from sqlalchemy.orm import selectinload
 
 from indico.core.celery import celery
 from indico.core.config import config
@@ -19,34 +20,69 @@ from indico.modules.users import User, UserSetting
 from indico.modules.users.models.suggestions import SuggestedCategory
 from indico.modules.users.util import get_related_categories
 from indico.util.date_time import now_utc
-from indico.util.suggestions import get_category_scores
+from indico.util.struct.iterables import grouper
+from indico.util.suggestions import get_category_scores_for_users
 
 
 # Minimum score for a category to be suggested
 SUGGESTION_MIN_SCORE = 0.25
+# Number of users whose suggestions are updated in a single task
+SUGGESTION_CHUNK_SIZE = 100
+
+
+def _get_unsuggestable_category_ids():
+    """Get the IDs of all categories which must not be suggested.
+
+    This includes deleted categories and categories where suggestions
+    are disabled in the category itself or any of its parents.
+    """
+    cte = Category.get_tree_cte('suggestions_disabled')
+    query = db.session.query(cte.c.id).filter(cte.c.path.contains([True]) | cte.c.is_deleted)
+    return {categ_id for categ_id, in query}
 
 
 @celery.periodic_task(name='category_suggestions', run_every=crontab(minute='0', hour='7'))
 def category_suggestions():
-    users = (User.query
+    query = (db.session.query(User.id)
              .filter(~User.is_deleted,
                      User._all_settings.any(db.and_(UserSetting.module == 'users',
                                                     UserSetting.name == 'suggest_categories',
-                                                    db.cast(UserSetting.value, db.String) == 'true'))))
-    for user in users:
+                                                    db.cast(UserSetting.value, db.String) == 'true')))
+             .order_by(User.id))
+    user_ids = [user_id for user_id, in query]
+    if not user_ids:
+        return
+    excluded_category_ids = _get_unsuggestable_category_ids()
+    logger.info('Updating category suggestions for %d users', len(user_ids))
+    for chunk in grouper(user_ids, SUGGESTION_CHUNK_SIZE, skip_missing=True):
+        update_category_suggestions.delay(chunk, excluded_category_ids)
+
+
+@celery.task(name='update_category_suggestions')
+def update_category_suggestions(user_ids, excluded_category_ids):
+    """Update the category suggestions for a chunk of users.
+
+    :param user_ids: The IDs of the users to update
+    :param excluded_category_ids: The IDs of categories which must
+                                  never be suggested
+    """
+    users = (User.query
+             .filter(User.id.in_(user_ids), ~User.is_deleted)
+             .options(selectinload('favorite_categories'))
+             .all())
+    for user, scores in get_category_scores_for_users(users).iteritems():
         existing = {x.category: x for x in user.suggested_categories}
         related = set(get_related_categories(user, detailed=False))
-        for category, score in get_category_scores(user).iteritems():
+        for category, score in scores.iteritems():
             if score < SUGGESTION_MIN_SCORE:
                 continue
-            if (category in related or category.is_deleted or category.suggestions_disabled or
-                    any(p.suggestions_disabled for p in category.parent_chain_query)):
+            if category in related or category.id in excluded_category_ids:
                 continue
             logger.debug('Suggesting %s with score %.03f for %s', category, score, user)
             suggestion = existing.get(category) or SuggestedCategory(category=category, user=user)
             suggestion.score = score
         user.settings.set('suggest_categories', False)
-        db.session.commit()
+    db.session.commit()
 
 
 @celery.periodic_task(name='category_cleanup', run_every=crontab(minute='0', hour='5'))
@@ -69,9 +105,6 @@ def category_cleanup():
 
         logger.info("Category %s: %s events were created more than %s days ago and will be deleted", categ_id,
                     len(to_delete), days)
-        for i, event in enumerate(to_delete, 1):
-            logger.info("Deleting %s", event)
-            event.delete('Cleaning up category', janitor_user)
-            if i % 100 == 0:
-                db.session.commit()
-        db.session.commit()
+        for events in grouper(to_delete, 1000, skip_missing=True):
+            Event.delete_many(events, 'Cleaning up category', janitor_user)
+            db.session.commit()
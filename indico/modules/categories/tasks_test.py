@@ -0,0 +1,39 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from indico.modules.categories.tasks import _get_unsuggestable_category_ids, update_category_suggestions
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+def test_unsuggestable_category_ids(db, create_category):
+    disabled = create_category(1, suggestions_disabled=True)
+    disabled_child = create_category(2, parent=disabled)
+    deleted = create_category(3, is_deleted=True)
+    deleted_child = create_category(4, parent=deleted)
+    create_category(5)
+    db.session.flush()
+    assert _get_unsuggestable_category_ids() == {disabled.id, disabled_child.id, deleted.id, deleted_child.id}
+
+
+@pytest.mark.parametrize('excluded', (False, True))
+def test_update_category_suggestions(db, dummy_user, dummy_category, dummy_reg, excluded):
+    dummy_user.settings.set('suggest_categories', True)
+    db.session.flush()
+    update_category_suggestions([dummy_user.id], {dummy_category.id} if excluded else set())
+    assert not dummy_user.settings.get('suggest_categories')
+    if excluded:
+        assert not dummy_user.suggested_categories.all()
+    else:
+        suggestion, = dummy_user.suggested_categories.all()
+        assert suggestion.category == dummy_category
+        assert suggestion.score > 0.25
@@ -7,11 +7,6 @@
 
 from __future__ import unicode_literals
 
-from indico.modules.designer.controllers import (RHAddCategoryTemplate, RHAddEventTemplate, RHCloneCategoryTemplate,
-                                                 RHCloneEventTemplate, RHDeleteDesignerTemplate,
-                                                 RHDownloadTemplateImage, RHEditDesignerTemplate, RHGetTemplateData,
-                                                 RHListBacksideTemplates, RHListCategoryTemplates, RHListEventTemplates,
-                                                 RHToggleTemplateDefaultOnCategory, RHUploadBackgroundImage)
 from indico.util.caching import memoize
 from indico.web.flask.util import make_view_func
 from indico.web.flask.wrappers import IndicoBlueprint
@@ -20,10 +15,15 @@ from indico.web.flask.wrappers import IndicoBlueprint
 _bp = IndicoBlueprint('designer', __name__, template_folder='templates', virtual_template_folder='designer')
 
 
+def _rh(name):
+    # the designer is rarely used, so its controllers are only imported when needed
+    return 'indico.modules.designer.controllers:' + name
+
+
 @memoize
 def _dispatch(event_rh, category_rh):
-    event_view = make_view_func(event_rh)
-    categ_view = make_view_func(category_rh)
+    event_view = make_view_func(_rh(event_rh))
+    categ_view = make_view_func(_rh(category_rh))
 
     def view_func(**kwargs):
         return categ_view(**kwargs) if kwargs['object_type'] == 'category' else event_view(**kwargs)
@@ -32,7 +32,7 @@ def _dispatch(event_rh, category_rh):
 
 
 _bp.add_url_rule('/category/<int:category_id>/manage/designer/<int:template_id>/toggle-default',
-                 'toggle_category_default', RHToggleTemplateDefaultOnCategory, methods=('POST',))
+                 'toggle_category_default', _rh('RHToggleTemplateDefaultOnCategory'), methods=('POST',))
 
 
 for object_type in ('event', 'category'):
@@ -41,22 +41,22 @@ for object_type in ('event', 'category'):
     else:
         prefix = '/event/<int:confId>'
     prefix += '/manage/designer'
-    _bp.add_url_rule(prefix + '/', 'template_list', _dispatch(RHListEventTemplates, RHListCategoryTemplates),
+    _bp.add_url_rule(prefix + '/', 'template_list', _dispatch('RHListEventTemplates', 'RHListCategoryTemplates'),
                      defaults={'object_type': object_type})
-    _bp.add_url_rule(prefix + '/<int:template_id>/backsides', 'backside_template_list', RHListBacksideTemplates,
+    _bp.add_url_rule(prefix + '/<int:template_id>/backsides', 'backside_template_list', _rh('RHListBacksideTemplates'),
                      defaults={'object_type': object_type})
-    _bp.add_url_rule(prefix + '/add', 'add_template', _dispatch(RHAddEventTemplate, RHAddCategoryTemplate),
+    _bp.add_url_rule(prefix + '/add', 'add_template', _dispatch('RHAddEventTemplate', 'RHAddCategoryTemplate'),
                      defaults={'object_type': object_type}, methods=('GET', 'POST'))
-    _bp.add_url_rule(prefix + '/<int:template_id>/', 'edit_template', RHEditDesignerTemplate,
+    _bp.add_url_rule(prefix + '/<int:template_id>/', 'edit_template', _rh('RHEditDesignerTemplate'),
                      defaults={'object_type': object_type}, methods=('GET', 'POST'))
-    _bp.add_url_rule(prefix + '/<int:template_id>/', 'delete_template', RHDeleteDesignerTemplate,
+    _bp.add_url_rule(prefix + '/<int:template_id>/', 'delete_template', _rh('RHDeleteDesignerTemplate'),
                      defaults={'object_type': object_type}, methods=('DELETE',))
     _bp.add_url_rule(prefix + '/<int:template_id>/clone', 'clone_template',
-                     _dispatch(RHCloneEventTemplate, RHCloneCategoryTemplate),
+                     _dispatch('RHCloneEventTemplate', 'RHCloneCategoryTemplate'),
                      defaults={'object_type': object_type}, methods=('POST',))
     _bp.add_url_rule(prefix + '/<int:template_id>/data', 'get_template_data',
-                     RHGetTemplateData, defaults={'object_type': object_type})
+                     _rh('RHGetTemplateData'), defaults={'object_type': object_type})
     _bp.add_url_rule(prefix + '/<int:template_id>/images/<int:image_id>/<filename>', 'download_image',
-                     RHDownloadTemplateImage, defaults={'object_type': object_type})
+                     _rh('RHDownloadTemplateImage'), defaults={'object_type': object_type})
     _bp.add_url_rule(prefix + '/<int:template_id>/images', 'upload_image',
-                     RHUploadBackgroundImage, defaults={'object_type': object_type}, methods=('POST',))
+                     _rh('RHUploadBackgroundImage'), defaults={'object_type': object_type}, methods=('POST',))
@@ -176,8 +176,7 @@ class CloneTemplateMixin(TargetFromURLMixin):
             background = self.template.background_image
             new_background = DesignerImageFile(filename=background.filename, content_type=background.content_type,
                                                template=new_template)
-            with background.open() as f:
-                new_background.save(f)
+            new_background.save_copy(background)
         else:
             new_background = None
 
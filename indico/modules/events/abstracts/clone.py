@@ -47,7 +47,10 @@ class AbstractSettingsCloner(EventCloner):
         abstracts_settings.set_multi(new_event, old_settings)
         abstracts_reviewing_settings.set_multi(new_event, abstracts_reviewing_settings.get_all(self.old_event,
                                                                                                no_defaults=True))
-        boa_settings.set_multi(new_event, boa_settings.get_all(self.old_event, no_defaults=True))
+        # the cached book of abstracts belongs to the old event
+        old_boa_settings = boa_settings.get_all(self.old_event, no_defaults=True)
+        boa_settings.set_multi(new_event, {key: value for key, value in old_boa_settings.iteritems()
+                                           if not key.startswith('cache_')})
 
     def _clone_email_templates(self, new_event):
         attrs = get_simple_column_attrs(AbstractEmailTemplate) - {'rules'}
@@ -12,6 +12,7 @@ from operator import attrgetter
 
 from flask import flash, jsonify, request, session
 from sqlalchemy.orm import joinedload, subqueryload
+from werkzeug.utils import cached_property
 
 from indico.core.db import db
 from indico.modules.events.abstracts.controllers.base import RHManageAbstractsBase
@@ -36,9 +37,9 @@ from indico.web.util import jsonify_data, jsonify_form, jsonify_template
 class RHAbstractListBase(RHManageAbstractsBase):
     """Base class for all RHs using the abstract list generator"""
 
-    def _process_args(self):
-        RHManageAbstractsBase._process_args(self)
-        self.list_generator = AbstractListGeneratorManagement(event=self.event)
+    @cached_property
+    def list_generator(self):
+        return AbstractListGeneratorManagement(event=self.event)
 
 
 class RHManageAbstractsActionsBase(RHAbstractListBase):
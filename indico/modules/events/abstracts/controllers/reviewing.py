@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from flask import flash, jsonify, request, session
 from sqlalchemy.orm import joinedload, subqueryload
 from werkzeug.exceptions import Forbidden
+from werkzeug.utils import cached_property
 
 from indico.modules.events.abstracts.controllers.base import RHAbstractBase, RHAbstractsBase
 from indico.modules.events.abstracts.controllers.common import (AbstractsDownloadAttachmentsMixin, AbstractsExportCSV,
@@ -120,7 +121,10 @@ class RHDisplayAbstractListBase(RHAbstractsBase):
     def _process_args(self):
         RHAbstractsBase._process_args(self)
         self.track = Track.get_one(request.view_args['track_id'])
-        self.list_generator = AbstractListGeneratorDisplay(event=self.event, track=self.track)
+
+    @cached_property
+    def list_generator(self):
+        return AbstractListGeneratorDisplay(event=self.event, track=self.track)
 
     def _check_access(self):
         if not self.track.can_review_abstracts(session.user) and not self.track.can_convene(session.user):
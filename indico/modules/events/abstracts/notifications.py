@@ -15,8 +15,9 @@ from flask import session
 from indico.core.notifications import make_email, send_email
 from indico.modules.events.abstracts.models.abstracts import AbstractState
 from indico.modules.events.abstracts.models.email_logs import AbstractEmailLogEntry
+from indico.util.caching import memoize_request
 from indico.util.i18n import _
-from indico.util.placeholders import replace_placeholders
+from indico.util.placeholders import compile_placeholders
 from indico.util.rules import Condition, check_rule
 from indico.web.flask.templating import get_template_module
 
@@ -131,6 +132,13 @@ class ContributionTypeCondition(EmailNotificationCondition):
         return cls.get_test_contrib_type_id(abstract) is None
 
 
+@memoize_request
+def _compile_notification_text(text):
+    # when judging many abstracts at once, the same email templates are
+    # used for all of them
+    return compile_placeholders('abstract-notification-email', text, abstract=None)
+
+
 def get_abstract_notification_tpl_module(email_tpl, abstract):
     """Get the Jinja template module for a notification email
 
@@ -138,10 +146,8 @@ def get_abstract_notification_tpl_module(email_tpl, abstract):
                       email subject/body
     :param abstract: the abstract the notification email is for
     """
-    subject = replace_placeholders('abstract-notification-email', email_tpl.subject,
-                                   abstract=abstract, escape_html=False)
-    body = replace_placeholders('abstract-notification-email', email_tpl.body,
-                                abstract=abstract, escape_html=False)
+    subject = _compile_notification_text(email_tpl.subject).render(abstract=abstract, escape_html=False)
+    body = _compile_notification_text(email_tpl.body).render(abstract=abstract, escape_html=False)
     return get_template_module('events/abstracts/emails/abstract_notification.txt',
                                event=email_tpl.event, subject=subject, body=body)
 
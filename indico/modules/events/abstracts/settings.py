@@ -119,6 +119,8 @@ boa_settings = EventSettingsProxy('abstracts_book', {
     'show_abstract_ids': False,
     'cache_path': None,
     'cache_path_tex': None,
+    'cache_path_version': 0,
+    'cache_version': 0,
     'min_lines_per_abstract': 0,
     'link_format': BOALinkFormat.frame,
 }, converters={
@@ -0,0 +1,30 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from indico.core.celery import celery
+from indico.core.db import db
+from indico.modules.events.abstracts import logger
+from indico.modules.events.abstracts.util import boa_generation_cache, generate_boa, is_boa_outdated
+
+
+@celery.task(request_context=True)
+def generate_book_of_abstracts(event):
+    """Generate the book of abstracts after it has been changed.
+
+    While this task is waiting to be executed, changes do not schedule
+    another one, so many changes made in a short time only result in
+    the book being generated once.
+    """
+    # changes made from now on need to be included in a new version
+    boa_generation_cache.delete(unicode(event.id))
+    if event.is_deleted or not is_boa_outdated(event):
+        return
+    generate_boa(event)
+    db.session.commit()
+    logger.info('Book of abstracts of %r generated', event)
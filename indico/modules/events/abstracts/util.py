@@ -10,15 +10,16 @@ from __future__ import unicode_literals
 import errno
 import os
 import shutil
-from collections import OrderedDict, defaultdict, namedtuple
+from collections import OrderedDict, namedtuple
+from uuid import uuid4
 
-from sqlalchemy.orm import joinedload, load_only, noload
+from sqlalchemy.orm import joinedload
 
 from indico.core.config import config
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.session import no_autoflush
+from indico.legacy.common.cache import GenericCache
 from indico.legacy.pdfinterface.latex import AbstractBook
-from indico.modules.events import Event
 from indico.modules.events.abstracts.forms import InvitedAbstractMixin
 from indico.modules.events.abstracts.models.abstracts import Abstract, AbstractState
 from indico.modules.events.abstracts.models.email_templates import AbstractEmailTemplate
@@ -26,14 +27,19 @@ from indico.modules.events.abstracts.models.persons import AbstractPersonLink
 from indico.modules.events.abstracts.models.reviews import AbstractReview
 from indico.modules.events.abstracts.settings import abstracts_settings, boa_settings
 from indico.modules.events.contributions.models.fields import ContributionFieldVisibility
-from indico.modules.events.models.persons import EventPerson
-from indico.modules.events.tracks.models.principals import TrackPrincipal
 from indico.modules.events.tracks.models.tracks import Track
 from indico.util.i18n import _
 from indico.util.spreadsheets import unique_col
 from indico.web.flask.templating import get_template_module
 
 
+boa_generation_cache = GenericCache('boa-generation')
+
+#: How long to wait for further changes before generating the book of
+#: abstracts again (in seconds)
+BOA_GENERATION_DELAY = 120
+
+
 def build_default_email_template(event, tpl_type):
     """Build a default e-mail template based on a notification type provided by the user."""
     email = get_template_module('events/abstracts/emails/default_{}_notification.txt'.format(tpl_type))
@@ -277,6 +283,9 @@ def get_track_reviewer_abstract_counts(event, user):
 def create_boa(event):
     """Create the book of abstracts if necessary
 
+    If the book is outdated but a previous version exists, that version
+    is used while a new one is generated in the background.
+
     :return: The path to the PDF file
     """
     path = boa_settings.get(event, 'cache_path')
@@ -285,16 +294,51 @@ def create_boa(event):
         if os.path.exists(path):
             # update file mtime so it's not deleted during cache cleanup
             os.utime(path, None)
+            if is_boa_outdated(event):
+                schedule_boa_generation(event)
             return path
+    return generate_boa(event)
+
+
+def generate_boa(event):
+    """Generate the book of abstracts and store it in the cache.
+
+    :return: The path to the PDF file
+    """
+    version = boa_settings.get(event, 'cache_version')
+    old_path = boa_settings.get(event, 'cache_path')
     pdf = AbstractBook(event)
     tmp_path = pdf.generate()
-    filename = 'boa-{}.pdf'.format(event.id)
+    # each version gets a new file so the previous one can still be sent
+    # to users while the new one is being generated
+    filename = 'boa-{}-{}.pdf'.format(event.id, uuid4().hex[:8])
     full_path = os.path.join(config.CACHE_DIR, filename)
     shutil.move(tmp_path, full_path)
-    boa_settings.set(event, 'cache_path', filename)
+    boa_settings.set_multi(event, {'cache_path': filename, 'cache_path_version': version})
+    if old_path:
+        _delete_cache_file(old_path)
     return full_path
 
 
+def is_boa_outdated(event):
+    """Check if the cached book of abstracts needs to be generated again."""
+    return boa_settings.get(event, 'cache_path_version') != boa_settings.get(event, 'cache_version')
+
+
+def schedule_boa_generation(event):
+    """Generate the book of abstracts in the background.
+
+    The book is only generated after a delay; all the changes made in
+    the meantime are included without generating it again.
+    """
+    from indico.modules.events.abstracts.tasks import generate_book_of_abstracts
+    if not config.LATEX_ENABLED or boa_generation_cache.get(unicode(event.id)):
+        return
+    # the flag expires in case the task gets lost
+    boa_generation_cache.set(unicode(event.id), True, time=BOA_GENERATION_DELAY + 3600)
+    generate_book_of_abstracts.apply_async([event], countdown=BOA_GENERATION_DELAY)
+
+
 def create_boa_tex(event):
     """Create the book of abstracts as a LaTeX archive.
 
@@ -304,86 +348,25 @@ def create_boa_tex(event):
     return tex.generate_source_archive()
 
 
-def clear_boa_cache(event):
-    """Delete the cached book of abstract"""
-    path = boa_settings.get(event, 'cache_path')
-    if path:
-        try:
-            os.remove(os.path.join(config.CACHE_DIR, path))
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
-        boa_settings.delete(event, 'cache_path')
-
-
-def get_events_with_abstract_reviewer_convener(user, dt=None):
-    """
-    Return a dict of event ids and the abstract reviewing related
-    roles the user has in that event.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    """
-    data = defaultdict(set)
-    # global reviewer/convener
-
-    event_query = (user.in_event_acls
-                   .join(Event)
-                   .options(noload('*'), load_only('event_id', 'permissions'))
-                   .filter(Event.ends_after(dt), ~Event.is_deleted))
-    for principal in event_query:
-        roles = data[principal.event_id]
-        if 'review_all_abstracts' in principal.permissions:
-            roles.add('abstract_reviewer')
-        if 'convene_all_abstracts' in principal.permissions:
-            roles.add('track_convener')
-
-    query = (user.in_track_acls
-             .options(load_only('track_id', 'permissions'))
-             .options(noload('*'))
-             .options(joinedload(TrackPrincipal.track).load_only('event_id'))
-             .filter(Event.ends_after(dt), ~Event.is_deleted))
-    for principal in query:
-        roles = data[principal.track.event_id]
-        if 'review' in principal.permissions:
-            roles.add('abstract_reviewer')
-        if 'convene' in principal.permissions:
-            roles.add('track_convener')
-    return data
+def _delete_cache_file(path):
+    try:
+        os.remove(os.path.join(config.CACHE_DIR, path))
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
 
 
-def get_events_with_abstract_persons(user, dt=None):
-    """
-    Return a dict of event ids and the abstract submission related
-    roles the user has in that event.
+def clear_boa_cache(event):
+    """Mark the cached book of abstracts as outdated.
 
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
+    The previous version of the book is still used until a new one has
+    been generated in the background.
     """
-    data = defaultdict(set)
-    bad_states = {AbstractState.withdrawn, AbstractState.rejected}
-    # submitter
-    query = (Abstract.query
-             .filter(~Event.is_deleted,
-                     ~Abstract.is_deleted,
-                     ~Abstract.state.in_(bad_states),
-                     Event.ends_after(dt),
-                     Abstract.submitter == user)
-             .join(Abstract.event)
-             .options(load_only('event_id')))
-    for abstract in query:
-        data[abstract.event_id].add('abstract_submitter')
-    # person
-    abstract_criterion = db.and_(~Abstract.state.in_(bad_states), ~Abstract.is_deleted)
-    query = (user.event_persons
-             .filter(~Event.is_deleted,
-                     Event.ends_after(dt),
-                     EventPerson.abstract_links.any(AbstractPersonLink.abstract.has(abstract_criterion)))
-             .join(EventPerson.event)
-             .options(load_only('event_id')))
-    for person in query:
-        data[person.event_id].add('abstract_person')
-    return data
+    if not boa_settings.get(event, 'cache_path'):
+        # nothing to do, the book is generated when it's downloaded
+        return
+    boa_settings.set(event, 'cache_version', boa_settings.get(event, 'cache_version') + 1)
+    schedule_boa_generation(event)
 
 
 def filter_field_values(fields, can_manage, owns_abstract):
@@ -402,3 +385,27 @@ def can_create_invited_abstracts(event):
                for tpl in event.abstract_email_templates
                for rule in tpl.rules
                if 'state' in rule)
+
+
+def get_events_with_abstract_reviewer_convener(user, dt=None):
+    """
+    Return a dict of event ids and the abstract reviewing related
+    roles the user has in that event.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return get_linked_events_with_roles(user, dt, {'abstract_reviewer', 'track_convener'})
+
+
+def get_events_with_abstract_persons(user, dt=None):
+    """
+    Return a dict of event ids and the abstract submission related
+    roles the user has in that event.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return get_linked_events_with_roles(user, dt, {'abstract_submitter', 'abstract_person'})
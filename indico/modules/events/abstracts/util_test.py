@@ -0,0 +1,63 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from indico.core.config import IndicoConfig
+from indico.modules.events.abstracts.util import clear_boa_cache, create_boa, generate_boa, is_boa_outdated
+from indico.testing.util import DictCache
+
+
+@pytest.fixture
+def boa_generation(mocker, tmpdir):
+    mocker.patch.object(IndicoConfig, 'LATEX_ENABLED', True)
+    mocker.patch('indico.modules.events.abstracts.util.boa_generation_cache', DictCache())
+    abstract_book = mocker.patch('indico.modules.events.abstracts.util.AbstractBook')
+
+    def _generate():
+        path = tmpdir.join('boa-{}.pdf'.format(abstract_book.call_count))
+        path.write('%PDF')
+        return path.strpath
+
+    abstract_book.return_value.generate.side_effect = _generate
+    task = mocker.patch('indico.modules.events.abstracts.tasks.generate_book_of_abstracts')
+    return abstract_book, task
+
+
+def test_create_boa(dummy_event, boa_generation):
+    abstract_book, task = boa_generation
+    path = create_boa(dummy_event)
+    assert os.path.exists(path)
+    assert create_boa(dummy_event) == path
+    assert abstract_book.call_count == 1
+    assert not task.apply_async.called
+
+
+def test_clear_boa_cache(dummy_event, boa_generation):
+    abstract_book, task = boa_generation
+    # no need to generate a book nobody downloaded yet
+    clear_boa_cache(dummy_event)
+    assert not is_boa_outdated(dummy_event)
+    assert not task.apply_async.called
+    path = create_boa(dummy_event)
+    # many changes only result in the book being generated once
+    clear_boa_cache(dummy_event)
+    clear_boa_cache(dummy_event)
+    assert is_boa_outdated(dummy_event)
+    assert task.apply_async.call_count == 1
+    # until then the previous version is used
+    assert create_boa(dummy_event) == path
+    assert abstract_book.call_count == 1
+    new_path = generate_boa(dummy_event)
+    assert new_path != path
+    assert not os.path.exists(path)
+    assert not is_boa_outdated(dummy_event)
+    assert create_boa(dummy_event) == new_path
@@ -131,4 +131,30 @@
       },
     });
   };
+
+  global.setupCloneProgress = function setupCloneProgress() {
+    var $container = $('#event-clone-progress');
+    var $done = $container.find('.done');
+
+    function checkProgress() {
+      $.ajax({
+        url: $container.data('status-url'),
+        dataType: 'json',
+        error: handleAjaxError,
+        success: function(data) {
+          $done.text(data.done);
+          if (data.state === 'success') {
+            location.href = $container.data('redirect-url');
+          } else if (data.state === 'failed') {
+            $container.find('.clone-running').hide();
+            $container.find('.clone-failed').show();
+          } else {
+            setTimeout(checkProgress, 1000);
+          }
+        },
+      });
+    }
+
+    checkProgress();
+  };
 })(window);
@@ -7,6 +7,8 @@
 
 from __future__ import unicode_literals
 
+from werkzeug.utils import cached_property
+
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import clone_principals
 from indico.core.db.sqlalchemy.util.models import get_simple_column_attrs
@@ -114,11 +116,14 @@ class EventProtectionCloner(EventCloner):
     def _clone_visibility(self, new_event):
         new_event.visibility = self.old_event.visibility if new_event.category == self.old_event.category else None
 
+    @cached_property
+    def _session_settings_data(self):
+        return session_settings.get_all(self.old_event)
+
     def _clone_session_coordinator_privs(self, new_event):
-        session_settings_data = session_settings.get_all(self.old_event)
         session_settings.set_multi(new_event, {
-            'coordinators_manage_contributions': session_settings_data['coordinators_manage_contributions'],
-            'coordinators_manage_blocks': session_settings_data['coordinators_manage_blocks']
+            'coordinators_manage_contributions': self._session_settings_data['coordinators_manage_contributions'],
+            'coordinators_manage_blocks': self._session_settings_data['coordinators_manage_blocks']
         })
 
     def _clone_acl(self, new_event):
@@ -67,6 +67,24 @@ class EventCloner(object):
 
     @classmethod
     def run_cloners(cls, old_event, new_event, cloners):
+        cls.run_active_cloners(cls.get_active_cloners(old_event, cloners), new_event)
+
+    @classmethod
+    def get_active_cloners(cls, old_event, cloners):
+        """Get the cloner instances needed to run the selected cloners.
+
+        The returned cloners can be passed to :meth:`run_active_cloners`
+        multiple times when cloning the same event more than once; that
+        way any data cached by a cloner about the old event is only
+        loaded once.
+
+        :param old_event: The event that's being cloned
+        :param cloners: A set containing the names of the selected
+                        cloners.
+        :return: An ordered dict mapping cloner names to cloner
+                 instances.
+        """
+        cloners = set(cloners)
         all_cloners = OrderedDict((name, cloner_cls(old_event))
                                   for name, cloner_cls in get_event_cloners().iteritems())
         if any(cloner.is_internal for name, cloner in all_cloners.iteritems() if name in cloners):
@@ -88,6 +106,11 @@ class EventCloner(object):
         for name, cloner in active_cloners.iteritems():
             if not (cloners >= cloner.requires_deep):
                 raise Exception('Cloner {} requires {}'.format(name, ', '.join(cloner.requires_deep - cloners)))
+        return active_cloners
+
+    @classmethod
+    def run_active_cloners(cls, active_cloners, new_event):
+        """Run cloners returned by :meth:`get_active_cloners`."""
         shared_data = {}
         cloner_names = set(active_cloners)
         for name, cloner in active_cloners.iteritems():
@@ -126,6 +149,11 @@ class EventCloner(object):
     def run(self, new_event, cloners, shared_data):
         """Performs the cloning operation.
 
+        When an event is cloned multiple times at once, the same cloner
+        instance is used for all the new events, so data from the old
+        event which is needed for every clone can be cached in the
+        cloner.
+
         :param new_event: The `Event` that's created by the cloning
                           operation.
         :param cloners: A set containing the names of all enabled
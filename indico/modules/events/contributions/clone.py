@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from copy import deepcopy
 
 from sqlalchemy.orm import joinedload, subqueryload, undefer
+from werkzeug.utils import cached_property
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import clone_principals
@@ -149,20 +150,24 @@ class ContributionCloner(EventCloner):
         event.contributions.append(new_contrib)
         return new_contrib
 
+    @cached_property
+    def _old_contribs(self):
+        return (Contribution.query.with_parent(self.old_event)
+                .options(undefer('_last_friendly_subcontribution_id'),
+                         joinedload('own_venue'),
+                         joinedload('own_room').lazyload('*'),
+                         joinedload('session'),
+                         joinedload('session_block').lazyload('session'),
+                         joinedload('type'),
+                         subqueryload('acl_entries'),
+                         subqueryload('subcontributions').joinedload('references'),
+                         subqueryload('references'),
+                         subqueryload('person_links'),
+                         subqueryload('field_values'))
+                .all())
+
     def _clone_contribs(self, new_event):
-        query = (Contribution.query.with_parent(self.old_event)
-                 .options(undefer('_last_friendly_subcontribution_id'),
-                          joinedload('own_venue'),
-                          joinedload('own_room').lazyload('*'),
-                          joinedload('session'),
-                          joinedload('session_block').lazyload('session'),
-                          joinedload('type'),
-                          subqueryload('acl_entries'),
-                          subqueryload('subcontributions').joinedload('references'),
-                          subqueryload('references'),
-                          subqueryload('person_links'),
-                          subqueryload('field_values')))
-        for old_contrib in query:
+        for old_contrib in self._old_contribs:
             self._contrib_map[old_contrib] = self._create_new_contribution(new_event, old_contrib)
 
     def _clone_subcontribs(self, subcontribs):
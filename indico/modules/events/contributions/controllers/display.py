@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from flask import jsonify, request, session
 from sqlalchemy.orm import joinedload, load_only
 from werkzeug.exceptions import Forbidden, NotFound
+from werkzeug.utils import cached_property
 
 from indico.core.config import config
 from indico.core.db import db
@@ -101,9 +102,9 @@ class RHContributionList(RHDisplayProtectionBase):
     MENU_ENTRY_NAME = 'contributions'
     view_class = WPContributions
 
-    def _process_args(self):
-        RHDisplayEventBase._process_args(self)
-        self.list_generator = ContributionDisplayListGenerator(event=self.event)
+    @cached_property
+    def list_generator(self):
+        return ContributionDisplayListGenerator(event=self.event)
 
     def _process(self):
         return self.view_class.render_template('display/contribution_list.html', self.event,
@@ -13,6 +13,7 @@ from operator import attrgetter
 from flask import flash, jsonify, redirect, request, session
 from sqlalchemy.orm import undefer
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+from werkzeug.utils import cached_property
 
 from indico.core.config import config
 from indico.core.db import db
@@ -79,9 +80,9 @@ def _render_subcontribution_list(contrib):
 class RHManageContributionsBase(RHManageEventBase):
     """Base class for all contributions management RHs"""
 
-    def _process_args(self):
-        RHManageEventBase._process_args(self)
-        self.list_generator = ContributionListGenerator(event=self.event)
+    @cached_property
+    def list_generator(self):
+        return ContributionListGenerator(event=self.event)
 
 
 class RHManageContributionBase(RHManageContributionsBase):
@@ -185,7 +185,6 @@ def create_contribution_from_abstract(abstract, contrib_session=None):
                                     title=abstract_file.filename)
             attachment.file = AttachmentFile(user=abstract.submitter, filename=abstract_file.filename,
                                              content_type=abstract_file.content_type)
-            with abstract_file.open() as fd:
-                attachment.file.save(fd)
+            attachment.file.save_copy(abstract_file)
     db.session.flush()
     return contrib
@@ -15,7 +15,7 @@ from operator import attrgetter
 
 import dateutil.parser
 from flask import session
-from sqlalchemy.orm import contains_eager, joinedload, load_only, noload
+from sqlalchemy.orm import joinedload
 
 from indico.core.config import config
 from indico.core.db import db
@@ -26,10 +26,7 @@ from indico.modules.events.contributions.models.contributions import Contributio
 from indico.modules.events.contributions.models.persons import (AuthorType, ContributionPersonLink,
                                                                 SubContributionPersonLink)
 from indico.modules.events.contributions.models.principals import ContributionPrincipal
-from indico.modules.events.contributions.models.subcontributions import SubContribution
 from indico.modules.events.contributions.operations import create_contribution
-from indico.modules.events.models.events import Event
-from indico.modules.events.models.persons import EventPerson
 from indico.modules.events.persons.util import get_event_person
 from indico.modules.events.util import serialize_person_link, track_time_changes
 from indico.util.date_time import format_human_timedelta
@@ -41,52 +38,6 @@ from indico.web.http_api.metadata.serializer import Serializer
 from indico.web.util import jsonify_data
 
 
-def get_events_with_linked_contributions(user, dt=None):
-    """Returns a dict with keys representing event_id and the values containing
-    data about the user rights for contributions within the event
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    """
-    def add_acl_data():
-        query = (user.in_contribution_acls
-                 .options(load_only('contribution_id', 'permissions', 'full_access', 'read_access'))
-                 .options(noload('*'))
-                 .options(contains_eager(ContributionPrincipal.contribution).load_only('event_id'))
-                 .join(Contribution)
-                 .join(Event, Event.id == Contribution.event_id)
-                 .filter(~Contribution.is_deleted, ~Event.is_deleted, Event.ends_after(dt)))
-        for principal in query:
-            roles = data[principal.contribution.event_id]
-            if 'submit' in principal.permissions:
-                roles.add('contribution_submission')
-            if principal.full_access:
-                roles.add('contribution_manager')
-            if principal.read_access:
-                roles.add('contribution_access')
-
-    def add_contrib_data():
-        has_contrib = (EventPerson.contribution_links.any(
-            ContributionPersonLink.contribution.has(~Contribution.is_deleted)))
-        has_subcontrib = EventPerson.subcontribution_links.any(
-            SubContributionPersonLink.subcontribution.has(db.and_(
-                ~SubContribution.is_deleted,
-                SubContribution.contribution.has(~Contribution.is_deleted))))
-        query = (Event.query
-                 .options(load_only('id'))
-                 .options(noload('*'))
-                 .filter(~Event.is_deleted,
-                         Event.ends_after(dt),
-                         Event.persons.any((EventPerson.user_id == user.id) & (has_contrib | has_subcontrib))))
-        for event in query:
-            data[event.id].add('contributor')
-
-    data = defaultdict(set)
-    add_acl_data()
-    add_contrib_data()
-    return data
-
-
 def serialize_contribution_person_link(person_link, is_submitter=None):
     """Serialize ContributionPersonLink to JSON-like object"""
     data = serialize_person_link(person_link)
@@ -337,3 +288,15 @@ def get_boa_export_formats():
     if not config.LATEX_ENABLED:
         del formats['PDF']
     return formats
+
+
+def get_events_with_linked_contributions(user, dt=None):
+    """Returns a dict with keys representing event_id and the values containing
+    data about the user rights for contributions within the event
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return get_linked_events_with_roles(user, dt, {'contributor', 'contribution_submission', 'contribution_manager',
+                                                   'contribution_access'})
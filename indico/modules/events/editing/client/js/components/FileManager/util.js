@@ -6,6 +6,9 @@
 // LICENSE file for more details.
 
 import deleteFileURL from 'indico-url:files.delete_file';
+import finalizeUploadURL from 'indico-url:files.finalize_upload';
+import uploadChunkURL from 'indico-url:files.upload_chunk';
+import uploadStatusURL from 'indico-url:files.upload_status';
 
 import _ from 'lodash';
 import React from 'react';
@@ -32,7 +35,57 @@ export const fileTypePropTypes = {
   id: PropTypes.number.isRequired,
 };
 
+// files larger than this are uploaded in chunks so the upload can be resumed
+const CHUNKED_UPLOAD_THRESHOLD = 16 * 1024 * 1024;
+const CHUNK_MAX_RETRIES = 5;
+
+async function uploadChunks(file, uuid, chunkSize, onUploadProgress) {
+  let offset = 0;
+  let retries = 0;
+  while (offset < file.size) {
+    const chunk = file.slice(offset, offset + chunkSize);
+    const chunkOffset = offset;
+    try {
+      // eslint-disable-next-line no-await-in-loop
+      await indicoAxios.post(uploadChunkURL({upload_id: uuid}), chunk, {
+        params: {offset},
+        headers: {'content-type': 'application/octet-stream'},
+        onUploadProgress: e => onUploadProgress({loaded: chunkOffset + e.loaded, total: file.size}),
+      });
+      offset += chunk.size;
+      retries = 0;
+    } catch (e) {
+      retries += 1;
+      if (retries > CHUNK_MAX_RETRIES) {
+        throw e;
+      }
+      // resume from whatever the server received
+      // eslint-disable-next-line no-await-in-loop
+      const {data} = await indicoAxios.get(uploadStatusURL({upload_id: uuid}));
+      offset = data.received;
+    }
+  }
+}
+
+async function uploadFileChunked(file, url, onUploadProgress) {
+  try {
+    const {
+      data: {uuid, chunk_size: chunkSize},
+    } = await indicoAxios.post(url, {filename: file.name, size: file.size, content_type: file.type});
+    await uploadChunks(file, uuid, chunkSize, onUploadProgress);
+    const {data} = await indicoAxios.post(finalizeUploadURL({upload_id: uuid}));
+    return data;
+  } catch (e) {
+    handleAxiosError(e);
+    return null;
+  }
+}
+
 async function uploadFile(file, url, onUploadProgress) {
+  if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+    return uploadFileChunked(file, url, onUploadProgress);
+  }
+
   const formData = new FormData();
   formData.append('file', file);
 
@@ -15,6 +15,7 @@ from werkzeug.exceptions import NotFound
 from indico.core import signals
 from indico.core.errors import UserValueError
 from indico.modules.events.editing.controllers.base import RHEditingManagementBase
+from indico.modules.events.editing.models.editable import EditableType
 from indico.modules.events.editing.models.file_types import EditingFileType
 from indico.modules.events.editing.models.revision_files import EditingRevisionFile
 from indico.modules.events.editing.models.tags import EditingTag
@@ -23,8 +24,11 @@ from indico.modules.events.editing.operations import (create_new_file_type, crea
 from indico.modules.events.editing.schemas import (EditableFileTypeArgs, EditableTagArgs, EditingFileTypeSchema,
                                                    EditingMenuItemSchema, EditingReviewConditionArgs, EditingTagSchema)
 from indico.modules.events.editing.settings import editing_settings
+from indico.modules.events.editing.util import add_revision_files_to_zip, get_latest_revisions
+from indico.util.fs import secure_filename
 from indico.util.i18n import _
 from indico.util.signals import named_objects_from_signal
+from indico.util.zipstream import ZipStream, send_zip_stream
 from indico.web.args import use_rh_args, use_rh_kwargs
 
 
@@ -138,3 +142,22 @@ class RHMenuEntries(RHEditingManagementBase):
     def _process(self):
         menu_entries = named_objects_from_signal(signals.menu.items.send('event-editing-sidemenu', event=self.event))
         return EditingMenuItemSchema(many=True).jsonify(menu_entries.values())
+
+
+class RHExportLatestRevisionFiles(RHEditingManagementBase):
+    """Export the files of the latest revision of all editables as a ZIP archive."""
+
+    PERMISSION = 'paper_editing'
+
+    def _process_args(self):
+        RHEditingManagementBase._process_args(self)
+        self.editable_type = EditableType[request.view_args['type']]
+
+    def _process(self):
+        zip_stream = ZipStream()
+        for revision in get_latest_revisions(self.event, self.editable_type):
+            contrib = revision.editable.contribution
+            folder = secure_filename('{}_{}'.format(contrib.friendly_id, contrib.title),
+                                     'contribution-{}'.format(contrib.id))
+            add_revision_files_to_zip(zip_stream, revision, folder)
+        return send_zip_stream('{}-files.zip'.format(self.editable_type.name), zip_stream)
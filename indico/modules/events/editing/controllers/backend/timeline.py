@@ -7,10 +7,6 @@
 
 from __future__ import unicode_literals
 
-import os
-from io import BytesIO
-from zipfile import ZipFile
-
 from flask import request, session
 from marshmallow import fields
 from marshmallow_enum import EnumField
@@ -28,12 +24,12 @@ from indico.modules.events.editing.operations import (confirm_editable_changes,
                                                       review_editable_revision, undo_review, update_revision_comment)
 from indico.modules.events.editing.schemas import (EditableSchema, EditingConfirmationAction, EditingReviewAction,
                                                    ReviewEditableArgs)
+from indico.modules.events.editing.util import add_revision_files_to_zip
 from indico.modules.files.controllers import UploadFileMixin
-from indico.util.fs import secure_filename
 from indico.util.i18n import _
 from indico.util.marshmallow import not_empty
+from indico.util.zipstream import ZipStream, send_zip_stream
 from indico.web.args import parser, use_kwargs
-from indico.web.flask.util import send_file
 
 
 class RHEditingUploadFile(UploadFileMixin, RHContributionEditableBase):
@@ -243,19 +239,9 @@ class RHExportRevisionFiles(RHContributionEditableRevisionBase):
         return self._user_is_authorized_submitter() or self._user_is_authorized_editor()
 
     def _process(self):
-        buf = BytesIO()
-        with ZipFile(buf, 'w', allowZip64=True) as zip_handler:
-            for revision_file in self.revision.files:
-                file = revision_file.file
-                filename = secure_filename(file.filename, 'file-{}'.format(file.id))
-                file_type = revision_file.file_type
-                folder_name = secure_filename(file_type.name, 'file-type-{}'.format(file_type.id))
-
-                with file.storage.get_local_path(file.storage_file_id) as filepath:
-                    zip_handler.write(filepath, os.path.join(folder_name, filename))
-
-        buf.seek(0)
-        return send_file('revision-{}.zip'.format(self.revision.id), buf, 'application/zip', inline=False)
+        zip_stream = ZipStream()
+        add_revision_files_to_zip(zip_stream, self.revision)
+        return send_zip_stream('revision-{}.zip'.format(self.revision.id), zip_stream)
 
 
 class RHDownloadRevisionFile(RHContributionEditableRevisionBase):
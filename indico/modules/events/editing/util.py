@@ -0,0 +1,56 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import posixpath
+from functools import partial
+
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+from indico.modules.events.contributions.models.contributions import Contribution
+from indico.modules.events.editing.models.editable import Editable
+from indico.modules.events.editing.models.revisions import EditingRevision
+from indico.util.fs import secure_filename
+
+
+def get_latest_revisions(event, editable_type):
+    """Get the latest revision of each editable of a given type.
+
+    :return: A list of revisions, including their files and the
+             editable and contribution they belong to.
+    """
+    return (EditingRevision.query
+            .join(EditingRevision.editable)
+            .join(Editable.contribution)
+            .filter(Contribution.event == event,
+                    ~Contribution.is_deleted,
+                    Editable.type == editable_type)
+            .distinct(EditingRevision.editable_id)
+            .order_by(EditingRevision.editable_id, EditingRevision.created_dt.desc())
+            .options(contains_eager('editable').contains_eager('contribution'),
+                     selectinload('files').options(joinedload('file'), joinedload('file_type')))
+            .all())
+
+
+def add_revision_files_to_zip(zip_stream, revision, folder=''):
+    """Add the files of a revision to a :class:`.ZipStream`.
+
+    Each file is placed in a folder named after its file type.  The
+    files are only read from the storage backend while the archive is
+    being sent.
+
+    :param folder: The folder in the archive containing the file type
+                   folders.
+    """
+    for revision_file in revision.files:
+        file = revision_file.file
+        filename = secure_filename(file.filename, 'file-{}'.format(file.id))
+        file_type = revision_file.file_type
+        type_folder = secure_filename(file_type.name, 'file-type-{}'.format(file_type.id))
+        zip_stream.add_file(posixpath.join(folder, type_folder, filename),
+                            partial(file.storage.open, file.storage_file_id), file.size, file.created_dt)
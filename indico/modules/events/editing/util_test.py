@@ -0,0 +1,32 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+from indico.modules.events.editing.models.editable import Editable, EditableType
+from indico.modules.events.editing.models.revisions import EditingRevision, InitialRevisionState
+from indico.modules.events.editing.util import get_latest_revisions
+from indico.util.date_time import now_utc
+
+
+def test_get_latest_revisions(db, dummy_event, create_contribution, dummy_user):
+    contribs = [create_contribution(dummy_event, 'Contrib {}'.format(i), timedelta(minutes=20)) for i in xrange(3)]
+    contribs[2].is_deleted = True
+    latest = []
+    for contrib in contribs:
+        editable = Editable(contribution=contrib, type=EditableType.paper)
+        for i in xrange(3):
+            revision = EditingRevision(editable=editable, submitter=dummy_user,
+                                       initial_state=InitialRevisionState.ready_for_review,
+                                       created_dt=now_utc() - timedelta(days=5 - i))
+        latest.append(revision)
+    db.session.flush()
+    revisions = get_latest_revisions(dummy_event, EditableType.paper)
+    assert set(revisions) == set(latest[:2])
+    assert {rev.editable.contribution for rev in revisions} == set(contribs[:2])
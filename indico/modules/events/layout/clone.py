@@ -37,8 +37,7 @@ class ImageCloner(EventCloner):
         for old_image in self._find_images():
             new_image = ImageFile(filename=old_image.filename, content_type=old_image.content_type)
             new_event.layout_images.append(new_image)
-            with old_image.open() as fd:
-                new_image.save(fd)
+            new_image.save_copy(old_image)
             db.session.flush()
 
 
@@ -75,8 +75,8 @@ export function viewNextEntry() {
   };
 }
 
-export function updateEntries(entries, pages, totalPageCount) {
-  return {type: UPDATE_ENTRIES, entries, pages, totalPageCount};
+export function updateEntries(entries, pages, totalPageCount, currentPage) {
+  return {type: UPDATE_ENTRIES, entries, pages, totalPageCount, currentPage};
 }
 
 export function fetchStarted() {
@@ -92,7 +92,7 @@ export function fetchLogEntries() {
     dispatch(fetchStarted());
 
     const {
-      logs: {filters, keyword, currentPage},
+      logs: {filters, keyword, currentPage, fetchedPage, entries},
       staticData: {fetchLogsUrl},
     } = getStore();
 
@@ -103,6 +103,15 @@ export function fetchLogEntries() {
     if (keyword) {
       params.q = keyword;
     }
+    // when moving to an adjacent page, tell the server where the current page
+    // starts/ends so it can use keyset pagination instead of an offset
+    if (fetchedPage !== null && entries.length) {
+      if (currentPage === fetchedPage + 1) {
+        params.before = entries[entries.length - 1].id;
+      } else if (currentPage === fetchedPage - 1) {
+        params.after = entries[0].id;
+      }
+    }
 
     Object.entries(filters).forEach(([item, active]) => {
       if (active) {
@@ -118,7 +127,12 @@ export function fetchLogEntries() {
       dispatch(fetchFailed());
       return;
     }
-    const {entries, pages, total_page_count: totalPageCount} = response.data;
-    dispatch(updateEntries(entries, pages, totalPageCount));
+    const {
+      entries: newEntries,
+      pages,
+      total_page_count: totalPageCount,
+      current_page: newPage,
+    } = response.data;
+    dispatch(updateEntries(newEntries, pages, totalPageCount, newPage));
   };
 }
@@ -11,6 +11,7 @@ const initialState = {
   entries: [],
   keyword: null,
   currentPage: 1,
+  fetchedPage: null,
   isFetching: false,
   filters: {
     event: true,
@@ -27,15 +28,16 @@ const initialState = {
 export default function logReducer(state = initialState, action) {
   switch (action.type) {
     case actions.SET_KEYWORD:
-      return {...state, keyword: action.keyword};
+      return {...state, keyword: action.keyword, fetchedPage: null};
     case actions.SET_FILTER:
-      return {...state, filters: {...state.filters, ...action.filter}};
+      return {...state, filters: {...state.filters, ...action.filter}, fetchedPage: null};
     case actions.SET_PAGE:
       return {...state, currentPage: action.currentPage};
     case actions.UPDATE_ENTRIES:
       return {
         ...state,
         entries: action.entries,
+        fetchedPage: action.currentPage,
         pages: action.pages,
         totalPageCount: action.totalPageCount,
         isFetching: false,
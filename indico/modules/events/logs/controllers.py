@@ -8,6 +8,7 @@
 from __future__ import unicode_literals
 
 from flask import jsonify, request
+from flask_sqlalchemy import Pagination
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.queries import preprocess_ts_string
@@ -20,11 +21,6 @@ from indico.modules.events.management.controllers import RHManageEventBase
 LOG_PAGE_SIZE = 15
 
 
-def _contains(field, text):
-    return (db.func.to_tsvector('simple', db.func.indico.indico_unaccent(field))
-            .match(db.func.indico.indico_unaccent(preprocess_ts_string(text)), postgresql_regconfig='simple'))
-
-
 class RHEventLogs(RHManageEventBase):
     """Shows the modification/action log for the event"""
 
@@ -34,33 +30,52 @@ class RHEventLogs(RHManageEventBase):
 
 
 class RHEventLogsJSON(RHManageEventBase):
+    def _get_page_entries(self, query, page, before=None, after=None):
+        """Get the entries of a page.
+
+        When the client knows the entry right after/before the requested
+        page (i.e. when going to the next/previous page), keyset
+        pagination is used instead of an offset so deep pages are fast.
+        """
+        order = (EventLogEntry.logged_dt.desc(), EventLogEntry.id.desc())
+        ref_entry = self.event.log_entries.filter_by(id=before or after).first() if (before or after) else None
+        if ref_entry is None:
+            return query.order_by(*order).offset((page - 1) * LOG_PAGE_SIZE).limit(LOG_PAGE_SIZE).all()
+        key = db.tuple_(EventLogEntry.logged_dt, EventLogEntry.id)
+        ref_key = db.tuple_(ref_entry.logged_dt, ref_entry.id)
+        if before:
+            return query.filter(key < ref_key).order_by(*order).limit(LOG_PAGE_SIZE).all()
+        else:
+            entries = (query.filter(key > ref_key)
+                       .order_by(EventLogEntry.logged_dt, EventLogEntry.id)
+                       .limit(LOG_PAGE_SIZE)
+                       .all())
+            return entries[::-1]
+
     def _process(self):
         page = int(request.args.get('page', 1))
+        before = request.args.get('before', type=int)
+        after = request.args.get('after', type=int)
         filters = request.args.getlist('filters')
         text = request.args.get('q')
 
         if not filters:
             return jsonify(current_page=1, pages=[], entries=[], total_page_count=0)
 
-        query = self.event.log_entries.order_by(EventLogEntry.logged_dt.desc())
+        query = self.event.log_entries
         realms = {EventLogRealm.get(f) for f in filters if EventLogRealm.get(f)}
         if realms:
             query = query.filter(EventLogEntry.realm.in_(realms))
 
         if text:
             query = query.filter(
-                db.or_(_contains(EventLogEntry.module, text),
-                       _contains(EventLogEntry.type, text),
-                       _contains(EventLogEntry.summary, text),
-                       _contains(db.m.User.first_name + " " + db.m.User.last_name, text),
-                       _contains(EventLogEntry.data['body'].astext, text),
-                       _contains(EventLogEntry.data['subject'].astext, text),
-                       _contains(EventLogEntry.data['from'].astext, text),
-                       _contains(EventLogEntry.data['to'].astext, text),
-                       _contains(EventLogEntry.data['cc'].astext, text))
-            ).outerjoin(db.m.User)
-
-        query = query.paginate(page, LOG_PAGE_SIZE)
+                EventLogEntry.search_vector.match(db.func.indico.indico_unaccent(preprocess_ts_string(text)),
+                                                  postgresql_regconfig='simple')
+            )
+
+        items = self._get_page_entries(query, page, before, after)
+        pagination = Pagination(query, page, LOG_PAGE_SIZE, query.count(), items)
         entries = [dict(serialize_log_entry(entry), index=index, html=entry.render())
-                   for index, entry in enumerate(query.items)]
-        return jsonify(current_page=page, pages=list(query.iter_pages()), total_page_count=query.pages, entries=entries)
+                   for index, entry in enumerate(items)]
+        return jsonify(current_page=page, pages=list(pagination.iter_pages()), total_page_count=pagination.pages,
+                       entries=entries)
@@ -0,0 +1,44 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+import pytest
+
+from indico.modules.events.logs.controllers import LOG_PAGE_SIZE, RHEventLogsJSON
+from indico.modules.events.logs.models.entries import EventLogEntry, EventLogKind, EventLogRealm
+from indico.util.date_time import now_utc
+
+
+@pytest.fixture
+def create_log_entries(db, dummy_event):
+    def _create(count):
+        now = now_utc()
+        for i in xrange(count):
+            entry = dummy_event.log(EventLogRealm.event, EventLogKind.other, 'Test', 'Entry {}'.format(i))
+            # some entries share the same timestamp to test the tie-breaking
+            entry.logged_dt = now + timedelta(seconds=i // 2)
+        db.session.flush()
+        return dummy_event.log_entries.order_by(EventLogEntry.logged_dt.desc(), EventLogEntry.id.desc()).all()
+    return _create
+
+
+def test_log_keyset_pagination(dummy_event, create_log_entries):
+    entries = create_log_entries(LOG_PAGE_SIZE * 3)
+    rh = RHEventLogsJSON()
+    rh.event = dummy_event
+    query = dummy_event.log_entries
+    pages = [entries[i:i + LOG_PAGE_SIZE] for i in xrange(0, len(entries), LOG_PAGE_SIZE)]
+    assert rh._get_page_entries(query, 2) == pages[1]
+    assert rh._get_page_entries(query, 2, before=pages[0][-1].id) == pages[1]
+    assert rh._get_page_entries(query, 3, before=pages[1][-1].id) == pages[2]
+    assert rh._get_page_entries(query, 1, after=pages[1][0].id) == pages[0]
+    assert rh._get_page_entries(query, 2, after=pages[2][0].id) == pages[1]
+    # unknown reference entries fall back to the offset
+    assert rh._get_page_entries(query, 3, before=0) == pages[2]
@@ -7,7 +7,7 @@
 
 from __future__ import unicode_literals
 
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy import PyIntEnum, UTCDateTime
@@ -33,10 +33,16 @@ class EventLogKind(int, IndicoEnum):
     negative = 4
 
 
+#: The keys in the data of a log entry which are included in its search vector
+SEARCHABLE_DATA_KEYS = ('body', 'subject', 'from', 'to', 'cc')
+
+
 class EventLogEntry(db.Model):
     """Log entries for events"""
     __tablename__ = 'logs'
-    __table_args__ = {'schema': 'events'}
+    __table_args__ = (db.Index(None, 'event_id', 'logged_dt', 'id'),
+                      db.Index(None, 'search_vector', postgresql_using='gin'),
+                      {'schema': 'events'})
 
     #: The ID of the log entry
     id = db.Column(
@@ -96,6 +102,11 @@ class EventLogEntry(db.Model):
         JSON,
         nullable=False
     )
+    #: The full-text search vector containing the searchable data of the entry
+    search_vector = db.Column(
+        TSVECTOR,
+        nullable=True
+    )
 
     #: The user associated with the log entry
     user = db.relationship(
@@ -134,6 +145,32 @@ class EventLogEntry(db.Model):
         renderer = self.renderer
         return renderer.render_entry(self) if renderer else None
 
+    @staticmethod
+    def make_search_vector(module, type_, summary, user=None, data=None):
+        """Build the search vector for a log entry.
+
+        This is used to fill :attr:`search_vector` when inserting log
+        entries without creating :class:`EventLogEntry` objects.
+
+        :return: an SQL expression for the search vector
+        """
+        parts = [module, type_, summary]
+        if user:
+            parts.append('{} {}'.format(user.first_name, user.last_name))
+        if isinstance(data, dict):
+            for key in SEARCHABLE_DATA_KEYS:
+                value = data.get(key)
+                if isinstance(value, (list, tuple)):
+                    parts += map(unicode, value)
+                elif value is not None:
+                    parts.append(unicode(value))
+        text = ' '.join(part for part in parts if part)
+        return db.func.to_tsvector('simple', db.func.indico.indico_unaccent(text))
+
+    def update_search_vector(self):
+        """Set the search vector based on the current data of the entry."""
+        self.search_vector = self.make_search_vector(self.module, self.type, self.summary, self.user, self.data)
+
     @return_ascii
     def __repr__(self):
         realm = self.realm.name if self.realm is not None else None
@@ -0,0 +1,27 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from indico.modules.events.logs.models.entries import EventLogEntry, EventLogKind, EventLogRealm
+
+
+def test_log_search_vector(db, dummy_event, dummy_user):
+    dummy_event.log(EventLogRealm.emails, EventLogKind.other, 'Emails', 'Sent an email', dummy_user, type_='email',
+                    data={'to': ['jos\xe9@example.com'], 'subject': 'Important stuff', 'body': 'Hello world'})
+    dummy_event.log(EventLogRealm.event, EventLogKind.other, 'Timetable', 'Something changed', data=[('a', 'b')])
+    db.session.flush()
+
+    def _search(text):
+        return {entry.module for entry in dummy_event.log_entries.filter(
+            EventLogEntry.search_vector.match(text, postgresql_regconfig='simple'))}
+
+    assert _search('guinea & pig') == {'Emails'}
+    assert _search('important & world') == {'Emails'}
+    assert _search('jose@example.com') == {'Emails'}
+    assert _search('changed') == {'Timetable'}
+    assert _search('nothing') == set()
@@ -7,18 +7,20 @@
 
 from __future__ import unicode_literals
 
+import uuid
 from collections import OrderedDict
 from datetime import datetime, timedelta
 
 from dateutil import rrule
 from flask import flash, jsonify, request, session
-from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import BadRequest, NotFound
 
 from indico.modules.events.cloning import EventCloner
 from indico.modules.events.management.controllers import RHManageEventBase
 from indico.modules.events.management.forms import (CLONE_REPEAT_CHOICES, CloneCategorySelectForm, CloneContentsForm,
                                                     CloneRepeatabilityForm, CloneRepeatIntervalForm,
                                                     CloneRepeatOnceForm, CloneRepeatPatternForm)
+from indico.modules.events.management.tasks import clone_event_series, clone_progress_cache, set_clone_progress
 from indico.modules.events.operations import clone_event
 from indico.util.i18n import _
 from indico.web.flask.util import url_for
@@ -181,14 +183,19 @@ class RHCloneEvent(RHManageEventBase):
                 else:
                     clone_calculator = get_clone_calculator(form.repeatability.data, self.event)
                     dates = clone_calculator.calculate(request.form)[0]
-                clones = [clone_event(self.event, start_dt, set(form.selected_items.data), form.category.data)
-                          for start_dt in dates]
-                if len(clones) == 1:
+                cloners = set(form.selected_items.data)
+                if len(dates) == 1:
+                    clone = clone_event(self.event, dates[0], cloners, form.category.data)
                     flash(_('Welcome to your cloned event!'), 'success')
-                    return jsonify_data(redirect=url_for('event_management.settings', clones[0]), flash=False)
+                    return jsonify_data(redirect=url_for('event_management.settings', clone), flash=False)
                 else:
-                    flash(_('{} new events created.').format(len(dates)), 'success')
-                    return jsonify_data(redirect=form.category.data.url, flash=False)
+                    # cloning many events may take a while, so we do it in the background
+                    key = unicode(uuid.uuid4())
+                    set_clone_progress(key, 'pending', len(dates))
+                    clone_event_series.delay(self.event, dates, cloners, form.category.data, session.user, key)
+                    return jsonify_template('events/management/clone_event_progress.html', event=self.event,
+                                            total=len(dates), status_url=url_for('.clone_status', self.event, uuid=key),
+                                            redirect_url=form.category.data.url)
             else:
                 # back to step 4, since there's been an error
                 step = 4
@@ -196,3 +203,17 @@ class RHCloneEvent(RHManageEventBase):
                         for c in EventCloner.get_cloners(self.event)}
         return jsonify_template('events/management/clone_event.html', event=self.event, step=step, form=form,
                                 cloner_dependencies=dependencies, **tpl_args)
+
+
+class RHCloneEventStatus(RHManageEventBase):
+    """Get the progress of cloning an event in the background."""
+
+    ALLOW_LOCKED = True
+
+    def _process(self):
+        progress = clone_progress_cache.get(request.view_args['uuid'])
+        if progress is None:
+            raise NotFound
+        if progress['state'] == 'success':
+            flash(_('{} new events created.').format(progress['total']), 'success')
+        return jsonify(progress)
@@ -0,0 +1,49 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from flask import session
+
+from indico.core.celery import celery
+from indico.core.db import db
+from indico.legacy.common.cache import GenericCache
+from indico.modules.events import logger
+from indico.modules.events.operations import clone_event_multiple
+
+
+clone_progress_cache = GenericCache('event-cloning')
+
+#: How long the progress of a cloning operation is kept (in seconds)
+CLONE_PROGRESS_TTL = 3600
+
+
+def set_clone_progress(key, state, total, done=0):
+    clone_progress_cache.set(key, {'state': state, 'total': total, 'done': done}, time=CLONE_PROGRESS_TTL)
+
+
+@celery.task(request_context=True)
+def clone_event_series(event, dates, cloners, category, user, progress_key):
+    """Clone an event on several dates in the background.
+
+    The progress of the operation is stored in the cache under
+    `progress_key` so it can be queried by the user who started it.
+    """
+    session.user = user
+    session.lang = user.settings.get('lang')
+    set_clone_progress(progress_key, 'running', len(dates))
+    try:
+        clone_event_multiple(event, dates, cloners, category,
+                             progress_callback=lambda n: set_clone_progress(progress_key, 'running', len(dates), n))
+        db.session.commit()
+    except Exception:
+        logger.exception('Cloning %r failed', event)
+        db.session.rollback()
+        set_clone_progress(progress_key, 'failed', len(dates))
+        raise
+    logger.info('Event %r cloned %d times by %r', event, len(dates), user)
+    set_clone_progress(progress_key, 'success', len(dates), len(dates))
@@ -0,0 +1,35 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+from indico.modules.events import Event
+from indico.modules.events.contributions import Contribution
+from indico.modules.events.management.tasks import clone_event_series
+from indico.modules.events.timetable.models.entries import TimetableEntry
+
+
+def test_clone_event_series(db, mocker, dummy_event, dummy_category, dummy_user):
+    set_progress = mocker.patch('indico.modules.events.management.tasks.set_clone_progress')
+    for i in xrange(3):
+        contrib = Contribution(event=dummy_event, title='Contrib {}'.format(i), duration=timedelta(minutes=10))
+        db.session.add(TimetableEntry(event=dummy_event, object=contrib,
+                                      start_dt=dummy_event.start_dt + timedelta(minutes=10 * i)))
+    db.session.flush()
+    dates = [dummy_event.start_dt + timedelta(weeks=n) for n in xrange(1, 5)]
+    clone_event_series(dummy_event, dates, {'timetable'}, dummy_category, dummy_user, 'key')
+    clones = Event.query.filter(Event.id != dummy_event.id).order_by(Event.start_dt).all()
+    assert [e.start_dt for e in clones] == dates
+    for clone in clones:
+        assert clone.can_manage(dummy_user)
+        assert sorted(e.start_dt - clone.start_dt for e in clone.timetable_entries) == [
+            timedelta(), timedelta(minutes=10), timedelta(minutes=20)
+        ]
+    set_progress.assert_any_call('key', 'running', 4, 2)
+    set_progress.assert_called_with('key', 'success', 4, 4)
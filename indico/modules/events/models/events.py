@@ -21,6 +21,7 @@ from sqlalchemy.event import listens_for
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.orm import column_property
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.base import NEVER_SET, NO_VALUE
 from sqlalchemy.sql import select
 
@@ -817,6 +818,7 @@ class Event(SearchableTitleMixin, DescriptionMixin, LocationMixin, ProtectionMan
             return
         entry = EventLogEntry(user=user, realm=realm, kind=kind, module=module, type=type_, summary=summary,
                               data=data or {})
+        entry.update_search_vector()
         self.log_entries.append(entry)
         return entry
 
@@ -865,6 +867,42 @@ class Event(SearchableTitleMixin, DescriptionMixin, LocationMixin, ProtectionMan
         logger.info('Event %r deleted [%s]', self, reason)
         self.log(EventLogRealm.event, EventLogKind.negative, 'Event', 'Event deleted', user, data={'Reason': reason})
 
+    @classmethod
+    def delete_many(cls, events, reason, user=None):
+        """Delete many events at once.
+
+        This has the same effect as calling :meth:`delete` on each
+        event, but the events are marked as deleted and the deletion
+        is logged using bulk statements.  Instead of `event.deleted`,
+        the `event.deleted_many` signal is sent once for all events.
+
+        :param events: The events to delete
+        :param reason: The reason for the deletion, used in the logs
+        :param user: The user performing the deletion
+        """
+        from indico.modules.events import logger, EventLogRealm, EventLogKind
+        events = [e for e in events if not e.is_deleted]
+        if not events:
+            return
+        (cls.query
+         .filter(cls.id.in_({e.id for e in events}))
+         .update({cls.is_deleted: True}, synchronize_session=False))
+        for event in events:
+            set_committed_value(event, 'is_deleted', True)
+        signals.event.deleted_many.send(events, user=user)
+        db.session.flush()
+        logger.info('%d events deleted [%s]', len(events), reason)
+        now = now_utc()
+        data = {'Reason': reason}
+        search_vector = EventLogEntry.make_search_vector('Event', 'simple', 'Event deleted', user, data)
+        log_entries = [{'event_id': event.id, 'user_id': user.id if user else None, 'logged_dt': now,
+                        'realm': EventLogRealm.event, 'kind': EventLogKind.negative, 'module': 'Event',
+                        'type': 'simple', 'summary': 'Event deleted', 'data': data, 'search_vector': search_vector}
+                       for event in events
+                       if not event.__logging_disabled]
+        if log_entries:
+            db.session.execute(EventLogEntry.__table__.insert().values(log_entries))
+
     @property
     @memoize_request
     def cfa(self):
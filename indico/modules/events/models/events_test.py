@@ -12,10 +12,12 @@ from datetime import date, datetime, timedelta
 import pytest
 import pytz
 
+from indico.core import signals
 from indico.core.db.sqlalchemy.protection import ProtectionMode
-from indico.modules.events import Event
+from indico.modules.events import Event, EventLogKind, EventLogRealm
 from indico.modules.events.contributions import Contribution
 from indico.modules.events.contributions.models.subcontributions import SubContribution
+from indico.modules.events.logs import EventLogEntry
 from indico.modules.events.sessions import Session
 
 
@@ -90,3 +92,29 @@ def test_iter_days(dummy_event, start_dt, end_dt, days):
     dummy_event.start_dt = pytz.utc.localize(start_dt)
     dummy_event.end_dt = pytz.utc.localize(end_dt)
     assert list(dummy_event.iter_days()) == days
+
+
+def test_delete_many(db, create_event, dummy_user):
+    events = [create_event(i) for i in xrange(1, 4)]
+    events[2].is_deleted = True
+    untouched = create_event(10)
+    db.session.flush()
+    sent = []
+    deleted_one = []
+    with signals.event.deleted_many.connected_to(lambda sender, **kw: sent.append((sender, kw['user']))), \
+            signals.event.deleted.connected_to(lambda sender, **kw: deleted_one.append(sender)):
+        Event.delete_many(events, 'Testing', dummy_user)
+    assert sent == [(events[:2], dummy_user)]
+    assert not deleted_one
+    db.session.expire_all()
+    assert all(e.is_deleted for e in events)
+    assert not untouched.is_deleted
+    for event in events[:2]:
+        entry, = event.log_entries
+        assert entry.realm == EventLogRealm.event
+        assert entry.kind == EventLogKind.negative
+        assert entry.user == dummy_user
+        assert entry.data == {'Reason': 'Testing'}
+        assert event.log_entries.filter(EventLogEntry.search_vector.match('deleted & guinea',
+                                                                          postgresql_regconfig='simple')).count()
+    assert not events[2].log_entries.count()
@@ -170,28 +170,50 @@ def clone_event(event, start_dt, cloners, category=None):
     :param cloners: A set containing the names of all enabled cloners;
     :param category: The `Category` the new event will be created in.
     """
-    end_dt = start_dt + event.duration
-    data = {
-        'start_dt': start_dt,
-        'end_dt': end_dt,
-        'timezone': event.timezone,
-        'title': event.title,
-        'description': event.description,
-    }
-    new_event = create_event(category or event.category, event.type_, data,
-                             features=features_event_settings.get(event, 'enabled'),
-                             add_creator_as_manager=False)
+    return clone_event_multiple(event, [start_dt], cloners, category)[0]
+
 
-    # Run the modular cloning system
-    EventCloner.run_cloners(event, new_event, cloners)
-    signals.event.cloned.send(event, new_event=new_event)
+def clone_event_multiple(event, dates, cloners, category=None, progress_callback=None):
+    """Clone an event on several dates/times.
 
-    # Grant access to the event creator -- must be done after modular cloners
-    # since cloning the event ACL would result in a duplicate entry
-    with new_event.logging_disabled:
-        new_event.update_principal(session.user, full_access=True)
+    The cloners are only set up once and then reused for all the new
+    events, so the data of the original event is only loaded once.
 
-    return new_event
+    :param dates: A list containing the start datetimes of the new
+                  events;
+    :param cloners: A set containing the names of all enabled cloners;
+    :param category: The `Category` the new events will be created in.
+    :param progress_callback: A callable invoked with the number of
+                              events created so far after each event.
+    :return: The list of new events
+    """
+    active_cloners = EventCloner.get_active_cloners(event, cloners)
+    features = features_event_settings.get(event, 'enabled')
+    clones = []
+    for start_dt in dates:
+        data = {
+            'start_dt': start_dt,
+            'end_dt': start_dt + event.duration,
+            'timezone': event.timezone,
+            'title': event.title,
+            'description': event.description,
+        }
+        new_event = create_event(category or event.category, event.type_, data, features=features,
+                                 add_creator_as_manager=False)
+
+        # Run the modular cloning system
+        EventCloner.run_active_cloners(active_cloners, new_event)
+        signals.event.cloned.send(event, new_event=new_event)
+
+        # Grant access to the event creator -- must be done after modular cloners
+        # since cloning the event ACL would result in a duplicate entry
+        with new_event.logging_disabled:
+            new_event.update_principal(session.user, full_access=True)
+
+        clones.append(new_event)
+        if progress_callback is not None:
+            progress_callback(len(clones))
+    return clones
 
 
 def _log_event_update(event, changes, visible_person_link_changes=False):
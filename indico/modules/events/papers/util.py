@@ -7,14 +7,10 @@
 
 from __future__ import unicode_literals
 
-from sqlalchemy.orm import load_only, noload
-
 from indico.core.db import db
-from indico.modules.events import Event
 from indico.modules.events.abstracts.models.abstracts import Abstract
 from indico.modules.events.contributions import Contribution
 from indico.modules.events.contributions.models.persons import ContributionPersonLink
-from indico.modules.events.models.principals import EventPrincipal
 from indico.modules.events.papers.models.revisions import PaperRevision, PaperRevisionState
 from indico.modules.users import User
 
@@ -41,26 +37,6 @@ def get_user_contributions_to_review(event, user):
     return contribs
 
 
-def get_events_with_paper_roles(user, dt=None):
-    """
-    Get the IDs and PR roles of events where the user has any kind
-    of paper reviewing privileges.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    :return: A dict mapping event IDs to a set of roles
-    """
-    paper_permissions = {'paper_manager', 'paper_judge', 'paper_content_reviewer', 'paper_layout_reviewer'}
-    role_criteria = [EventPrincipal.has_management_permission(permission, explicit=True)
-                     for permission in paper_permissions]
-    query = (user.in_event_acls
-             .join(Event)
-             .options(noload('user'), noload('local_group'), load_only('event_id', 'permissions'))
-             .filter(~Event.is_deleted, Event.ends_after(dt))
-             .filter(db.or_(*role_criteria)))
-    return {principal.event_id: set(principal.permissions) & paper_permissions for principal in query}
-
-
 def get_contributions_with_paper_submitted_by_user(event, user):
     return (Contribution.query.with_parent(event)
             .filter(Contribution._paper_revisions.any(PaperRevision.submitter == user))
@@ -83,3 +59,17 @@ def get_user_submittable_contributions(event, user):
     return (_query_contributions_with_user_paper_submission_rights(event, user)
             .filter(db.or_(*criteria))
             .all())
+
+
+def get_events_with_paper_roles(user, dt=None):
+    """
+    Get the IDs and PR roles of events where the user has any kind
+    of paper reviewing privileges.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :return: A dict mapping event IDs to a set of roles
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return get_linked_events_with_roles(user, dt, {'paper_manager', 'paper_judge', 'paper_content_reviewer',
+                                                   'paper_layout_reviewer'})
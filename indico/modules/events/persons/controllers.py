@@ -32,7 +32,7 @@ from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.users import User
 from indico.util.date_time import now_utc
 from indico.util.i18n import _, ngettext
-from indico.util.placeholders import replace_placeholders
+from indico.util.placeholders import compile_placeholders
 from indico.web.flask.templating import get_template_module
 from indico.web.flask.util import jsonify_data, url_for
 from indico.web.forms.base import FormDefaults
@@ -244,13 +244,15 @@ class RHEmailEventPersons(RHManageEventBase):
         return jsonify_form(form, disabled_until_change=disabled_until_change, submit=_('Send'), back=_('Cancel'))
 
     def _send_emails(self, form, recipients):
+        body_tpl = compile_placeholders('event-persons-email', form.body.data, person=None, event=self.event,
+                                        register_link=self.no_account)
+        subject_tpl = compile_placeholders('event-persons-email', form.subject.data, person=None, event=self.event,
+                                           register_link=self.no_account)
         for recipient in recipients:
             if self.no_account and isinstance(recipient, EventPerson):
                 recipient.invited_dt = now_utc()
-            email_body = replace_placeholders('event-persons-email', form.body.data, person=recipient,
-                                              event=self.event, register_link=self.no_account)
-            email_subject = replace_placeholders('event-persons-email', form.subject.data, person=recipient,
-                                                 event=self.event, register_link=self.no_account)
+            email_body = body_tpl.render(person=recipient, event=self.event, register_link=self.no_account)
+            email_subject = subject_tpl.render(person=recipient, event=self.event, register_link=self.no_account)
             tpl = get_template_module('emails/custom.html', subject=email_subject, body=email_body)
             bcc = [session.user.email] if form.copy_for_sender.data else []
             email = make_email(to_list=recipient.email, bcc_list=bcc, from_address=form.from_address.data,
@@ -117,4 +117,34 @@
       },
     });
   };
+
+  global.setupRegistrationTaskProgress = function setupRegistrationTaskProgress() {
+    var $container = $('#registration-task-progress');
+    var $done = $container.find('.done');
+
+    function checkProgress() {
+      if (!$.contains(document, $container[0])) {
+        // the dialog has been closed
+        return;
+      }
+      $.ajax({
+        url: $container.data('status-url'),
+        dataType: 'json',
+        error: handleAjaxError,
+        success: function(data) {
+          $done.text(data.done);
+          if (data.state === 'success') {
+            location.href = $container.data('redirect-url');
+          } else if (data.state === 'failed') {
+            $container.find('.task-running').hide();
+            $container.find('.task-failed').show();
+          } else {
+            setTimeout(checkProgress, 1000);
+          }
+        },
+      });
+    }
+
+    checkProgress();
+  };
 })(window);
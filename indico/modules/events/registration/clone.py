@@ -125,8 +125,7 @@ class RegistrationCloner(EventCloner):
                                                             for attr in reg_data_attrs})
                 new_registration_data.field_data = field_data_map[old_registration_data.field_data]
                 if old_registration_data.storage_file_id is not None:
-                    with old_registration_data.open() as fd:
-                        new_registration_data.save(fd)
+                    new_registration_data.save_copy(old_registration_data)
             db.session.flush()
             signals.event.registration_state_updated.send(new_registration, previous_state=None)
 
@@ -9,6 +9,7 @@ from __future__ import unicode_literals
 
 from flask import request
 from sqlalchemy.orm import contains_eager, defaultload
+from werkzeug.utils import cached_property
 
 from indico.modules.events.management.controllers import RHManageEventBase
 from indico.modules.events.registration.controllers import RegistrationFormMixin
@@ -29,7 +30,10 @@ class RHManageRegFormBase(RegistrationFormMixin, RHManageRegFormsBase):
     def _process_args(self):
         RHManageRegFormsBase._process_args(self)
         RegistrationFormMixin._process_args(self)
-        self.list_generator = RegistrationListGenerator(regform=self.regform)
+
+    @cached_property
+    def list_generator(self):
+        return RegistrationListGenerator(regform=self.regform)
 
 
 class RHManageRegistrationBase(RHManageRegFormBase):
@@ -14,12 +14,12 @@ from io import BytesIO
 from flask import flash, jsonify, redirect, render_template, request, session
 from sqlalchemy.orm import joinedload, subqueryload
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
+from werkzeug.utils import cached_property
 
 from indico.core import signals
 from indico.core.config import config
 from indico.core.db import db
 from indico.core.errors import NoReportError
-from indico.core.notifications import make_email, send_email
 from indico.legacy.common.cache import GenericCache
 from indico.legacy.pdfinterface.conference import RegistrantsListToBookPDF, RegistrantsListToPDF
 from indico.modules.designer import PageLayout, TemplateType
@@ -39,11 +39,14 @@ from indico.modules.events.registration.forms import (BadgeSettingsForm, CreateM
                                                       EmailRegistrantsForm, ImportRegistrationsForm)
 from indico.modules.events.registration.models.items import PersonalDataType, RegistrationFormItemType
 from indico.modules.events.registration.models.registrations import Registration, RegistrationData, RegistrationState
-from indico.modules.events.registration.notifications import notify_registration_state_update
+from indico.modules.events.registration.notifications import RegistrantEmailSender, notify_registration_state_update
 from indico.modules.events.registration.settings import event_badge_settings
+from indico.modules.events.registration.tasks import (REGISTRATION_TASK_CHUNK_SIZE, import_registrations,
+                                                      registration_task_progress_cache, send_registrant_emails,
+                                                      set_registration_task_progress)
 from indico.modules.events.registration.util import (create_registration, generate_spreadsheet_from_registrations,
-                                                     get_event_section_data, get_ticket_attachments, get_title_uuid,
-                                                     import_registrations_from_csv, make_registration_form)
+                                                     get_event_section_data, get_title_uuid, load_registration_data,
+                                                     make_registration_form, parse_registrations_csv)
 from indico.modules.events.registration.views import WPManageRegistration
 from indico.modules.events.util import ZipGeneratorMixin
 from indico.modules.users import User
@@ -192,24 +195,36 @@ class RHRegistrationEmailRegistrantsPreview(RHRegistrationsActionBase):
         return jsonify(html=html)
 
 
+def _start_registrations_task(regform, task, total, *args):
+    """Run a task processing many registrations in the background.
+
+    :return: A response showing the progress of the task
+    """
+    key = unicode(uuid.uuid4())
+    set_registration_task_progress(key, 'pending', total)
+    task.delay(regform, *(args + (session.user, key)))
+    return jsonify_template('events/registration/management/task_progress.html', total=total,
+                            status_url=url_for('.registrations_task_status', regform, uuid=key),
+                            redirect_url=url_for('.manage_reglist', regform))
+
+
 class RHRegistrationEmailRegistrants(RHRegistrationsActionBase):
     """Send email to selected registrants"""
 
+    def _get_email_data(self, form):
+        return {
+            'subject': form.subject.data,
+            'body': form.body.data,
+            'from_address': form.from_address.data,
+            'cc_list': form.cc_addresses.data,
+            'bcc_list': [session.user.email] if form.copy_for_sender.data else [],
+            'attach_ticket': 'attach_ticket' in form and form.attach_ticket.data,
+        }
+
     def _send_emails(self, form):
+        sender = RegistrantEmailSender(self.regform, **self._get_email_data(form))
         for registration in self.registrations:
-            email_body = replace_placeholders('registration-email', form.body.data, regform=self.regform,
-                                              registration=registration)
-            email_subject = replace_placeholders('registration-email', form.subject.data, regform=self.regform,
-                                                 registration=registration)
-            template = get_template_module('events/registration/emails/custom_email.html',
-                                           email_subject=email_subject, email_body=email_body)
-            bcc = [session.user.email] if form.copy_for_sender.data else []
-            attach_ticket = 'attach_ticket' in form and form.attach_ticket.data and not registration.is_ticket_blocked
-            attachments = get_ticket_attachments(registration) if attach_ticket else None
-            email = make_email(to_list=registration.email, cc_list=form.cc_addresses.data, bcc_list=bcc,
-                               from_address=form.from_address.data, template=template, html=True,
-                               attachments=attachments)
-            send_email(email, self.event, 'Registration')
+            sender.send(registration)
 
     def _process(self):
         tpl = get_template_module('events/registration/emails/custom_email_default.html')
@@ -220,6 +235,10 @@ class RHRegistrationEmailRegistrants(RHRegistrationsActionBase):
         if not self.regform.tickets_enabled:
             del form.attach_ticket
         if form.validate_on_submit():
+            if len(self.registrations) > REGISTRATION_TASK_CHUNK_SIZE:
+                # sending many emails (especially with tickets) takes a while
+                return _start_registrations_task(self.regform, send_registrant_emails, len(self.registrations),
+                                                 [r.id for r in self.registrations], self._get_email_data(form))
             self._send_emails(form)
             num_emails_sent = len(self.registrations)
             flash(ngettext("The email was sent.",
@@ -312,19 +331,28 @@ class RHRegistrationsExportBase(RHRegistrationsActionBase):
     """Base class for all registration list export RHs"""
 
     ALLOW_LOCKED = True
-    registration_query_options = (subqueryload('data'),)
 
-    def _process_args(self):
-        RHRegistrationsActionBase._process_args(self)
-        self.export_config = self.list_generator.get_list_export_config()
+    @property
+    def registration_query_options(self):
+        # the data of the exported fields is loaded separately, but the
+        # price is calculated from the data of all billable fields
+        if 'price' in self.export_config['static_item_ids']:
+            return (subqueryload('data').joinedload('field_data'),)
+        return ()
+
+    @cached_property
+    def export_config(self):
+        return self.list_generator.get_list_export_config()
 
 
 class RHRegistrationsExportPDFTable(RHRegistrationsExportBase):
     """Export registration list to a PDF in table style"""
 
     def _process(self):
-        pdf = RegistrantsListToPDF(self.event, reglist=self.registrations, display=self.export_config['regform_items'],
-                                   static_items=self.export_config['static_item_ids'])
+        regform_items = self.export_config['regform_items']
+        pdf = RegistrantsListToPDF(self.event, reglist=self.registrations, display=regform_items,
+                                   static_items=self.export_config['static_item_ids'],
+                                   registration_data=load_registration_data(self.registrations, regform_items))
         try:
             data = pdf.getPDFBin()
         except Exception:
@@ -338,6 +366,8 @@ class RHRegistrationsExportPDFTable(RHRegistrationsExportBase):
 class RHRegistrationsExportPDFBook(RHRegistrationsExportBase):
     """Export registration list to a PDF in book style"""
 
+    registration_query_options = (subqueryload('data'),)
+
     def _process(self):
         static_item_ids, item_ids = self.list_generator.get_item_ids()
         pdf = RegistrantsListToBookPDF(self.event, self.regform, self.registrations, item_ids, static_item_ids)
@@ -370,9 +400,13 @@ class RHRegistrationsImport(RHRegistrationsActionBase):
 
         if form.validate_on_submit():
             skip_moderation = self.regform.moderation_enabled and form.skip_moderation.data
-            registrations = import_registrations_from_csv(self.regform, form.source_file.data,
-                                                          skip_moderation=skip_moderation,
-                                                          notify_users=form.notify_users.data)
+            rows = parse_registrations_csv(self.regform, form.source_file.data)
+            if len(rows) > REGISTRATION_TASK_CHUNK_SIZE:
+                return _start_registrations_task(self.regform, import_registrations, len(rows), rows,
+                                                 skip_moderation, form.notify_users.data)
+            registrations = [create_registration(self.regform, data, notify_user=form.notify_users.data,
+                                                 skip_moderation=skip_moderation)
+                             for data in rows]
             flash(ngettext("{} registration has been imported.",
                            "{} registrations have been imported.",
                            len(registrations)).format(len(registrations)), 'success')
@@ -382,6 +416,19 @@ class RHRegistrationsImport(RHRegistrationsActionBase):
                                 regform=self.regform)
 
 
+class RHRegistrationsTaskStatus(RHManageRegFormBase):
+    """Get the progress of a task processing registrations in the background."""
+
+    def _process(self):
+        progress = registration_task_progress_cache.get(request.view_args['uuid'])
+        if progress is None:
+            raise NotFound
+        if progress['state'] == 'success':
+            flash(ngettext('{} registration has been processed.', '{} registrations have been processed.',
+                           progress['total']).format(progress['total']), 'success')
+        return jsonify(progress)
+
+
 class RHRegistrationsPrintBadges(RHRegistrationsActionBase):
     ALLOW_LOCKED = True
     normalize_url_spec = {
@@ -607,6 +654,8 @@ class RHRegistrationsModifyStatus(RHRegistrationsActionBase):
 class RHRegistrationsExportAttachments(RHRegistrationsExportBase, ZipGeneratorMixin):
     """Export registration attachments in a zip file"""
 
+    registration_query_options = (subqueryload('data'),)
+
     def _prepare_folder_structure(self, attachment):
         registration = attachment.registration
         regform_title = secure_filename(attachment.registration.registration_form.title, 'registration_form')
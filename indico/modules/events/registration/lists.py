@@ -10,12 +10,13 @@ from __future__ import unicode_literals
 from collections import OrderedDict
 
 from flask import request
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import subqueryload
 
 from indico.core.db import db
 from indico.modules.events.registration.models.form_fields import RegistrationFormFieldData
 from indico.modules.events.registration.models.items import PersonalDataType, RegistrationFormItem
 from indico.modules.events.registration.models.registrations import Registration, RegistrationData, RegistrationState
+from indico.modules.events.registration.util import get_registrations_with_files, load_registration_data
 from indico.modules.events.util import ListGeneratorBase
 from indico.util.i18n import _
 from indico.web.flask.templating import get_template_module
@@ -126,7 +127,6 @@ class RegistrationListGenerator(ListGeneratorBase):
         return (Registration.query
                 .with_parent(self.regform)
                 .filter(~Registration.is_deleted)
-                .options(joinedload('data').joinedload('field_data').joinedload('field'))
                 .order_by(db.func.lower(Registration.last_name), db.func.lower(Registration.first_name)))
 
     def _filter_list_entries(self, query, filters):
@@ -168,13 +168,21 @@ class RegistrationListGenerator(ListGeneratorBase):
         reg_list_config = self._get_config()
         registrations_query = self._build_query()
         total_entries = registrations_query.count()
-        registrations = self._filter_list_entries(registrations_query, reg_list_config['filters']).all()
         dynamic_item_ids, static_item_ids = self._split_item_ids(reg_list_config['items'], 'dynamic')
+        if 'price' in static_item_ids:
+            # the price is calculated from the data of all billable fields
+            registrations_query = registrations_query.options(subqueryload('data').joinedload('field_data'))
+        registrations = self._filter_list_entries(registrations_query, reg_list_config['filters']).all()
         static_columns = self._get_static_columns(static_item_ids)
         regform_items = self._get_sorted_regform_items(dynamic_item_ids)
+        # only the data of the displayed fields is loaded
+        data_fields = regform_items + self._get_sorted_regform_items([col['id'] for col in static_columns
+                                                                      if isinstance(col['id'], int)])
         return {
             'regform': self.regform,
             'registrations': registrations,
+            'registration_data': load_registration_data(registrations, data_fields),
+            'registrations_with_files': get_registrations_with_files(registrations),
             'total_registrations': total_entries,
             'static_columns': static_columns,
             'dynamic_columns': regform_items,
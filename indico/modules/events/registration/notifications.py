@@ -12,7 +12,7 @@ from flask import session
 from indico.core import signals
 from indico.core.notifications import make_email, send_email
 from indico.modules.events.registration.models.registrations import RegistrationState
-from indico.util.placeholders import replace_placeholders
+from indico.util.placeholders import compile_placeholders, replace_placeholders
 from indico.util.signals import values_from_signal
 from indico.web.flask.templating import get_template_module
 
@@ -65,3 +65,44 @@ def notify_registration_state_update(registration):
     _notify_registration(registration, 'registration_state_update_to_registrant.html')
     if registration.registration_form.manager_notifications_enabled:
         _notify_registration(registration, 'registration_state_update_to_managers.html', to_managers=True)
+
+
+class RegistrantEmailSender(object):
+    """Send a custom email to registrants.
+
+    Everything which is the same for all registrants (the parsed
+    subject and body and the ticket template) is only prepared once,
+    so this is suitable for sending emails to many registrants.
+
+    :param regform: the `RegistrationForm` of the registrants
+    :param subject: the email subject, which may contain placeholders
+    :param body: the email body, which may contain placeholders
+    :param from_address: the sender address
+    :param cc_list: a list of CC addresses
+    :param bcc_list: a list of BCC addresses
+    :param attach_ticket: whether to attach the tickets of the
+                          registrants (unless they are blocked)
+    """
+
+    def __init__(self, regform, subject, body, from_address, cc_list=(), bcc_list=(), attach_ticket=False):
+        from indico.modules.events.registration.util import get_ticket_template
+        self.regform = regform
+        self.subject_tpl = compile_placeholders('registration-email', subject, regform=regform, registration=None)
+        self.body_tpl = compile_placeholders('registration-email', body, regform=regform, registration=None)
+        self.from_address = from_address
+        self.cc_list = list(cc_list)
+        self.bcc_list = list(bcc_list)
+        self.ticket_template = get_ticket_template(regform) if attach_ticket else None
+
+    def send(self, registration):
+        from indico.modules.events.registration.util import get_ticket_attachments
+        email_subject = self.subject_tpl.render(regform=self.regform, registration=registration)
+        email_body = self.body_tpl.render(regform=self.regform, registration=registration)
+        template = get_template_module('events/registration/emails/custom_email.html',
+                                       email_subject=email_subject, email_body=email_body)
+        attachments = None
+        if self.ticket_template is not None and not registration.is_ticket_blocked:
+            attachments = get_ticket_attachments(registration, self.ticket_template)
+        email = make_email(to_list=registration.email, cc_list=self.cc_list, bcc_list=self.bcc_list,
+                           from_address=self.from_address, template=template, html=True, attachments=attachments)
+        send_email(email, self.regform.event, 'Registration')
@@ -0,0 +1,102 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from flask import session
+from sqlalchemy.orm import joinedload, subqueryload
+
+from indico.core.celery import celery
+from indico.core.db import db
+from indico.core.notifications import flush_email_queue
+from indico.legacy.common.cache import GenericCache
+from indico.modules.events.registration import logger
+from indico.modules.events.registration.models.registrations import Registration
+from indico.modules.events.registration.notifications import RegistrantEmailSender
+from indico.modules.events.registration.util import create_registration
+
+
+registration_task_progress_cache = GenericCache('registration-tasks')
+
+#: How long the progress of a background task is kept (in seconds)
+REGISTRATION_TASK_PROGRESS_TTL = 3600
+#: How many registrations are processed before committing
+REGISTRATION_TASK_CHUNK_SIZE = 100
+
+
+def set_registration_task_progress(key, state, total, done=0):
+    registration_task_progress_cache.set(key, {'state': state, 'total': total, 'done': done},
+                                         time=REGISTRATION_TASK_PROGRESS_TTL)
+
+
+def _set_user(user):
+    session.user = user
+    session.lang = user.settings.get('lang')
+
+
+def _process_chunks(items, func, progress_key):
+    """Process a list of items in chunks.
+
+    The changes are committed and the queued emails sent after each
+    chunk, so a failure does not affect the chunks which have already
+    been processed.
+    """
+    total = len(items)
+    done = 0
+    set_registration_task_progress(progress_key, 'running', total)
+    try:
+        for i in xrange(0, total, REGISTRATION_TASK_CHUNK_SIZE):
+            chunk = items[i:i + REGISTRATION_TASK_CHUNK_SIZE]
+            func(chunk)
+            db.session.commit()
+            flush_email_queue()
+            done += len(chunk)
+            set_registration_task_progress(progress_key, 'running', total, done)
+    except Exception:
+        db.session.rollback()
+        set_registration_task_progress(progress_key, 'failed', total, done)
+        raise
+    set_registration_task_progress(progress_key, 'success', total, total)
+
+
+@celery.task(request_context=True)
+def send_registrant_emails(regform, registration_ids, email_data, user, progress_key):
+    """Send a custom email to many registrants in the background.
+
+    :param email_data: the arguments for :class:`.RegistrantEmailSender`
+    """
+    _set_user(user)
+    sender = RegistrantEmailSender(regform, **email_data)
+
+    def _send(ids):
+        registrations = (Registration.query
+                         .with_parent(regform)
+                         .filter(Registration.id.in_(ids), ~Registration.is_deleted)
+                         .options(joinedload('registration_form'), subqueryload('data'))
+                         .all())
+        for registration in registrations:
+            sender.send(registration)
+
+    _process_chunks(registration_ids, _send, progress_key)
+    logger.info('Email sent to %d registrants of %r by %r', len(registration_ids), regform, user)
+
+
+@celery.task(request_context=True)
+def import_registrations(regform, rows, skip_moderation, notify_users, user, progress_key):
+    """Create many registrations in the background.
+
+    :param rows: a list containing the data of each registration, as
+                 returned by :func:`.parse_registrations_csv`
+    """
+    _set_user(user)
+
+    def _create(chunk):
+        for data in chunk:
+            create_registration(regform, data, notify_user=notify_users, skip_moderation=skip_moderation)
+
+    _process_chunks(rows, _create, progress_key)
+    logger.info('%d registrations imported into %r by %r', len(rows), regform, user)
@@ -0,0 +1,53 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from indico.modules.events.registration.models.registrations import Registration, RegistrationState
+from indico.modules.events.registration.tasks import import_registrations, send_registrant_emails
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+@pytest.fixture(autouse=True)
+def set_progress(mocker):
+    mocker.patch('indico.modules.events.registration.tasks.REGISTRATION_TASK_CHUNK_SIZE', 2)
+    return mocker.patch('indico.modules.events.registration.tasks.set_registration_task_progress')
+
+
+def test_import_registrations(dummy_regform, dummy_user, set_progress):
+    rows = [{'email': 'pig{}@example.com'.format(i), 'first_name': 'Guinea', 'last_name': 'Pig {}'.format(i),
+             'affiliation': '', 'phone': '', 'position': ''}
+            for i in xrange(5)]
+    import_registrations(dummy_regform, rows, True, False, dummy_user, 'key')
+    registrations = Registration.query.with_parent(dummy_regform).order_by(Registration.email).all()
+    assert [r.email for r in registrations] == [row['email'] for row in rows]
+    assert all(r.state == RegistrationState.complete for r in registrations)
+    set_progress.assert_any_call('key', 'running', 5, 4)
+    set_progress.assert_called_with('key', 'success', 5, 5)
+
+
+def test_send_registrant_emails(mocker, db, dummy_regform, dummy_user, set_progress):
+    send_email = mocker.patch('indico.modules.events.registration.notifications.send_email')
+    registrations = []
+    for i in xrange(3):
+        registration = Registration(registration_form=dummy_regform, first_name='Guinea', last_name='Pig',
+                                    email='pig{}@example.com'.format(i), currency='USD',
+                                    state=RegistrationState.complete)
+        dummy_regform.event.registrations.append(registration)
+        registrations.append(registration)
+    db.session.flush()
+    email_data = {'subject': 'Hello {first_name}', 'body': 'Your ID is {id}', 'from_address': 'noreply@example.com'}
+    send_registrant_emails(dummy_regform, [r.id for r in registrations], email_data, dummy_user, 'key')
+    emails = sorted((call[0][0] for call in send_email.call_args_list), key=lambda email: email['to'])
+    assert [email['to'] for email in emails] == [{r.email} for r in registrations]
+    assert all(email['subject'] == '[Indico] Hello Guinea' for email in emails)
+    assert all('Your ID is {}'.format(r.friendly_id) in email['body'] for email, r in zip(emails, registrations))
+    set_progress.assert_called_with('key', 'success', 3, 3)
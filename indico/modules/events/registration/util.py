@@ -15,7 +15,7 @@ from operator import attrgetter
 from flask import current_app, json, session
 from qrcode import QRCode, constants
 from sqlalchemy import and_, or_
-from sqlalchemy.orm import joinedload, load_only, undefer
+from sqlalchemy.orm import joinedload, undefer
 from werkzeug.urls import url_parse
 from wtforms import BooleanField, ValidationError
 
@@ -25,7 +25,6 @@ from indico.core.db import db
 from indico.core.db.sqlalchemy.util.session import no_autoflush
 from indico.core.errors import UserValueError
 from indico.modules.events import EventLogKind, EventLogRealm
-from indico.modules.events.models.events import Event
 from indico.modules.events.models.persons import EventPerson
 from indico.modules.events.payment.models.transactions import TransactionStatus
 from indico.modules.events.registration import logger
@@ -295,6 +294,89 @@ def modify_registration(registration, data, management=False, notify_user=True):
                       session.user, data={'Email': registration.email})
 
 
+class RegistrationDataValue(object):
+    """The value of a field in a registration, loaded for display only.
+
+    This is a lightweight replacement for :class:`.RegistrationData`
+    which provides the attributes needed to get the friendly data of
+    the field.  Registrations which submitted the same data for a field
+    share the same object, so its friendly data is only generated once.
+    """
+
+    __slots__ = ('field_data', 'data', 'filename', '_formatter', '_friendly_data')
+
+    def __init__(self, field_data, data, filename, formatter):
+        self.field_data = field_data
+        self.data = data
+        self.filename = filename
+        self._formatter = formatter
+        self._friendly_data = {}
+
+    @property
+    def friendly_data(self):
+        return self.get_friendly_data()
+
+    @property
+    def search_data(self):
+        return self.get_friendly_data(for_search=True)
+
+    def get_friendly_data(self, **kwargs):
+        key = frozenset(kwargs.iteritems())
+        try:
+            return self._friendly_data[key]
+        except KeyError:
+            rv = self._friendly_data[key] = self._formatter(self, **kwargs)
+            return rv
+
+
+def load_registration_data(registrations, fields):
+    """Load the data of some fields for many registrations.
+
+    Instead of loading a :class:`.RegistrationData` object for each
+    field of each registration, only the raw values of the requested
+    fields are loaded.
+
+    :param registrations: The registrations to load the data for
+    :param fields: The registration form fields to load the data for
+    :return: A dict mapping registration ids to dicts mapping field ids
+             to :class:`RegistrationDataValue` objects.
+    """
+    registration_ids = {r.id for r in registrations}
+    field_ids = {f.id for f in fields if f.is_field}
+    rv = {registration_id: {} for registration_id in registration_ids}
+    if not registration_ids or not field_ids:
+        return rv
+    field_data = {fd.id: fd for fd in (RegistrationFormFieldData.query
+                                       .filter(RegistrationFormFieldData.field_id.in_(field_ids))
+                                       .options(joinedload('field')))}
+    formatters = {fd.field_id: fd.field.field_impl.get_friendly_data for fd in field_data.itervalues()}
+    query = (db.session.query(RegistrationData.registration_id, RegistrationData.field_data_id,
+                              db.cast(RegistrationData.data, db.Text), RegistrationData.filename)
+             .filter(RegistrationData.registration_id.in_(registration_ids),
+                     RegistrationData.field_data_id.in_(list(field_data))))
+    values = {}
+    for registration_id, field_data_id, raw_data, filename in query:
+        key = (field_data_id, raw_data, filename)
+        value = values.get(key)
+        if value is None:
+            fd = field_data[field_data_id]
+            value = values[key] = RegistrationDataValue(fd, json.loads(raw_data), filename, formatters[fd.field_id])
+        rv[registration_id][value.field_data.field_id] = value
+    return rv
+
+
+def get_registrations_with_files(registrations):
+    """Get the ids of the registrations which contain uploaded files."""
+    registration_ids = {r.id for r in registrations}
+    if not registration_ids:
+        return set()
+    query = (db.session.query(RegistrationData.registration_id)
+             .filter(RegistrationData.registration_id.in_(registration_ids),
+                     RegistrationData.storage_file_id.isnot(None))
+             .distinct())
+    return {registration_id for registration_id, in query}
+
+
 def generate_spreadsheet_from_registrations(registrations, regform_items, static_items):
     """Generates a spreadsheet data from a given registration list.
 
@@ -320,9 +402,10 @@ def generate_spreadsheet_from_registrations(registrations, regform_items, static
             field_names.append(unique_col('{} ({})'.format(item.title, 'Arrival'), item.id))
             field_names.append(unique_col('{} ({})'.format(item.title, 'Departure'), item.id))
     field_names.extend(title for name, (title, fn) in special_item_mapping.iteritems() if name in static_items)
+    registration_data = load_registration_data(registrations, regform_items)
     rows = []
     for registration in registrations:
-        data = registration.data_by_field
+        data = registration_data[registration.id]
         registration_dict = {
             'ID': registration.friendly_id,
             'Name': "{} {}".format(registration.first_name, registration.last_name)
@@ -379,23 +462,6 @@ def get_published_registrations(event):
             .all())
 
 
-def get_events_registered(user, dt=None):
-    """Gets the IDs of events where the user is registered.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    :return: A set of event ids
-    """
-    query = (user.registrations
-             .options(load_only('event_id'))
-             .options(joinedload(Registration.registration_form).load_only('event_id'))
-             .join(Registration.registration_form)
-             .join(RegistrationForm.event)
-             .filter(Registration.is_active, ~RegistrationForm.is_deleted, ~Event.is_deleted,
-                     Event.ends_after(dt)))
-    return {registration.event_id for registration in query}
-
-
 def build_registrations_api_data(event):
     api_data = []
     query = (RegistrationForm.query.with_parent(event)
@@ -511,11 +577,22 @@ def get_event_regforms_registrations(event, user, include_scheduled=True):
     return displayed_regforms, dict(all_regforms)
 
 
-def generate_ticket(registration):
+def get_ticket_template(regform):
+    """Get the designer template used for the tickets of a registration form."""
     from indico.modules.designer.util import get_default_template_on_category
+    return regform.ticket_template or get_default_template_on_category(regform.event.category)
+
+
+def generate_ticket(registration, template=None):
+    """Generate the ticket PDF of a registration.
+
+    :param registration: the `Registration` to generate the ticket for
+    :param template: the designer template to use; this avoids looking
+                     it up again when generating many tickets
+    """
     from indico.modules.events.registration.controllers.management.tickets import DEFAULT_TICKET_PRINTING_SETTINGS
-    template = (registration.registration_form.ticket_template or
-                get_default_template_on_category(registration.event.category))
+    if template is None:
+        template = get_ticket_template(registration.registration_form)
     signals.event.designer.print_badge_template.send(template, regform=registration.registration_form,
                                                      registrations=[registration])
     pdf_class = RegistrantsListToBadgesPDFFoldable if template.backside_template else RegistrantsListToBadgesPDF
@@ -523,8 +600,8 @@ def generate_ticket(registration):
     return pdf.get_pdf()
 
 
-def get_ticket_attachments(registration):
-    return [('Ticket.pdf', generate_ticket(registration).getvalue())]
+def get_ticket_attachments(registration, template=None):
+    return [('Ticket.pdf', generate_ticket(registration, template).getvalue())]
 
 
 def update_regform_item_positions(regform):
@@ -544,6 +621,16 @@ def update_regform_item_positions(regform):
 
 def import_registrations_from_csv(regform, fileobj, skip_moderation=True, notify_users=False):
     """Import event registrants from a CSV file into a form."""
+    return [create_registration(regform, data, notify_user=notify_users, skip_moderation=skip_moderation)
+            for data in parse_registrations_csv(regform, fileobj)]
+
+
+def parse_registrations_csv(regform, fileobj):
+    """Parse and validate a CSV file containing event registrants.
+
+    :return: A list containing the registration data for each row,
+             suitable for :func:`create_registration`.
+    """
     reader = csv.reader(fileobj.read().splitlines())
     query = db.session.query(Registration.email).with_parent(regform).filter(Registration.is_active)
     registered_emails = {email for (email,) in query}
@@ -577,8 +664,7 @@ def import_registrations_from_csv(regform, fileobj, skip_moderation=True, notify
             'phone': phone,
             'position': position
         })
-    return [create_registration(regform, data, notify_user=notify_users, skip_moderation=skip_moderation)
-            for data in todo]
+    return todo
 
 
 def get_registered_event_persons(event):
@@ -588,3 +674,14 @@ def get_registered_event_persons(event):
                                                   or_(Registration.user_id == EventPerson.user_id,
                                                       Registration.email == EventPerson.email)))
     return set(query)
+
+
+def get_events_registered(user, dt=None):
+    """Gets the IDs of events where the user is registered.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :return: A set of event ids
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return set(get_linked_events_with_roles(user, dt, {'registration_registrant'}))
@@ -15,8 +15,10 @@ import pytest
 from indico.core.db import db
 from indico.core.errors import UserValueError
 from indico.modules.events.models.persons import EventPerson
+from indico.modules.events.registration.models.items import PersonalDataType
 from indico.modules.events.registration.util import (create_registration, get_event_regforms_registrations,
-                                                     get_registered_event_persons, import_registrations_from_csv)
+                                                     get_registered_event_persons, get_registrations_with_files,
+                                                     import_registrations_from_csv, load_registration_data)
 
 
 pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
@@ -196,3 +198,26 @@ def test_get_registered_event_persons(dummy_event, dummy_user, dummy_regform):
 
     registered_persons = get_registered_event_persons(dummy_event)
     assert registered_persons == {user_person, no_user_person}
+
+
+def test_load_registration_data(dummy_regform):
+    registrations = [create_registration(dummy_regform, {'email': '{}@example.com'.format(name.lower()),
+                                                         'first_name': name, 'last_name': 'Doe',
+                                                         'affiliation': 'ACME Inc.'}, notify_user=False)
+                     for name in ('John', 'Jane')]
+    fields = {x.personal_data_type: x for x in dummy_regform.form_items if x.is_field}
+    selected = [fields[PersonalDataType.first_name], fields[PersonalDataType.affiliation]]
+    data = load_registration_data(registrations, selected)
+    assert set(data) == {r.id for r in registrations}
+    for registration in registrations:
+        assert set(data[registration.id]) == {f.id for f in selected}
+        for field in selected:
+            value = data[registration.id][field.id]
+            reg_data = registration.data_by_field[field.id]
+            assert value.data == reg_data.data
+            assert value.friendly_data == reg_data.friendly_data
+            assert value.search_data == reg_data.search_data
+    # identical values are only formatted once
+    affiliation_id = fields[PersonalDataType.affiliation].id
+    assert data[registrations[0].id][affiliation_id] is data[registrations[1].id][affiliation_id]
+    assert get_registrations_with_files(registrations) == set()
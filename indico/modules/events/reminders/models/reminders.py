@@ -18,6 +18,11 @@ from indico.modules.events.reminders import logger
 from indico.modules.events.reminders.util import make_reminder_email
 from indico.util.date_time import now_utc
 from indico.util.string import format_repr, return_ascii
+from indico.util.struct.iterables import grouper
+
+
+#: The maximum number of BCC recipients in a single reminder email
+MAX_RECIPIENTS_PER_EMAIL = 500
 
 
 class EventReminder(db.Model):
@@ -135,9 +140,15 @@ class EventReminder(db.Model):
         This includes both explicit recipients and, if enabled,
         participants of the event.
         """
+        from indico.modules.events.registration.models.forms import RegistrationForm
         recipients = set(self.recipients)
         if self.send_to_participants:
-            recipients.update(reg.email for reg in Registration.get_all_for_event(self.event))
+            query = (db.session.query(Registration.email)
+                     .join(Registration.registration_form)
+                     .filter(Registration.event_id == self.event_id,
+                             Registration.is_active,
+                             ~RegistrationForm.is_deleted))
+            recipients.update(email for email, in query)
         recipients.discard('')  # just in case there was an empty email address somewhere
         return recipients
 
@@ -155,15 +166,22 @@ class EventReminder(db.Model):
         return not self.is_sent and self.scheduled_dt <= now_utc()
 
     def send(self):
-        """Sends the reminder to its recipients."""
+        """Sends the reminder to its recipients.
+
+        The email is rendered only once and then sent in batches of
+        at most :data:`MAX_RECIPIENTS_PER_EMAIL` BCC recipients.
+        """
         self.is_sent = True
         recipients = self.all_recipients
         if not recipients:
             logger.info('Notification %s has no recipients; not sending anything', self)
             return
         email_tpl = make_reminder_email(self.event, self.include_summary, self.include_description, self.message)
-        email = make_email(bcc_list=recipients, from_address=self.reply_to_address, template=email_tpl)
-        send_email(email, self.event, 'Reminder', self.creator)
+        subject = email_tpl.get_subject()
+        body = email_tpl.get_body()
+        for bcc_list in grouper(sorted(recipients), MAX_RECIPIENTS_PER_EMAIL, skip_missing=True):
+            email = make_email(bcc_list=bcc_list, from_address=self.reply_to_address, subject=subject, body=body)
+            send_email(email, self.event, 'Reminder', self.creator)
 
     @return_ascii
     def __repr__(self):
@@ -0,0 +1,68 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from indico.modules.events.registration.models.registrations import Registration, RegistrationState
+from indico.modules.events.reminders.models.reminders import EventReminder
+from indico.util.date_time import now_utc
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+@pytest.fixture
+def create_reminder(db, dummy_event, dummy_user):
+    def _create(**kwargs):
+        reminder = EventReminder(event=dummy_event, creator=dummy_user, scheduled_dt=now_utc(),
+                                 reply_to_address='noreply@example.com', **kwargs)
+        db.session.add(reminder)
+        db.session.flush()
+        return reminder
+    return _create
+
+
+@pytest.fixture
+def create_registrations(db, dummy_event, dummy_regform):
+    def _create(count, state=RegistrationState.complete):
+        for i in xrange(count):
+            reg = Registration(registration_form=dummy_regform, first_name='Guinea', last_name='Pig', state=state,
+                               currency='USD', email='pig{}-{}@example.com'.format(i, state.name))
+            dummy_event.registrations.append(reg)
+        db.session.flush()
+    return _create
+
+
+def test_all_recipients(create_reminder, create_registrations):
+    create_registrations(3)
+    create_registrations(2, state=RegistrationState.withdrawn)
+    reminder = create_reminder(recipients=['foo@example.com', ''])
+    assert reminder.all_recipients == {'foo@example.com'}
+    reminder.send_to_participants = True
+    assert reminder.all_recipients == {'foo@example.com', 'pig0-complete@example.com', 'pig1-complete@example.com',
+                                       'pig2-complete@example.com'}
+
+
+@pytest.mark.parametrize(('count', 'expected_emails'), (
+    (0, 0),
+    (1, 1),
+    (500, 1),
+    (501, 2),
+    (1200, 3),
+))
+def test_send_batches(mocker, create_reminder, create_registrations, count, expected_emails):
+    send_email = mocker.patch('indico.modules.events.reminders.models.reminders.send_email')
+    create_registrations(count)
+    reminder = create_reminder(send_to_participants=True)
+    reminder.send()
+    assert reminder.is_sent
+    assert send_email.call_count == expected_emails
+    emails = [call[0][0] for call in send_email.call_args_list]
+    assert sum(len(email['bcc']) for email in emails) == count
+    assert len({email['body'] for email in emails}) <= 1
@@ -23,6 +23,23 @@ def send_event_reminders():
                                        EventReminder.scheduled_dt <= now_utc(),
                                        _join=EventReminder.event)
     for reminder in reminders:
-        logger.info('Sending event reminder: %s', reminder)
-        reminder.send()
+        logger.info('Queuing event reminder: %s', reminder)
+        send_event_reminder.delay(reminder)
+
+
+@celery.task(name='send_event_reminder')
+def send_event_reminder(reminder):
+    """Send a single reminder.
+
+    Reminders are sent in separate tasks so a reminder with many
+    recipients does not delay the other ones which are due.
+    """
+    # lock the reminder and reload its state; if the periodic task ran
+    # again before this task was executed it may have been queued twice
+    db.session.refresh(reminder, with_for_update=True)
+    if reminder.is_sent or reminder.event.is_deleted:
+        db.session.rollback()
+        return
+    logger.info('Sending event reminder: %s', reminder)
+    reminder.send()
     db.session.commit()
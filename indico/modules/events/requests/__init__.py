@@ -50,8 +50,13 @@ def _merge_users(target, source, **kwargs):
 
 @signals.event.deleted.connect
 def _event_deleted(event, **kwargs):
+    _events_deleted([event])
+
+
+@signals.event.deleted_many.connect
+def _events_deleted(events, **kwargs):
     from indico.modules.events.requests.models.requests import Request, RequestState
-    query = (Request.query.with_parent(event)
-             .filter(Request.state.in_((RequestState.accepted, RequestState.pending))))
+    query = Request.query.filter(Request.event_id.in_({e.id for e in events}),
+                                 Request.state.in_((RequestState.accepted, RequestState.pending)))
     for req in query:
         req.definition.withdraw(req, notify_event_managers=False)
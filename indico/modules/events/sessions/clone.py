@@ -8,6 +8,7 @@
 from __future__ import unicode_literals
 
 from sqlalchemy.orm import joinedload, subqueryload
+from werkzeug.utils import cached_property
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import clone_principals
@@ -41,14 +42,18 @@ class SessionCloner(EventCloner):
         db.session.flush()
         return {'session_map': self._session_map, 'session_block_map': self._session_block_map}
 
+    @cached_property
+    def _old_sessions(self):
+        return (Session.query.with_parent(self.old_event)
+                .options(joinedload('blocks'),
+                         joinedload('own_venue'),
+                         joinedload('own_room').lazyload('*'),
+                         subqueryload('acl_entries'))
+                .all())
+
     def _clone_sessions(self, new_event):
         attrs = get_simple_column_attrs(Session) | {'own_room', 'own_venue'}
-        query = (Session.query.with_parent(self.old_event)
-                 .options(joinedload('blocks'),
-                          joinedload('own_venue'),
-                          joinedload('own_room').lazyload('*'),
-                          subqueryload('acl_entries')))
-        for old_sess in query:
+        for old_sess in self._old_sessions:
             sess = Session()
             sess.populate_from_attrs(old_sess, attrs)
             sess.blocks = list(self._clone_session_blocks(old_sess.blocks))
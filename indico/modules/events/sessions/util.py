@@ -7,7 +7,6 @@
 
 from __future__ import unicode_literals
 
-from collections import defaultdict
 from io import BytesIO
 
 from flask import session
@@ -16,11 +15,10 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import Table, TableStyle
-from sqlalchemy.orm import contains_eager, joinedload, load_only, noload
+from sqlalchemy.orm import joinedload
 
 from indico.core.db import db
 from indico.legacy.pdfinterface.base import Paragraph, PDFBase
-from indico.modules.events import Event
 from indico.modules.events.sessions.models.principals import SessionPrincipal
 from indico.modules.events.sessions.models.sessions import Session
 from indico.util.i18n import _
@@ -115,34 +113,6 @@ def session_coordinator_priv_enabled(event, priv):
     return session_settings.get(event, COORDINATOR_PRIV_SETTINGS[priv])
 
 
-def get_events_with_linked_sessions(user, dt=None):
-    """Returns a dict with keys representing event_id and the values containing
-    data about the user rights for sessions within the event
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    """
-    query = (user.in_session_acls
-             .options(load_only('session_id', 'permissions', 'full_access', 'read_access'))
-             .options(noload('*'))
-             .options(contains_eager(SessionPrincipal.session).load_only('event_id'))
-             .join(Session)
-             .join(Event, Event.id == Session.event_id)
-             .filter(~Session.is_deleted, ~Event.is_deleted, Event.ends_after(dt)))
-    data = defaultdict(set)
-    for principal in query:
-        roles = data[principal.session.event_id]
-        if 'coordinate' in principal.permissions:
-            roles.add('session_coordinator')
-        if 'submit' in principal.permissions:
-            roles.add('session_submission')
-        if principal.full_access:
-            roles.add('session_manager')
-        if principal.read_access:
-            roles.add('session_access')
-    return data
-
-
 def _query_sessions_for_user(event, user):
     return (Session.query.with_parent(event)
             .filter(Session.acl_entries.any(db.and_(SessionPrincipal.has_management_permission('coordinate'),
@@ -196,3 +166,15 @@ def get_session_timetable_pdf(sess, **kwargs):
 def render_session_type_row(session_type):
     template = get_template_module('events/sessions/management/_types_table.html')
     return template.types_table_row(session_type=session_type)
+
+
+def get_events_with_linked_sessions(user, dt=None):
+    """Returns a dict with keys representing event_id and the values containing
+    data about the user rights for sessions within the event
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return get_linked_events_with_roles(user, dt, {'session_coordinator', 'session_submission', 'session_manager',
+                                                   'session_access'})
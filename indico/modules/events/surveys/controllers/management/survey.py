@@ -155,13 +155,14 @@ class RHSendSurveyLinks(RHManageSurveyBase):
         return jsonify_form(form)
 
     def _send_emails(self, form, recipients):
+        # the placeholders do not depend on the recipient, so the email
+        # only needs to be rendered once
+        email_body = replace_placeholders('survey-link-email', form.body.data, event=self.event, survey=self.survey)
+        email_subject = replace_placeholders('survey-link-email', form.subject.data, event=self.event,
+                                             survey=self.survey)
+        tpl = get_template_module('emails/custom.html', subject=email_subject, body=email_body)
+        bcc = [session.user.email] if form.copy_for_sender.data else []
         for recipient in recipients:
-            email_body = replace_placeholders('survey-link-email', form.body.data, event=self.event,
-                                              survey=self.survey)
-            email_subject = replace_placeholders('survey-link-email', form.subject.data, event=self.event,
-                                                 survey=self.survey)
-            tpl = get_template_module('emails/custom.html', subject=email_subject, body=email_body)
-            bcc = [session.user.email] if form.copy_for_sender.data else []
             email = make_email(to_list=recipient,  bcc_list=bcc, from_address=form.from_address.data,
                                template=tpl, html=True)
             send_email(email, self.event, 'Surveys')
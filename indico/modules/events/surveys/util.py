@@ -10,10 +10,8 @@ from __future__ import unicode_literals
 from operator import attrgetter
 
 from flask import session
-from sqlalchemy.orm import joinedload, load_only
 
 from indico.core.db import db
-from indico.modules.events import Event
 from indico.modules.events.surveys.models.submissions import SurveySubmission
 from indico.util.caching import memoize_request
 from indico.util.spreadsheets import unique_col
@@ -115,24 +113,6 @@ def _filter_submissions(survey, submission_ids):
     return [x for x in survey.submissions if x.is_submitted]
 
 
-def get_events_with_submitted_surveys(user, dt=None):
-    """Gets the IDs of events where the user submitted a survey.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    :return: A set of event ids
-    """
-    from indico.modules.events.surveys.models.surveys import Survey
-    # Survey submissions are not stored in links anymore, so we need to get them directly
-    query = (user.survey_submissions
-             .options(load_only('survey_id'))
-             .options(joinedload(SurveySubmission.survey).load_only('event_id'))
-             .join(Survey)
-             .join(Event)
-             .filter(~Survey.is_deleted, ~Event.is_deleted, Event.ends_after(dt)))
-    return {submission.survey.event_id for submission in query}
-
-
 def query_active_surveys(event):
     from indico.modules.events.surveys.models.surveys import Survey
     private_criterion = ~Survey.private
@@ -142,3 +122,14 @@ def query_active_surveys(event):
     return (Survey.query.with_parent(event)
             .filter(Survey.is_active, private_criterion)
             .order_by(db.func.lower(Survey.title)))
+
+
+def get_events_with_submitted_surveys(user, dt=None):
+    """Gets the IDs of events where the user submitted a survey.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :return: A set of event ids
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return set(get_linked_events_with_roles(user, dt, {'survey_submitter'}))
@@ -7,11 +7,16 @@
 
 from __future__ import unicode_literals
 
-from flask import render_template, session
+from itertools import chain
+
+from flask import g, has_app_context, render_template, session
+from sqlalchemy.event import listens_for
 
 from indico.core import signals
+from indico.core.db import db
 from indico.core.logger import Logger
 from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
+from indico.util.caching import memoize
 from indico.util.date_time import now_utc
 from indico.util.i18n import _
 from indico.web.flask.templating import template_hook
@@ -44,6 +49,67 @@ def _extend_event_management_menu(sender, event, **kwargs):
                             icon='calendar')
 
 
+@memoize
+def _get_timetable_object_types():
+    from indico.modules.attachments.models.attachments import Attachment
+    from indico.modules.attachments.models.folders import AttachmentFolder
+    from indico.modules.events.contributions.models.contributions import Contribution
+    from indico.modules.events.contributions.models.persons import ContributionPersonLink, SubContributionPersonLink
+    from indico.modules.events.contributions.models.references import ContributionReference, SubContributionReference
+    from indico.modules.events.contributions.models.subcontributions import SubContribution
+    from indico.modules.events.models.events import Event
+    from indico.modules.events.models.persons import EventPerson
+    from indico.modules.events.sessions.models.blocks import SessionBlock
+    from indico.modules.events.sessions.models.persons import SessionBlockPersonLink
+    from indico.modules.events.sessions.models.sessions import Session
+    from indico.modules.events.timetable.models.breaks import Break
+    # the attributes leading from an object to the event it belongs to
+    return [((Event,), ()),
+            ((TimetableEntry, Contribution, Session, Break, EventPerson, AttachmentFolder), ('event',)),
+            ((SessionBlock,), ('session', 'event')),
+            ((Attachment,), ('folder', 'event')),
+            ((SubContribution, ContributionReference), ('contribution', 'event')),
+            ((SubContributionReference,), ('subcontribution', 'contribution', 'event')),
+            ((ContributionPersonLink, SubContributionPersonLink, SessionBlockPersonLink), ('person', 'event'))]
+
+
+def _get_timetable_event(obj):
+    """Get the event whose timetable shows the given object."""
+    for types, path in _get_timetable_object_types():
+        if isinstance(obj, types):
+            for attr in path:
+                obj = getattr(obj, attr)
+                if obj is None:
+                    break
+            return obj
+    return None
+
+
+@listens_for(db.session, 'before_flush')
+def _collect_timetable_changes(db_session, flush_context, instances):
+    if not has_app_context():
+        return
+    event_ids = set()
+    for obj in chain(db_session.new, db_session.dirty, db_session.deleted):
+        event = _get_timetable_event(obj)
+        if event is None or event.id is None:
+            continue
+        # changes to the event's relationships (e.g. new log entries) do not matter
+        if obj is event and obj in db_session.dirty and not db_session.is_modified(obj, include_collections=False):
+            continue
+        event_ids.add(event.id)
+    if event_ids:
+        g.setdefault('timetable_changed_event_ids', set()).update(event_ids)
+
+
+@signals.after_commit.connect
+def _invalidate_timetable_cache(sender, **kwargs):
+    from indico.modules.events.timetable.legacy import bump_timetable_version
+    if has_app_context() and g.get('timetable_changed_event_ids'):
+        for event_id in g.pop('timetable_changed_event_ids'):
+            bump_timetable_version(event_id)
+
+
 @signals.event_management.get_cloners.connect
 def _get_timetable_cloner(sender, **kwargs):
     from indico.modules.events.timetable.clone import TimetableCloner
@@ -8,6 +8,7 @@
 from __future__ import unicode_literals
 
 from sqlalchemy.orm import defaultload, joinedload
+from werkzeug.utils import cached_property
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.models import get_simple_column_attrs
@@ -42,10 +43,8 @@ class TimetableCloner(EventCloner):
             self._clone_timetable(new_event)
         db.session.flush()
 
-    def _clone_timetable(self, new_event):
-        offset = new_event.start_dt - self.old_event.start_dt
-        # no need to copy the type; it's set automatically based on the object
-        attrs = get_simple_column_attrs(TimetableEntry) - {'type', 'start_dt'}
+    @cached_property
+    def _old_entries(self):
         break_strategy = defaultload('break_')
         break_strategy.joinedload('own_venue')
         break_strategy.joinedload('own_room').lazyload('*')
@@ -58,11 +57,17 @@ class TimetableCloner(EventCloner):
                  .options(joinedload('parent').lazyload('*'),
                           break_strategy)
                  .order_by(TimetableEntry.parent_id.is_(None).desc(), entry_key_order))
+        return query.all()
+
+    def _clone_timetable(self, new_event):
+        offset = new_event.start_dt - self.old_event.start_dt
+        # no need to copy the type; it's set automatically based on the object
+        attrs = get_simple_column_attrs(TimetableEntry) - {'type', 'start_dt'}
         # iterate over all timetable entries; start with top-level
         # ones so we can build a mapping that can be used once we
         # reach nested entries
         entry_map = {}
-        for old_entry in query:
+        for old_entry in self._old_entries:
             entry = TimetableEntry()
             entry.start_dt = old_entry.start_dt + offset
             entry.populate_from_attrs(old_entry, attrs)
@@ -18,8 +18,7 @@ from indico.modules.events.controllers.base import RHDisplayEventBase
 from indico.modules.events.layout import layout_settings
 from indico.modules.events.timetable.forms import TimetablePDFExportForm
 from indico.modules.events.timetable.legacy import TimetableSerializer
-from indico.modules.events.timetable.util import (get_timetable_offline_pdf_generator, render_entry_info_balloon,
-                                                  serialize_event_info)
+from indico.modules.events.timetable.util import get_timetable_pdf, render_entry_info_balloon, serialize_event_info
 from indico.modules.events.timetable.views import WPDisplayTimetable
 from indico.modules.events.util import get_theme
 from indico.modules.events.views import WPSimpleEventDisplay
@@ -92,9 +91,9 @@ class RHTimetableExportPDF(RHTimetableProtectionBase):
                                      'showSpeakerAffiliation': form_data['showSpeakerAffiliation'],
                                      'showSessionDescription': form_data['showSessionDescription']}
             if request.args.get('download') == '1':
-                pdf = pdf_class(self.event, session.user, sortingCrit=None, ttPDFFormat=pdf_format,
-                                pagesize=form.pagesize.data, **additional_params)
-                return send_file('timetable.pdf', BytesIO(pdf.getPDFBin()), 'application/pdf')
+                pdf = get_timetable_pdf(self.event, session.user, pdf_class, pdf_format, pagesize=form.pagesize.data,
+                                        **additional_params)
+                return send_file('timetable.pdf', BytesIO(pdf), 'application/pdf')
             else:
                 url = url_for(request.endpoint, **dict(request.view_args, download='1', **request.args.to_dict(False)))
                 return jsonify_data(flash=False, redirect=url, redirect_no_loading=True)
@@ -104,5 +103,6 @@ class RHTimetableExportPDF(RHTimetableProtectionBase):
 
 class RHTimetableExportDefaultPDF(RHTimetableProtectionBase):
     def _process(self):
-        pdf = get_timetable_offline_pdf_generator(self.event)
-        return send_file('timetable.pdf', BytesIO(pdf.getPDFBin()), 'application/pdf')
+        pdf = get_timetable_pdf(self.event, session.user, TimeTablePlain, TimetablePDFFormat(), pagesize='A4',
+                                fontsize='normal')
+        return send_file('timetable.pdf', BytesIO(pdf), 'application/pdf')
@@ -10,17 +10,81 @@ from __future__ import unicode_literals
 from collections import defaultdict
 from hashlib import md5
 from itertools import chain
+from uuid import uuid4
 
 from flask import has_request_context, session
 from sqlalchemy.orm import defaultload
 
+from indico.core.db import db
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.legacy.common.cache import GenericCache
+from indico.modules.attachments.models.folders import AttachmentFolder
+from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.contributions.models.persons import AuthorType
 from indico.modules.events.models.events import EventType
+from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
 from indico.util.date_time import iterdays
 from indico.web.flask.util import url_for
 
 
+timetable_cache = GenericCache('timetable')
+
+#: How long a serialized timetable is kept in the cache (in seconds)
+TIMETABLE_CACHE_TTL = 3600
+
+
+def get_timetable_version(event_id):
+    """Get the version of the timetable contents of an event.
+
+    The version changes whenever something shown in the timetable
+    changes, so it can be used to cache data derived from it.
+    """
+    version = timetable_cache.get('version-{}'.format(event_id))
+    if version is None:
+        version = bump_timetable_version(event_id)
+    return version
+
+
+def bump_timetable_version(event_id):
+    """Change the version of the timetable contents of an event.
+
+    This invalidates all cached data derived from the timetable.
+    """
+    version = uuid4().hex
+    timetable_cache.set('version-{}'.format(event_id), version)
+    return version
+
+
+def _has_protected_content(event):
+    """Check if some timetable content of the event is restricted."""
+    protected = ProtectionMode.protected
+    queries = [Contribution.query.with_parent(event).filter(~Contribution.is_deleted,
+                                                            Contribution.protection_mode == protected),
+               Session.query.with_parent(event).filter(~Session.is_deleted, Session.protection_mode == protected),
+               AttachmentFolder.query.filter(AttachmentFolder.event_id == event.id, ~AttachmentFolder.is_deleted,
+                                             AttachmentFolder.protection_mode == protected)]
+    return db.session.query(db.or_(*(query.exists() for query in queries))).scalar()
+
+
+def get_timetable_visibility_class(event, user, can_manage=None):
+    """Get the group of users who see the same timetable as a user.
+
+    :param can_manage: Whether the user can manage the event, if the
+                       caller already knows it.
+    :return: A string identifying the group or ``None`` if the
+             timetable seen by the user cannot be shared with other
+             users.
+    """
+    if can_manage is None:
+        can_manage = event.can_manage(user)
+    if can_manage:
+        return 'manager'
+    elif event.can_access(user) and not _has_protected_content(event):
+        return 'everything'
+    return None
+
+
 class TimetableSerializer(object):
     def __init__(self, event, management=False, user=None):
         self.management = management
@@ -30,6 +94,20 @@ class TimetableSerializer(object):
 
     def serialize_timetable(self, days=None, hide_weekends=False, strip_empty_days=False):
         tzinfo = self.event.tzinfo if self.management else self.event.display_tzinfo
+        visibility = get_timetable_visibility_class(self.event, self.user, can_manage=self.can_manage_event)
+        if visibility is None:
+            return self._serialize_timetable(tzinfo, days, hide_weekends, strip_empty_days)
+        options = (unicode(tzinfo), self.management, visibility, sorted(days) if days else None, hide_weekends,
+                   strip_empty_days)
+        cache_key = 'data-{}-{}-{}'.format(self.event.id, get_timetable_version(self.event.id),
+                                           md5(repr(options)).hexdigest())
+        timetable = timetable_cache.get(cache_key)
+        if timetable is None:
+            timetable = self._serialize_timetable(tzinfo, days, hide_weekends, strip_empty_days)
+            timetable_cache.set(cache_key, timetable, time=TIMETABLE_CACHE_TTL)
+        return timetable
+
+    def _serialize_timetable(self, tzinfo, days, hide_weekends, strip_empty_days):
         self.event.preload_all_acl_entries()
         timetable = {}
         for day in iterdays(self.event.start_dt.astimezone(tzinfo), self.event.end_dt.astimezone(tzinfo),
@@ -0,0 +1,71 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+import pytest
+
+from indico.core import signals
+from indico.core.db import db
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.modules.events.timetable.legacy import TimetableSerializer, get_timetable_version
+
+
+pytest_plugins = 'indico.modules.events.timetable.testing.fixtures'
+
+
+pytestmark = pytest.mark.usefixtures('timetable_cache')
+
+
+@pytest.fixture
+def dummy_entry(dummy_event, dummy_contribution, create_entry):
+    return create_entry(dummy_contribution, dummy_event.start_dt)
+
+
+def test_timetable_version(dummy_event, dummy_entry):
+    version = get_timetable_version(dummy_event.id)
+    assert get_timetable_version(dummy_event.id) == version
+    dummy_entry.contribution.title = 'Changed'
+    db.session.flush()
+    # the version only changes once the changes have been committed
+    assert get_timetable_version(dummy_event.id) == version
+    signals.after_commit.send()
+    assert get_timetable_version(dummy_event.id) != version
+
+
+def test_timetable_version_unrelated_change(dummy_event, dummy_entry, dummy_user):
+    signals.after_commit.send()
+    version = get_timetable_version(dummy_event.id)
+    dummy_user.first_name = 'Changed'
+    db.session.flush()
+    signals.after_commit.send()
+    assert get_timetable_version(dummy_event.id) == version
+
+
+@pytest.mark.usefixtures('request_context', 'dummy_entry')
+def test_serialize_timetable_cached(mocker, dummy_event, dummy_user):
+    dummy_event.end_dt = dummy_event.start_dt + timedelta(hours=1)
+    serialize = mocker.spy(TimetableSerializer, '_serialize_timetable')
+    timetable = TimetableSerializer(dummy_event, user=dummy_user).serialize_timetable()
+    assert TimetableSerializer(dummy_event, user=dummy_user).serialize_timetable() == timetable
+    assert serialize.call_count == 1
+    assert TimetableSerializer(dummy_event, management=True, user=dummy_user).serialize_timetable() != timetable
+    assert serialize.call_count == 2
+
+
+@pytest.mark.usefixtures('request_context')
+def test_serialize_timetable_protected(mocker, dummy_event, dummy_entry, dummy_user):
+    dummy_entry.contribution.protection_mode = ProtectionMode.protected
+    db.session.flush()
+    serialize = mocker.spy(TimetableSerializer, '_serialize_timetable')
+    timetable = TimetableSerializer(dummy_event, user=dummy_user).serialize_timetable()
+    assert not any(timetable.values())
+    TimetableSerializer(dummy_event, user=dummy_user).serialize_timetable()
+    # users who cannot see everything do not use the cache
+    assert serialize.call_count == 2
@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 import pytest
 
 from indico.modules.events.timetable.models.entries import TimetableEntry
+from indico.testing.util import DictCache
 
 
 @pytest.fixture
@@ -23,3 +24,12 @@ def create_entry(db):
         return entry
 
     return _create_entry
+
+
+@pytest.fixture
+def timetable_cache(mocker):
+    """Replaces the timetable cache with a plain dict"""
+    cache = DictCache()
+    mocker.patch('indico.modules.events.timetable.legacy.timetable_cache', cache)
+    mocker.patch('indico.modules.events.timetable.util.timetable_cache', cache)
+    return cache
@@ -8,6 +8,7 @@
 from __future__ import unicode_literals
 
 from collections import defaultdict
+from hashlib import md5
 from operator import attrgetter
 
 from flask import render_template, session
@@ -21,12 +22,14 @@ from indico.modules.events.models.events import Event
 from indico.modules.events.models.persons import EventPersonLink
 from indico.modules.events.sessions.models.blocks import SessionBlock
 from indico.modules.events.sessions.models.sessions import Session
-from indico.modules.events.timetable.legacy import TimetableSerializer, serialize_event_info
+from indico.modules.events.timetable.legacy import (TIMETABLE_CACHE_TTL, TimetableSerializer,
+                                                    get_timetable_version, get_timetable_visibility_class,
+                                                    serialize_event_info, timetable_cache)
 from indico.modules.events.timetable.models.breaks import Break
 from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
 from indico.util.caching import memoize_request
 from indico.util.date_time import format_time, get_day_end, iterdays
-from indico.util.i18n import _
+from indico.util.i18n import _, get_current_locale
 from indico.util.string import to_unicode
 from indico.web.flask.templating import get_template_module
 from indico.web.forms.colors import get_colors
@@ -307,6 +310,33 @@ def get_timetable_offline_pdf_generator(event):
                           fontsize='normal')
 
 
+def get_timetable_pdf(event, user, pdf_class, pdf_format, **kwargs):
+    """Generate a timetable PDF.
+
+    The PDF is cached for the users who see the same timetable (see
+    :func:`.get_timetable_visibility_class`) in the same timezone and
+    language until the timetable of the event changes.
+
+    :param pdf_class: The PDF generator class, i.e.
+                      :class:`.TimeTablePlain` or
+                      :class:`.SimplifiedTimeTablePlain`
+    :param pdf_format: The :class:`.TimetablePDFFormat` of the PDF
+    :param kwargs: Other arguments for the PDF generator
+    :return: The data of the PDF file
+    """
+    visibility = get_timetable_visibility_class(event, user)
+    if visibility is None:
+        return pdf_class(event, user, sortingCrit=None, ttPDFFormat=pdf_format, **kwargs).getPDFBin()
+    options = (pdf_class.__name__, visibility, event.display_tzinfo.zone, unicode(get_current_locale()),
+               sorted(vars(pdf_format).items()), sorted(kwargs.items()))
+    cache_key = 'pdf-{}-{}-{}'.format(event.id, get_timetable_version(event.id), md5(repr(options)).hexdigest())
+    pdf = timetable_cache.get(cache_key)
+    if pdf is None:
+        pdf = pdf_class(event, user, sortingCrit=None, ttPDFFormat=pdf_format, **kwargs).getPDFBin()
+        timetable_cache.set(cache_key, pdf, time=TIMETABLE_CACHE_TTL)
+    return pdf
+
+
 def get_time_changes_notifications(changes, tzinfo, entry=None):
     notifications = []
     for obj, change in changes.iteritems():
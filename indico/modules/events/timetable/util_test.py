@@ -5,12 +5,21 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 import pytest
+from flask import session
 from pytz import utc
 
-from indico.modules.events.timetable.util import find_latest_entry_end_dt
+from indico.core import signals
+from indico.core.db import db
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.legacy.pdfinterface.conference import SimplifiedTimeTablePlain, TimetablePDFFormat, TimeTablePlain
+from indico.modules.events.contributions.models.subcontributions import SubContribution
+from indico.modules.events.timetable.util import find_latest_entry_end_dt, get_timetable_pdf
+
+
+pytest_plugins = 'indico.modules.events.timetable.testing.fixtures'
 
 
 @pytest.mark.parametrize(('event_start_dt', 'event_end_dt', 'day', 'valid'), (
@@ -27,3 +36,64 @@ def test_find_latest_entry_end_dt_valid_day(dummy_event, event_start_dt, event_e
     if not valid:
         with pytest.raises(ValueError):
             find_latest_entry_end_dt(obj=dummy_event, day=day)
+
+
+@pytest.mark.usefixtures('request_context', 'timetable_cache')
+@pytest.mark.parametrize('pdf_class', (TimeTablePlain, SimplifiedTimeTablePlain))
+def test_get_timetable_pdf(mocker, dummy_event, dummy_contribution, dummy_user, create_entry, pdf_class):
+    dummy_event.end_dt = dummy_event.start_dt + timedelta(hours=2)
+    create_entry(dummy_contribution, dummy_event.start_dt)
+    pdf_format = TimetablePDFFormat()
+    pdf_format.contribsAtConfLevel = True
+    generate = mocker.spy(pdf_class, 'getPDFBin')
+    pdf = get_timetable_pdf(dummy_event, dummy_user, pdf_class, pdf_format, pagesize='A4')
+    assert pdf.startswith(b'%PDF')
+    assert get_timetable_pdf(dummy_event, dummy_user, pdf_class, pdf_format, pagesize='A4') == pdf
+    assert generate.call_count == 1
+    get_timetable_pdf(dummy_event, dummy_user, pdf_class, pdf_format, pagesize='A3')
+    assert generate.call_count == 2
+
+
+@pytest.mark.usefixtures('request_context')
+def test_get_timetable_pdf_timezone(mocker, dummy_event, dummy_contribution, dummy_user, create_entry, timetable_cache):
+    create_entry(dummy_contribution, dummy_event.start_dt)
+    generate = mocker.spy(TimeTablePlain, 'getPDFBin')
+    session.timezone = 'Europe/Zurich'
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, TimetablePDFFormat())
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, TimetablePDFFormat())
+    assert generate.call_count == 1
+    session.timezone = 'America/New_York'
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, TimetablePDFFormat())
+    # the times in the PDF depend on the display timezone of the user
+    assert generate.call_count == 2
+    assert len({key for key in timetable_cache if key.startswith('pdf-')}) == 2
+
+
+@pytest.mark.usefixtures('request_context', 'timetable_cache')
+def test_get_timetable_pdf_subcontribution_changed(mocker, dummy_event, dummy_contribution, dummy_user, create_entry):
+    create_entry(dummy_contribution, dummy_event.start_dt)
+    subcontrib = SubContribution(contribution=dummy_contribution, title='Sub', duration=timedelta(minutes=10))
+    db.session.flush()
+    signals.after_commit.send()
+    pdf_format = TimetablePDFFormat()
+    pdf_format.contribsAtConfLevel = True
+    generate = mocker.spy(TimeTablePlain, 'getPDFBin')
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, pdf_format)
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, pdf_format)
+    assert generate.call_count == 1
+    subcontrib.title = 'Changed'
+    db.session.flush()
+    signals.after_commit.send()
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, pdf_format)
+    assert generate.call_count == 2
+
+
+@pytest.mark.usefixtures('request_context', 'timetable_cache')
+def test_get_timetable_pdf_protected(mocker, dummy_event, dummy_contribution, dummy_user, create_entry):
+    create_entry(dummy_contribution, dummy_event.start_dt)
+    dummy_contribution.protection_mode = ProtectionMode.protected
+    generate = mocker.spy(TimeTablePlain, 'getPDFBin')
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, TimetablePDFFormat())
+    get_timetable_pdf(dummy_event, dummy_user, TimeTablePlain, TimetablePDFFormat())
+    # users who cannot see everything do not use the cache
+    assert generate.call_count == 2
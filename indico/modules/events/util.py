@@ -20,7 +20,6 @@ from zipfile import ZipFile
 
 from flask import current_app, flash, g, redirect, request, session
 from sqlalchemy import inspect
-from sqlalchemy.orm import load_only, noload
 from werkzeug.exceptions import BadRequest, Forbidden
 
 from indico.core import signals
@@ -32,9 +31,6 @@ from indico.modules.events import Event
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.contributions.models.subcontributions import SubContribution
 from indico.modules.events.layout import theme_settings
-from indico.modules.events.models.events import EventType
-from indico.modules.events.models.persons import EventPerson
-from indico.modules.events.models.principals import EventPrincipal
 from indico.modules.events.models.static_list_links import StaticListLink
 from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.events.timetable.models.breaks import Break
@@ -119,51 +115,6 @@ def get_theme(event, override_theme_id=None):
         raise BadRequest(response=redirect(event.url))
 
 
-def get_events_managed_by(user, dt=None):
-    """Gets the IDs of events where the user has management privs.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    :return: A set of event ids
-    """
-    query = (user.in_event_acls
-             .join(Event)
-             .options(noload('user'), noload('local_group'), load_only('event_id'))
-             .filter(~Event.is_deleted, Event.ends_after(dt))
-             .filter(EventPrincipal.has_management_permission('ANY')))
-    return {principal.event_id for principal in query}
-
-
-def get_events_created_by(user, dt=None):
-    """Gets the IDs of events created by the user
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    :return: A set of event ids
-    """
-    query = (user.created_events
-             .filter(~Event.is_deleted, Event.ends_after(dt))
-             .options(load_only('id')))
-    return {event.id for event in query}
-
-
-def get_events_with_linked_event_persons(user, dt=None):
-    """
-    Returns a dict containing the event ids and role for all events
-    where the user is a chairperson or (in case of a lecture) speaker.
-
-    :param user: A `User`
-    :param dt: Only include events taking place on/after that date
-    """
-    query = (user.event_persons
-             .with_entities(EventPerson.event_id, Event._type)
-             .join(Event, Event.id == EventPerson.event_id)
-             .filter(EventPerson.event_links.any())
-             .filter(~Event.is_deleted, Event.ends_after(dt)))
-    return {event_id: ('lecture_speaker' if event_type == EventType.lecture else 'conference_chair')
-            for event_id, event_type in query}
-
-
 def get_random_color(event):
     breaks = Break.query.filter(Break.timetable_entry.has(event=event))
     used_colors = {s.colors for s in event.sessions} | {b.colors for b in breaks}
@@ -667,3 +618,38 @@ class ZipGeneratorMixin:
     def _prepare_folder_structure(self, item):
         file_name = secure_filename('{}_{}'.format(unicode(item.id), item.filename), item.filename)
         return os.path.join(*self._adjust_path_length([file_name]))
+
+
+def get_events_managed_by(user, dt=None):
+    """Gets the IDs of events where the user has management privs.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :return: A set of event ids
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return set(get_linked_events_with_roles(user, dt, {'conference_manager'}))
+
+
+def get_events_created_by(user, dt=None):
+    """Gets the IDs of events created by the user
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :return: A set of event ids
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    return set(get_linked_events_with_roles(user, dt, {'conference_creator'}))
+
+
+def get_events_with_linked_event_persons(user, dt=None):
+    """
+    Returns a dict containing the event ids and role for all events
+    where the user is a chairperson or (in case of a lecture) speaker.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    """
+    from indico.modules.users.util import get_linked_events_with_roles
+    data = get_linked_events_with_roles(user, dt, {'lecture_speaker', 'conference_chair'})
+    return {event_id: roles.pop() for event_id, roles in data.iteritems()}
@@ -7,7 +7,8 @@
 
 from __future__ import unicode_literals
 
-from indico.modules.files.controllers import RHDeleteFile, RHFileInfo
+from indico.modules.files.controllers import (RHChunkedUploadStatus, RHDeleteFile, RHFileInfo, RHFinalizeUpload,
+                                              RHUploadChunk)
 from indico.web.flask.wrappers import IndicoBlueprint
 
 
@@ -15,3 +16,8 @@ _bp = IndicoBlueprint('files', __name__)
 
 _bp.add_url_rule('/files/<uuid:uuid>', 'file_info', RHFileInfo)
 _bp.add_url_rule('/files/<uuid:uuid>', 'delete_file', RHDeleteFile, methods=('DELETE',))
+
+# Chunked uploads; they are started using the context-specific upload endpoints
+_bp.add_url_rule('/files/uploads/<uuid:upload_id>', 'upload_status', RHChunkedUploadStatus)
+_bp.add_url_rule('/files/uploads/<uuid:upload_id>', 'upload_chunk', RHUploadChunk, methods=('POST',))
+_bp.add_url_rule('/files/uploads/<uuid:upload_id>/finalize', 'finalize_upload', RHFinalizeUpload, methods=('POST',))
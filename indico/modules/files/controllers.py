@@ -9,31 +9,46 @@ from __future__ import unicode_literals
 
 import mimetypes
 
-from flask import request
+from flask import jsonify, request, session
 from marshmallow import fields
-from werkzeug.exceptions import Forbidden
+from webargs import validate
+from werkzeug.exceptions import Forbidden, NotFound
 
 from indico.core.db import db
 from indico.modules.files import logger
 from indico.modules.files.models.files import File
 from indico.modules.files.schemas import FileSchema
+from indico.modules.files.util import UPLOAD_CHUNK_SIZE, ChunkedUpload
 from indico.web.args import use_kwargs
 from indico.web.rh import RHProtected
 
 
+def _guess_content_type(filename, default=None):
+    return mimetypes.guess_type(filename)[0] or default or 'application/octet-stream'
+
+
 class UploadFileMixin(object):
     """Mixin for RHs using the generic file upload system.
 
     An RH using this mixin needs to override the ``get_file_context`` method
     to specify how the file gets stored.
+
+    Large files may be uploaded in chunks instead: When the request contains
+    no file but its name and size, a chunked upload is started and the chunks
+    are then sent to the generic chunked upload endpoints.
     """
 
+    def _process(self):
+        if 'file' not in request.files and 'size' in (request.json or request.form):
+            return self._process_chunked()
+        return self._process_file()
+
     @use_kwargs({
         'file': fields.Field(location='files', required=True)
     })
-    def _process(self, file):
+    def _process_file(self, file):
         context = self.get_file_context()
-        content_type = mimetypes.guess_type(file.filename)[0] or file.mimetype or 'application/octet-stream'
+        content_type = _guess_content_type(file.filename, file.mimetype)
         f = File(filename=file.filename, content_type=content_type)
         f.save(context, file.stream)
         db.session.add(f)
@@ -41,6 +56,17 @@ class UploadFileMixin(object):
         logger.info('File %r uploaded (context: %r)', f, context)
         return FileSchema().jsonify(f), 201
 
+    @use_kwargs({
+        'filename': fields.String(required=True),
+        'size': fields.Integer(required=True, validate=validate.Range(min=0)),
+        'content_type': fields.String(missing=None),
+    })
+    def _process_chunked(self, filename, size, content_type):
+        context = self.get_file_context()
+        upload = ChunkedUpload.create(session.user, context, filename, _guess_content_type(filename, content_type),
+                                      size)
+        return jsonify(uuid=upload.uuid, chunk_size=UPLOAD_CHUNK_SIZE), 201
+
     def get_file_context(self):
         """The context of where the file is being uploaded.
 
@@ -53,6 +79,50 @@ class UploadFileMixin(object):
         raise NotImplementedError
 
 
+class RHChunkedUploadBase(RHProtected):
+    def _process_args(self):
+        self.upload = ChunkedUpload.get(request.view_args['upload_id'])
+        if self.upload is None:
+            raise NotFound
+
+    def _check_access(self):
+        RHProtected._check_access(self)
+        if self.upload.user_id != session.user.id:
+            raise Forbidden
+
+
+class RHChunkedUploadStatus(RHChunkedUploadBase):
+    """Get the progress of a chunked upload.
+
+    This is used by clients to resume an interrupted upload.
+    """
+
+    def _process(self):
+        return jsonify(uuid=self.upload.uuid, size=self.upload.size, received=self.upload.received)
+
+
+class RHUploadChunk(RHChunkedUploadBase):
+    """Append a chunk to a chunked upload.
+
+    The request body contains the raw data of the chunk.
+    """
+
+    @use_kwargs({
+        'offset': fields.Integer(location='query', required=True)
+    })
+    def _process(self, offset):
+        self.upload.append(request.stream, offset)
+        return jsonify(received=self.upload.received)
+
+
+class RHFinalizeUpload(RHChunkedUploadBase):
+    """Finish a chunked upload and create the uploaded file."""
+
+    def _process(self):
+        f = self.upload.finalize()
+        return FileSchema().jsonify(f), 201
+
+
 class RHFileBase(RHProtected):
     def _process_args(self):
         self.file = File.query.filter_by(uuid=request.view_args['uuid']).first_or_404()
@@ -0,0 +1,149 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import errno
+import fcntl
+import json
+import os
+from uuid import uuid4
+
+from werkzeug.exceptions import BadRequest, Conflict
+
+from indico.core.config import config
+from indico.core.db import db
+from indico.modules.files import logger
+from indico.modules.files.models.files import File
+
+
+#: The chunk size suggested to clients using chunked uploads
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class ChunkedUpload(object):
+    """A file upload which is sent in several chunks.
+
+    The chunks are appended to a file in the temp dir, so an upload
+    which got interrupted can be resumed at the offset of the data
+    received so far.  Once all data has been received, the upload is
+    finalized and the file moved into the storage backend.
+
+    Uploads which are never finalized are removed together with the
+    other old files in the temp dir.
+    """
+
+    def __init__(self, uuid, data):
+        self.uuid = uuid
+        self.user_id = data['user_id']
+        self.context = data['context']
+        self.filename = data['filename']
+        self.content_type = data['content_type']
+        self.size = data['size']
+
+    @staticmethod
+    def _get_path(uuid, ext):
+        return os.path.join(config.TEMP_DIR, 'upload-{}.{}'.format(uuid, ext))
+
+    @property
+    def path(self):
+        return self._get_path(self.uuid, 'data')
+
+    @property
+    def received(self):
+        """The number of bytes received so far."""
+        return os.path.getsize(self.path)
+
+    @classmethod
+    def create(cls, user, context, filename, content_type, size):
+        """Start a new chunked upload.
+
+        :param user: The user who is uploading the file.
+        :param context: The context where the file will be stored (see
+                        :meth:`.UploadFileMixin.get_file_context`).
+        :param filename: The name of the uploaded file.
+        :param content_type: The content type of the uploaded file.
+        :param size: The total size of the file in bytes.
+        """
+        uuid = unicode(uuid4())
+        data = {'user_id': user.id, 'context': list(context), 'filename': filename, 'content_type': content_type,
+                'size': size}
+        with open(cls._get_path(uuid, 'json'), 'w') as f:
+            json.dump(data, f)
+        open(cls._get_path(uuid, 'data'), 'wb').close()
+        return cls(uuid, data)
+
+    @classmethod
+    def get(cls, uuid):
+        """Get an upload which has not been finalized yet.
+
+        :return: A `ChunkedUpload` or ``None`` if no such upload exists.
+        """
+        try:
+            with open(cls._get_path(uuid, 'json')) as f:
+                data = json.load(f)
+        except IOError:
+            return None
+        return cls(unicode(uuid), data)
+
+    def append(self, stream, offset):
+        """Append a chunk of data to the upload.
+
+        :param stream: A file-like object containing the chunk.
+        :param offset: The offset of the chunk within the file.  It must
+                       be the number of bytes received so far; this
+                       ensures that a retried chunk is never stored twice.
+        """
+        with open(self.path, 'ab') as f:
+            # a client may retry a chunk while the original request is
+            # still running, so only one request may write at a time
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError as exc:
+                if exc.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise
+                raise Conflict('Another chunk of this upload is being received')
+            # keep the metadata from being removed as an old temp file
+            os.utime(self._get_path(self.uuid, 'json'), None)
+            f.seek(0, os.SEEK_END)
+            if f.tell() != offset:
+                raise Conflict('Unexpected offset (expected {})'.format(f.tell()))
+            while True:
+                chunk = stream.read(1024 * 1024)
+                if not chunk:
+                    break
+                if f.tell() + len(chunk) > self.size:
+                    f.truncate(offset)
+                    raise BadRequest('Received more data than expected')
+                f.write(chunk)
+
+    def finalize(self):
+        """Store the uploaded data in a new file.
+
+        The MD5 hash of the file is computed by the storage backend
+        while copying the data, so the data is only read once.
+
+        :return: The newly created `File`.
+        """
+        if self.received != self.size:
+            raise BadRequest('The upload is not complete yet')
+        f = File(filename=self.filename, content_type=self.content_type)
+        with open(self.path, 'rb') as data:
+            f.save(self.context, data)
+        db.session.add(f)
+        db.session.flush()
+        self.delete()
+        logger.info('File %r uploaded in chunks (context: %r)', f, self.context)
+        return f
+
+    def delete(self):
+        """Remove the temporary data of the upload."""
+        for ext in ('data', 'json'):
+            try:
+                os.remove(self._get_path(self.uuid, ext))
+            except OSError:
+                pass
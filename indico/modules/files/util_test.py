@@ -0,0 +1,69 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import fcntl
+import os
+from hashlib import md5
+from io import BytesIO
+
+import pytest
+from werkzeug.exceptions import BadRequest, Conflict
+
+from indico.modules.files.util import ChunkedUpload
+
+
+def test_chunked_upload(db, dummy_user):
+    upload = ChunkedUpload.create(dummy_user, ('event', 123), 'test.txt', 'text/plain', 11)
+    upload.append(BytesIO(b'hello '), 0)
+    with pytest.raises(Conflict):
+        # chunk sent twice, e.g. after a network error
+        upload.append(BytesIO(b'hello '), 0)
+    with pytest.raises(BadRequest):
+        upload.finalize()
+    # resume the upload using a fresh object
+    upload = ChunkedUpload.get(upload.uuid)
+    assert upload.received == 6
+    upload.append(BytesIO(b'world'), upload.received)
+    f = upload.finalize()
+    assert f.filename == 'test.txt'
+    assert f.content_type == 'text/plain'
+    assert f.size == 11
+    assert f.md5 == md5(b'hello world').hexdigest()
+    assert f.storage_file_id.startswith('event/123/')
+    with f.open() as fd:
+        assert fd.read() == b'hello world'
+    assert ChunkedUpload.get(upload.uuid) is None
+
+
+def test_chunked_upload_too_large(dummy_user):
+    upload = ChunkedUpload.create(dummy_user, ('event', 123), 'test.txt', 'text/plain', 8)
+    upload.append(BytesIO(b'hello'), 0)
+    with pytest.raises(BadRequest):
+        upload.append(BytesIO(b'world'), 5)
+    assert upload.received == 5
+
+
+def test_chunked_upload_concurrent(dummy_user):
+    upload = ChunkedUpload.create(dummy_user, ('event', 123), 'test.txt', 'text/plain', 11)
+    with open(upload.path, 'ab') as f:
+        # another request is still writing the same chunk
+        fcntl.flock(f, fcntl.LOCK_EX)
+        with pytest.raises(Conflict):
+            upload.append(BytesIO(b'hello '), 0)
+    assert upload.received == 0
+    upload.append(BytesIO(b'hello '), 0)
+    assert upload.received == 6
+
+
+def test_chunked_upload_keeps_metadata_fresh(dummy_user):
+    upload = ChunkedUpload.create(dummy_user, ('event', 123), 'test.txt', 'text/plain', 11)
+    json_path = ChunkedUpload._get_path(upload.uuid, 'json')
+    os.utime(json_path, (0, 0))
+    upload.append(BytesIO(b'hello '), 0)
+    assert os.path.getmtime(json_path) > 0
@@ -96,10 +96,16 @@ def _merge_users(target, source, **kwargs):
 
 @signals.event.deleted.connect
 def _event_deleted(event, user, **kwargs):
-    from indico.modules.rb.models.reservations import Reservation
-    reservation_links = (event.all_room_reservation_links
+    _events_deleted([event], user)
+
+
+@signals.event.deleted_many.connect
+def _events_deleted(events, user, **kwargs):
+    from indico.modules.rb.models.reservations import Reservation, ReservationLink
+    reservation_links = (ReservationLink.query
                          .join(Reservation)
-                         .filter(~Reservation.is_rejected, ~Reservation.is_cancelled)
+                         .filter(ReservationLink.event_id.in_({e.id for e in events}),
+                                 ~Reservation.is_rejected, ~Reservation.is_cancelled)
                          .all())
     for link in reservation_links:
         link.reservation.cancel(user or session.user, 'Associated event was deleted')
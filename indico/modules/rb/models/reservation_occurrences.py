@@ -9,15 +9,17 @@ from datetime import datetime, timedelta
 from math import ceil
 
 from dateutil import rrule
-from sqlalchemy import Date, or_
+from psycopg2.extras import DateTimeRange
+from sqlalchemy import Date
+from sqlalchemy.dialects.postgresql import ARRAY, TSRANGE
+from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import defaultload
-from sqlalchemy.sql import cast
+from sqlalchemy.sql import any_, cast
 
 from indico.core import signals
 from indico.core.db import db
 from indico.core.db.sqlalchemy import PyIntEnum
-from indico.core.db.sqlalchemy.util.queries import db_dates_overlap
 from indico.core.errors import IndicoError
 from indico.modules.rb.models.reservation_edit_logs import ReservationEditLog
 from indico.modules.rb.models.util import proxy_to_reservation_if_last_valid_occurrence
@@ -39,10 +41,14 @@ class ReservationOccurrenceState(int, IndicoEnum):
 
 class ReservationOccurrence(db.Model, Serializer):
     __tablename__ = 'reservation_occurrences'
-    __table_args__ = (db.CheckConstraint("rejection_reason != ''", 'rejection_reason_not_empty'),
-                      {'schema': 'roombooking'})
     __api_public__ = (('start_dt', 'startDT'), ('end_dt', 'endDT'), 'is_cancelled', 'is_rejected')
 
+    @declared_attr
+    def __table_args__(cls):
+        return (db.CheckConstraint("rejection_reason != ''", 'rejection_reason_not_empty'),
+                db.Index('ix_reservation_occurrences_period', cls.period, postgresql_using='gist'),
+                {'schema': 'roombooking'})
+
     #: A relationship loading strategy that will avoid loading the
     #: users linked to a reservation.  You want to use this in pretty
     #: much all cases where you eager-load the `reservation` relationship.
@@ -93,6 +99,14 @@ class ReservationOccurrence(db.Model, Serializer):
     def date(self):
         return cast(self.start_dt, Date)
 
+    @hybrid_property
+    def period(self):
+        return DateTimeRange(self.start_dt, self.end_dt)
+
+    @period.expression
+    def period(cls):
+        return db.func.tsrange(cls.start_dt, cls.end_dt)
+
     @hybrid_property
     def is_valid(self):
         return self.state == ReservationOccurrenceState.valid
@@ -170,10 +184,17 @@ class ReservationOccurrence(db.Model, Serializer):
 
     @staticmethod
     def filter_overlap(occurrences):
+        """Get a filter for occurrences overlapping with any of the given ones.
+
+        The periods of the given occurrences are sent as a single array
+        of ranges which is checked using the GiST index on the period of
+        the occurrences, so the size of the query does not grow with the
+        number of occurrences to check.
+        """
         if not occurrences:
             raise RuntimeError('Cannot check for overlap with empty occurrence list')
-        return or_(db_dates_overlap(ReservationOccurrence, 'start_dt', occ.start_dt, 'end_dt', occ.end_dt)
-                   for occ in occurrences)
+        periods = [occ.period for occ in occurrences]
+        return ReservationOccurrence.period.op('&&')(any_(db.literal(periods, ARRAY(TSRANGE))))
 
     @classmethod
     def find_overlapping_with(cls, room, occurrences, skip_reservation_id=None):
@@ -207,6 +207,21 @@ def test_filter_overlap(create_occurrence, overlapping_combination_from_2am_to_4
     assert (occ1 in ReservationOccurrence.find_all(overlap_filter)) == expected
 
 
+def test_filter_overlap_many(create_occurrence):
+    occ1 = create_occurrence(start_dt=date.today() + relativedelta(hour=2),
+                             end_dt=date.today() + relativedelta(hour=4))
+    occ2 = create_occurrence(start_dt=date.today() + relativedelta(days=1, hour=2),
+                             end_dt=date.today() + relativedelta(days=1, hour=4))
+    candidates = ReservationOccurrence.create_series(date.today() + relativedelta(hour=4),
+                                                     date.today() + relativedelta(days=9, hour=5),
+                                                     (RepeatFrequency.DAY, 1))
+    assert ReservationOccurrence.find_all(ReservationOccurrence.filter_overlap(candidates)) == []
+    candidates[1].start_dt -= relativedelta(minutes=1)
+    assert ReservationOccurrence.find_all(ReservationOccurrence.filter_overlap(candidates)) == [occ2]
+    candidates[0].start_dt -= relativedelta(minutes=1)
+    assert set(ReservationOccurrence.find_all(ReservationOccurrence.filter_overlap(candidates))) == {occ1, occ2}
+
+
 def test_find_overlapping_with_different_room(overlapping_occurrences, create_room):
     db_occ, occ = overlapping_occurrences
     assert db_occ in ReservationOccurrence.find_overlapping_with(room=db_occ.reservation.room, occurrences=[occ]).all()
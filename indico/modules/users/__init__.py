@@ -51,6 +51,113 @@ def _category_deleted(category, **kwargs):
     category.favorite_of.clear()
 
 
+@signals.acl.entry_changed.connect
+def _acl_entry_changed(sender, obj, principal, **kwargs):
+    if isinstance(principal, User):
+        _invalidate_linked_events(principal)
+
+
+@signals.event.registration_created.connect
+@signals.event.registration_updated.connect
+@signals.event.registration_deleted.connect
+@signals.event.registration_state_updated.connect
+def _registration_changed(registration, **kwargs):
+    _invalidate_linked_events(registration.user)
+
+
+@signals.event.abstract_created.connect
+@signals.event.abstract_deleted.connect
+@signals.event.abstract_state_changed.connect
+def _abstract_changed(abstract, **kwargs):
+    _invalidate_linked_events(abstract.submitter)
+    _invalidate_person_links(abstract.person_links)
+
+
+@signals.event.contribution_created.connect
+@signals.event.contribution_updated.connect
+@signals.event.contribution_deleted.connect
+def _contribution_changed(contrib, changes=None, **kwargs):
+    _invalidate_person_links(contrib.person_links)
+    _invalidate_removed_person_links(changes)
+    for entry in contrib.acl_entries:
+        _invalidate_linked_events(entry.user)
+
+
+@signals.event.session_updated.connect
+@signals.event.session_deleted.connect
+def _session_changed(event_session, **kwargs):
+    _invalidate_person_links(event_session.conveners)
+    for entry in event_session.acl_entries:
+        _invalidate_linked_events(entry.user)
+
+
+@signals.event.session_block_deleted.connect
+def _session_block_deleted(block, **kwargs):
+    _invalidate_person_links(block.person_links)
+
+
+@signals.event.person_updated.connect
+def _person_updated(person, **kwargs):
+    # the person may have been linked to a different user before, and
+    # we do not know which one
+    from indico.modules.users.util import invalidate_linked_events_cache
+    invalidate_linked_events_cache()
+
+
+@signals.event.created.connect
+def _event_created(event, **kwargs):
+    _invalidate_linked_events(event.creator)
+
+
+@signals.event.updated.connect
+@signals.event.type_changed.connect
+def _event_updated(event, changes=None, **kwargs):
+    _invalidate_person_links(event.person_links)
+    _invalidate_removed_person_links(changes)
+
+
+@signals.event.deleted.connect
+@signals.event.deleted_many.connect
+def _event_deleted(sender, **kwargs):
+    from indico.modules.users.util import invalidate_linked_events_cache
+    invalidate_linked_events_cache()
+
+
+@signals.event.times_changed.connect
+def _times_changed(sender, entry, **kwargs):
+    if entry is None:
+        # the dates of the event itself changed
+        from indico.modules.users.util import invalidate_linked_events_cache
+        invalidate_linked_events_cache()
+
+
+@signals.users.merged.connect
+def _users_merged(target, source, **kwargs):
+    _invalidate_linked_events(target)
+    _invalidate_linked_events(source)
+
+
+def _invalidate_linked_events(user):
+    from indico.modules.users.util import invalidate_linked_events_cache
+    if user is not None:
+        invalidate_linked_events_cache(user)
+
+
+def _invalidate_person_links(person_links):
+    for link in person_links:
+        _invalidate_linked_events(link.person.user)
+
+
+def _invalidate_removed_person_links(changes):
+    """Invalidate the users of person links removed from an object."""
+    if not changes:
+        return
+    # events track the links directly, other objects the `person_link_data` dict
+    for key in ('person_links', 'person_link_data'):
+        if key in changes:
+            _invalidate_person_links(changes[key][0])
+
+
 @signals.menu.items.connect_via('admin-sidemenu')
 def _extend_admin_menu(sender, **kwargs):
     if session.user.is_admin:
@@ -39,8 +39,8 @@ from indico.modules.users.forms import (AdminAccountRegistrationForm, AdminsForm
                                         SearchForm, UserDetailsForm, UserEmailsForm, UserPreferencesForm)
 from indico.modules.users.models.emails import UserEmail
 from indico.modules.users.operations import create_user
-from indico.modules.users.util import (get_linked_events, get_related_categories, get_suggested_categories, merge_users,
-                                       search_users, serialize_user)
+from indico.modules.users.util import (build_user_search_query, get_linked_events, get_related_categories,
+                                       get_suggested_categories, merge_users, search_users, serialize_user)
 from indico.modules.users.views import WPUser, WPUserDashboard, WPUsersAdmin
 from indico.util.date_time import now_utc
 from indico.util.event import truncate_path
@@ -126,30 +126,35 @@ class RHUserDashboard(RHUserBase):
         if categories:
             category_ids = {c['categ'].id for c in categories.itervalues()}
             categories_events = get_events_in_categories(category_ids, self.user)
-        from_dt = now_utc(False) - relativedelta(weeks=1, hour=0, minute=0, second=0)
+        # truncate the date so the linked events can be cached for the rest of the day
+        from_dt = now_utc(False) - relativedelta(weeks=1, hour=0, minute=0, second=0, microsecond=0)
         linked_events = [(event, {'management': bool(roles & self.management_roles),
                                   'reviewing': bool(roles & self.reviewer_roles),
                                   'attendance': bool(roles & self.attendance_roles)})
                          for event, roles in get_linked_events(self.user, from_dt, 10).iteritems()]
+        suggested_categories = get_suggested_categories(self.user, [c['categ'] for c in categories.itervalues()])
         return WPUserDashboard.render_template('dashboard.html', 'dashboard',
                                                user=self.user,
                                                categories=categories,
                                                categories_events=categories_events,
-                                               suggested_categories=get_suggested_categories(self.user),
+                                               suggested_categories=suggested_categories,
                                                linked_events=linked_events)
 
 
 class RHExportDashboardICS(RHTokenProtected):
     @use_kwargs({
-        'from_': HumanizedDate(data_key='from', missing=lambda: now_utc(False) - relativedelta(weeks=1)),
+        # truncate the default date so the linked events can be cached for a while
+        'from_': HumanizedDate(data_key='from',
+                               missing=lambda: now_utc(False) - relativedelta(weeks=1, minute=0, second=0,
+                                                                              microsecond=0)),
         'include': fields.List(fields.Str(), missing={'linked', 'categories'}),
         'limit': fields.Integer(missing=100, validate=lambda v: 0 < v <= 500)
     })
     def _process(self, from_, include, limit):
-        categories = get_related_categories(self.user)
+        categories = get_related_categories(self.user, detailed=False)
         categories_events = []
         if categories:
-            category_ids = {c['categ'].id for c in categories.itervalues()}
+            category_ids = {c.id for c in categories}
             categories_events = get_events_in_categories(category_ids, self.user, limit=limit)
 
         linked_events = get_linked_events(
@@ -610,6 +615,16 @@ class RHUserSearch(RHProtected):
             if ext_id is not None:
                 cache.set(ext_id, self.externals[ext_id], 86400)
 
+    def _search_local_users(self, exact, favorites_first, criteria):
+        # when only searching local users we can do the ranking and limiting
+        # in the database instead of loading every single matching user
+        criteria = {key: value.strip() for key, value in criteria.iteritems() if value.strip()}
+        if not criteria:
+            return [], 0
+        query = (build_user_search_query(criteria, exact=exact, include_pending=True, favorites_first=favorites_first)
+                 .filter(~User.is_system))
+        return [search_result_schema.dump(user) for user in query.limit(10)], query.count()
+
     @use_kwargs({
         'first_name': fields.Str(validate=validate.Length(min=1)),
         'last_name': fields.Str(validate=validate.Length(min=1)),
@@ -623,13 +638,17 @@ class RHUserSearch(RHProtected):
         'No criteria provided'
     ))
     def _process(self, exact, external, favorites_first, **criteria):
-        matches = search_users(exact=exact, include_pending=True, external=external, **criteria)
         self.externals = {}
-        results = sorted((self._serialize_entry(entry) for entry in matches), key=itemgetter('full_name'))
+        if external:
+            matches = search_users(exact=exact, include_pending=True, external=external, **criteria)
+            results = [self._serialize_entry(entry) for entry in matches]
+            total = len(results)
+        else:
+            results, total = self._search_local_users(exact, favorites_first, criteria)
+        results.sort(key=itemgetter('full_name'))
         if favorites_first:
             favorites = {u.id for u in session.user.favorite_users}
             results.sort(key=lambda x: x['id'] not in favorites)
-        total = len(results)
         results = results[:10]
         self._process_pending_users(results)
         return jsonify(users=results, total=total)
@@ -0,0 +1,30 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import json
+from urllib import urlencode
+
+import pytest
+from flask import session
+
+
+@pytest.mark.parametrize('favorites_first', (False, True))
+def test_user_search(app, create_user, dummy_user, favorites_first):
+    jdoe = create_user(1, first_name='John', last_name='Doe', email='jdoe@example.com')
+    jadoe = create_user(2, first_name='Jane', last_name='Doe', email='jane@example.com')
+    create_user(3, first_name='Guinea', last_name='Pig', email='pig@example.com')
+    dummy_user.favorite_users.add(jdoe)
+    query_string = urlencode({'last_name': 'doe', 'favorites_first': favorites_first})
+    with app.test_request_context('/user/search/', query_string=query_string):
+        session.user = dummy_user
+        rv = app.view_functions['users.user_search']()
+    data = json.loads(rv.get_data())
+    assert data['total'] == 2
+    expected = [jdoe.id, jadoe.id] if favorites_first else [jadoe.id, jdoe.id]
+    assert [u['id'] for u in data['users']] == expected
@@ -654,3 +654,5 @@ define_unaccented_lowercase_index(User.first_name)
 define_unaccented_lowercase_index(User.last_name)
 define_unaccented_lowercase_index(User.phone)
 define_unaccented_lowercase_index(User.address)
+define_unaccented_lowercase_index(User.first_name, User.last_name)
+define_unaccented_lowercase_index(User.last_name, User.first_name)
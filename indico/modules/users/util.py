@@ -7,19 +7,24 @@
 
 from __future__ import unicode_literals
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from itertools import chain
+from multiprocessing.pool import ThreadPool
 from operator import itemgetter
+from uuid import uuid4
 
-from flask import session
+from flask import current_app, session
+from flask_multipass import IdentityInfo
 from sqlalchemy.orm import contains_eager, joinedload, load_only, undefer
 from sqlalchemy.sql.expression import nullslast
 
 from indico.core import signals
 from indico.core.auth import multipass
 from indico.core.db import db
-from indico.core.db.sqlalchemy.custom.unaccent import unaccent_match
+from indico.core.db.sqlalchemy.custom.unaccent import unaccent_match, unaccented_lowercase
 from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.util.queries import escape_like
+from indico.legacy.common.cache import GenericCache
 from indico.modules.categories import Category
 from indico.modules.categories.models.principals import CategoryPrincipal
 from indico.modules.events import Event
@@ -32,6 +37,14 @@ from indico.util.event import truncate_path
 from indico.util.string import crc32, remove_accents
 
 
+#: How long the results of searching external identity providers are cached
+EXTERNAL_SEARCH_CACHE_TTL = 300
+#: How long the events linked to a user are cached
+LINKED_EVENTS_CACHE_TTL = 3600
+
+_external_search_cache = GenericCache('external-user-search')
+_linked_events_cache = GenericCache('linked-events')
+
 # colors for user-specific avatar bubbles
 user_colors = ['#e06055', '#ff8a65', '#e91e63', '#f06292', '#673ab7', '#ba68c8', '#7986cb', '#3f51b5', '#5e97f6',
                '#00a4e4', '#4dd0e1', '#0097a7', '#d4e157', '#aed581', '#57bb8a', '#4db6ac', '#607d8b', '#795548',
@@ -70,9 +83,16 @@ def get_related_categories(user, detailed=True):
     return OrderedDict(sorted(res.items(), key=itemgetter(0)))
 
 
-def get_suggested_categories(user):
-    """Gets the suggested categories of a user for the dashboard"""
-    related = set(get_related_categories(user, detailed=False))
+def get_suggested_categories(user, related=None):
+    """Gets the suggested categories of a user for the dashboard
+
+    :param user: A `User`
+    :param related: The categories related to the user, in case they
+                    have already been retrieved
+    """
+    if related is None:
+        related = get_related_categories(user, detailed=False)
+    related = set(related)
     res = []
     category_strategy = contains_eager('category')
     category_strategy.subqueryload('acl_entries')
@@ -97,6 +117,165 @@ def get_suggested_categories(user):
     return res
 
 
+def _query_linked_event_roles(user):
+    """Build a query returning ``(event_id, role)`` rows for all events linked to a user.
+
+    All the ways a user can be linked to an event are combined in a
+    single UNION so they can be retrieved in one query.
+    """
+    from indico.modules.events.abstracts.models.abstracts import Abstract, AbstractState
+    from indico.modules.events.abstracts.models.persons import AbstractPersonLink
+    from indico.modules.events.contributions.models.contributions import Contribution
+    from indico.modules.events.contributions.models.persons import (ContributionPersonLink,
+                                                                    SubContributionPersonLink)
+    from indico.modules.events.contributions.models.principals import ContributionPrincipal
+    from indico.modules.events.contributions.models.subcontributions import SubContribution
+    from indico.modules.events.models.events import EventType
+    from indico.modules.events.models.persons import EventPerson
+    from indico.modules.events.models.principals import EventPrincipal
+    from indico.modules.events.registration.models.forms import RegistrationForm
+    from indico.modules.events.registration.models.registrations import Registration
+    from indico.modules.events.sessions.models.principals import SessionPrincipal
+    from indico.modules.events.sessions.models.sessions import Session
+    from indico.modules.events.surveys.models.submissions import SurveySubmission
+    from indico.modules.events.surveys.models.surveys import Survey
+    from indico.modules.events.tracks.models.principals import TrackPrincipal
+    from indico.modules.events.tracks.models.tracks import Track
+
+    def _links(event_id_column, role, *criteria):
+        if isinstance(role, basestring):
+            role = db.literal(role, db.String)
+        return db.session.query(event_id_column.label('event_id'), role.label('role')).filter(*criteria)
+
+    def _acl_links(principal_cls, event_id_column, join, roles):
+        base = (db.session.query(principal_cls)
+                .join(join)
+                .filter(principal_cls.type == PrincipalType.user, principal_cls.user_id == user.id))
+        return [base.with_entities(event_id_column.label('event_id'), db.literal(role, db.String).label('role'))
+                .filter(criterion)
+                for role, criterion in roles]
+
+    bad_abstract_states = {AbstractState.withdrawn, AbstractState.rejected}
+    has_contrib = EventPerson.contribution_links.any(ContributionPersonLink.contribution.has(~Contribution.is_deleted))
+    has_subcontrib = EventPerson.subcontribution_links.any(
+        SubContributionPersonLink.subcontribution.has(db.and_(
+            ~SubContribution.is_deleted,
+            SubContribution.contribution.has(~Contribution.is_deleted))))
+    has_abstract = EventPerson.abstract_links.any(AbstractPersonLink.abstract.has(
+        db.and_(~Abstract.state.in_(bad_abstract_states), ~Abstract.is_deleted)))
+    paper_permissions = ('paper_manager', 'paper_judge', 'paper_content_reviewer', 'paper_layout_reviewer')
+    chair_role = db.case([(Event._type == EventType.lecture, db.literal('lecture_speaker', db.String))],
+                         else_=db.literal('conference_chair', db.String))
+
+    queries = [
+        _links(Registration.event_id, 'registration_registrant',
+               Registration.user_id == user.id,
+               Registration.is_active,
+               Registration.registration_form.has(~RegistrationForm.is_deleted)),
+        _links(Survey.event_id, 'survey_submitter',
+               Survey.id == SurveySubmission.survey_id,
+               SurveySubmission.user_id == user.id,
+               ~Survey.is_deleted),
+        _links(Event.id, 'conference_creator', Event.creator_id == user.id),
+        _links(EventPerson.event_id, chair_role,
+               Event.id == EventPerson.event_id,
+               EventPerson.user_id == user.id,
+               EventPerson.event_links.any()),
+        _links(EventPerson.event_id, 'contributor',
+               EventPerson.user_id == user.id,
+               has_contrib | has_subcontrib),
+        _links(EventPerson.event_id, 'abstract_person',
+               EventPerson.user_id == user.id,
+               has_abstract),
+        _links(Abstract.event_id, 'abstract_submitter',
+               Abstract.submitter_id == user.id,
+               ~Abstract.is_deleted,
+               ~Abstract.state.in_(bad_abstract_states)),
+    ]
+    queries += _acl_links(EventPrincipal, EventPrincipal.event_id, EventPrincipal.event, [
+        ('conference_manager', EventPrincipal.has_management_permission('ANY')),
+        ('abstract_reviewer', EventPrincipal.permissions.any('review_all_abstracts')),
+        ('track_convener', EventPrincipal.permissions.any('convene_all_abstracts')),
+    ] + [(permission, EventPrincipal.has_management_permission(permission, explicit=True))
+         for permission in paper_permissions])
+    queries += _acl_links(SessionPrincipal, Session.event_id, SessionPrincipal.session, [
+        ('session_coordinator', SessionPrincipal.permissions.any('coordinate') & ~Session.is_deleted),
+        ('session_submission', SessionPrincipal.permissions.any('submit') & ~Session.is_deleted),
+        ('session_manager', SessionPrincipal.full_access & ~Session.is_deleted),
+        ('session_access', SessionPrincipal.read_access & ~Session.is_deleted),
+    ])
+    queries += _acl_links(ContributionPrincipal, Contribution.event_id, ContributionPrincipal.contribution, [
+        ('contribution_submission', ContributionPrincipal.permissions.any('submit') & ~Contribution.is_deleted),
+        ('contribution_manager', ContributionPrincipal.full_access & ~Contribution.is_deleted),
+        ('contribution_access', ContributionPrincipal.read_access & ~Contribution.is_deleted),
+    ])
+    queries += _acl_links(TrackPrincipal, Track.event_id, TrackPrincipal.track, [
+        ('abstract_reviewer', TrackPrincipal.permissions.any('review')),
+        ('track_convener', TrackPrincipal.permissions.any('convene')),
+    ])
+    return db.union_all(*(query.statement for query in queries)).alias('links')
+
+
+def _get_linked_events_cache_version(key):
+    version = _linked_events_cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        _linked_events_cache.set(key, version, LINKED_EVENTS_CACHE_TTL)
+    return version
+
+
+def invalidate_linked_events_cache(user=None):
+    """Invalidate the cached linked events of a user.
+
+    :param user: A `User`, or ``None`` to invalidate the data of all users
+    """
+    _linked_events_cache.delete('version' if user is None else 'version-{}'.format(user.id))
+
+
+def get_linked_event_roles(user, dt, limit=None):
+    """Get the IDs of the linked events and the user's roles in them
+
+    The result is cached; changes that affect the linked events of a
+    user (e.g. new registrations or ACL changes) invalidate it.
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :param limit: Max number of events
+    :return: A list of ``(event_id, roles)`` tuples, sorted by the
+             start date of the events
+    """
+    cache_key = (user.id, dt, limit, _get_linked_events_cache_version('version'),
+                 _get_linked_events_cache_version('version-{}'.format(user.id)))
+    links = _linked_events_cache.get(cache_key)
+    if links is not None:
+        return links
+    roles_query = _query_linked_event_roles(user)
+    query = (db.session.query(Event.id, db.func.array_agg(db.distinct(roles_query.c.role)))
+             .join(roles_query, roles_query.c.event_id == Event.id)
+             .filter(~Event.is_deleted, Event.ends_after(dt))
+             .group_by(Event.id)
+             .order_by(Event.start_dt, Event.id)
+             .limit(limit))
+    links = [(event_id, set(roles)) for event_id, roles in query]
+    _linked_events_cache.set(cache_key, links, LINKED_EVENTS_CACHE_TTL)
+    return links
+
+
+def get_linked_events_with_roles(user, dt, roles):
+    """Get the linked events in which the user has certain roles
+
+    :param user: A `User`
+    :param dt: Only include events taking place on/after that date
+    :param roles: The roles to look for (see :func:`get_linked_event_roles`)
+    :return: A dict mapping event IDs to the set of matching roles
+    """
+    data = defaultdict(set)
+    for event_id, event_roles in get_linked_event_roles(user, dt):
+        if event_roles & roles:
+            data[event_id] = event_roles & roles
+    return data
+
+
 def get_linked_events(user, dt, limit=None, load_also=()):
     """Get the linked events and the user's roles in them
 
@@ -104,51 +283,17 @@ def get_linked_events(user, dt, limit=None, load_also=()):
     :param dt: Only include events taking place on/after that date
     :param limit: Max number of events
     """
-    from indico.modules.events.abstracts.util import (get_events_with_abstract_reviewer_convener,
-                                                      get_events_with_abstract_persons)
-    from indico.modules.events.contributions.util import get_events_with_linked_contributions
-    from indico.modules.events.papers.util import get_events_with_paper_roles
-    from indico.modules.events.registration.util import get_events_registered
-    from indico.modules.events.sessions.util import get_events_with_linked_sessions
-    from indico.modules.events.surveys.util import get_events_with_submitted_surveys
-    from indico.modules.events.util import (get_events_managed_by, get_events_created_by,
-                                            get_events_with_linked_event_persons)
-
-    links = OrderedDict()
-    for event_id in get_events_registered(user, dt):
-        links.setdefault(event_id, set()).add('registration_registrant')
-    for event_id in get_events_with_submitted_surveys(user, dt):
-        links.setdefault(event_id, set()).add('survey_submitter')
-    for event_id in get_events_managed_by(user, dt):
-        links.setdefault(event_id, set()).add('conference_manager')
-    for event_id in get_events_created_by(user, dt):
-        links.setdefault(event_id, set()).add('conference_creator')
-    for event_id, principal_roles in get_events_with_linked_sessions(user, dt).iteritems():
-        links.setdefault(event_id, set()).update(principal_roles)
-    for event_id, principal_roles in get_events_with_linked_contributions(user, dt).iteritems():
-        links.setdefault(event_id, set()).update(principal_roles)
-    for event_id, role in get_events_with_linked_event_persons(user, dt).iteritems():
-        links.setdefault(event_id, set()).add(role)
-    for event_id, roles in get_events_with_abstract_reviewer_convener(user, dt).iteritems():
-        links.setdefault(event_id, set()).update(roles)
-    for event_id, roles in get_events_with_abstract_persons(user, dt).iteritems():
-        links.setdefault(event_id, set()).update(roles)
-    for event_id, roles in get_events_with_paper_roles(user, dt).iteritems():
-        links.setdefault(event_id, set()).update(roles)
-
+    links = get_linked_event_roles(user, dt, limit)
     if not links:
         return OrderedDict()
-
     query = (Event.query
              .filter(~Event.is_deleted,
-                     Event.id.in_(links))
+                     Event.id.in_(event_id for event_id, roles in links))
              .options(joinedload('series'),
                       load_only('id', 'category_id', 'title', 'start_dt', 'end_dt',
-                                'series_id', 'series_pos', 'series_count', *load_also))
-             .order_by(Event.start_dt, Event.id))
-    if limit is not None:
-        query = query.limit(limit)
-    return OrderedDict((event, links[event.id]) for event in query)
+                                'series_id', 'series_pos', 'series_count', *load_also)))
+    events = {event.id: event for event in query}
+    return OrderedDict((events[event_id], roles) for event_id, roles in links if event_id in events)
 
 
 def serialize_user(user):
@@ -168,14 +313,21 @@ def serialize_user(user):
 
 
 def _build_name_search(name_list):
-    text = remove_accents('%{}%'.format('%'.join(escape_like(name) for name in name_list)))
-    return db.or_(db.func.indico.indico_unaccent(db.func.concat(User.first_name, ' ', User.last_name)).ilike(text),
-                  db.func.indico.indico_unaccent(db.func.concat(User.last_name, ' ', User.first_name)).ilike(text))
+    text = remove_accents('%{}%'.format('%'.join(escape_like(name) for name in name_list))).lower()
+    return db.or_(unaccented_lowercase(User.first_name, User.last_name).ilike(text),
+                  unaccented_lowercase(User.last_name, User.first_name).ilike(text))
+
+
+def _build_name_rank(name_list):
+    text = remove_accents(' '.join(name_list)).lower()
+    return db.func.greatest(db.func.similarity(unaccented_lowercase(User.first_name, User.last_name), text),
+                            db.func.similarity(unaccented_lowercase(User.last_name, User.first_name), text))
 
 
 def build_user_search_query(criteria, exact=False, include_deleted=False, include_pending=False,
                             favorites_first=False):
     unspecified = object()
+    ranks = []
     query = User.query.distinct(User.id).options(db.joinedload(User._all_emails))
 
     if not include_pending:
@@ -198,10 +350,14 @@ def build_user_search_query(criteria, exact=False, include_deleted=False, includ
             raise ValueError("'name' is not compatible with 'exact'")
         if 'first_name' in criteria or 'last_name' in criteria:
             raise ValueError("'name' is not compatible with (first|last)_name")
-        query = query.filter(_build_name_search(name.replace(',', '').split()))
+        name_list = name.replace(',', '').split()
+        query = query.filter(_build_name_search(name_list))
+        ranks.append(_build_name_rank(name_list))
 
     for k, v in criteria.iteritems():
         query = query.filter(unaccent_match(getattr(User, k), v, exact))
+        if not exact:
+            ranks.append(db.func.similarity(unaccented_lowercase(getattr(User, k)), remove_accents(v).lower()))
 
     # wrap as subquery so we can apply order regardless of distinct-by-id
     query = query.from_self()
@@ -210,12 +366,63 @@ def build_user_search_query(criteria, exact=False, include_deleted=False, includ
         query = (query.outerjoin(favorite_user_table, db.and_(favorite_user_table.c.user_id == session.user.id,
                                                               favorite_user_table.c.target_id == User.id))
                  .order_by(nullslast(favorite_user_table.c.user_id)))
+    if ranks:
+        # show the most similar matches first
+        query = query.order_by(sum(ranks[1:], ranks[0]).desc())
     query = query.order_by(db.func.lower(db.func.indico.indico_unaccent(User.first_name)),
                            db.func.lower(db.func.indico.indico_unaccent(User.last_name)),
                            User.id)
     return query
 
 
+def _search_provider_identities(app, provider_name, exact, criteria):
+    with app.app_context():
+        return list(multipass.search_identities(providers={provider_name}, exact=exact, **criteria))
+
+
+def _restore_identity(provider, identifier, multipass_data, data):
+    identity = IdentityInfo(provider, identifier, multipass_data)
+    # the cached data has already been converted using the provider's mapping
+    identity.data = data
+    return identity
+
+
+def search_identities(exact=False, **criteria):
+    """Search for identities in all identity providers.
+
+    The providers are searched concurrently and the results are cached
+    for a short time since the user search dialogs tend to send the
+    same search again, e.g. when toggling between the search options.
+
+    :param exact: Indicates if only exact matches should be returned.
+    :param criteria: The criteria to search for.
+    :return: A list of :class:`~flask_multipass.IdentityInfo` objects.
+    """
+    cache_key = (exact, sorted(criteria.iteritems()))
+    cached = _external_search_cache.get(cache_key)
+    if cached is not None:
+        providers = multipass.identity_providers
+        return [_restore_identity(providers[provider_name], identifier, multipass_data, data)
+                for provider_name, identifier, multipass_data, data in cached
+                if provider_name in providers]
+    provider_names = [p.name for p in multipass.identity_providers.itervalues() if p.supports_search]
+    if len(provider_names) > 1:
+        app = current_app._get_current_object()
+        pool = ThreadPool(len(provider_names))
+        try:
+            results = pool.map(lambda name: _search_provider_identities(app, name, exact, dict(criteria)),
+                               provider_names)
+        finally:
+            pool.close()
+        identities = list(chain.from_iterable(results))
+    else:
+        identities = list(multipass.search_identities(exact=exact, **criteria))
+    _external_search_cache.set(cache_key, [(identity.provider.name, identity.identifier, identity.multipass_data,
+                                            identity.data) for identity in identities],
+                               EXTERNAL_SEARCH_CACHE_TTL)
+    return identities
+
+
 def search_users(exact=False, include_deleted=False, include_pending=False, external=False, allow_system_user=False,
                  **criteria):
     """Searches for users.
@@ -266,7 +473,7 @@ def search_users(exact=False, include_deleted=False, include_pending=False, exte
 
     # external user providers
     if external:
-        identities = multipass.search_identities(exact=exact, **criteria)
+        identities = search_identities(exact=exact, **criteria)
 
         for ident in identities:
             if not ident.data.get('email'):
@@ -0,0 +1,151 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+
+import pytest
+from flask_multipass import IdentityInfo
+
+from indico.core import signals
+from indico.modules.events.models.events import EventType
+from indico.modules.events.models.persons import EventPerson, EventPersonLink
+from indico.modules.events.papers.util import get_events_with_paper_roles
+from indico.modules.events.registration.util import get_events_registered
+from indico.modules.events.sessions.models.sessions import Session
+from indico.modules.events.util import get_events_managed_by, get_events_with_linked_event_persons
+from indico.modules.users.util import (build_user_search_query, get_linked_event_roles, get_linked_events,
+                                       search_identities, search_users)
+from indico.testing.util import DictCache
+from indico.util.date_time import now_utc
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+@pytest.fixture
+def search_users_data(create_user):
+    return {
+        'jdoe': create_user(1, first_name='John', last_name='Doe', email='jdoe@example.com'),
+        'jadoe': create_user(2, first_name='Jane', last_name='Doe', email='jane@example.com'),
+        'jose': create_user(3, first_name='Jos\xe9', last_name='Doeberg', email='jose@example.com'),
+        'other': create_user(4, first_name='Guinea', last_name='Pig', email='pig@example.com'),
+    }
+
+
+@pytest.mark.parametrize(('name', 'expected'), (
+    ('doe', {'jdoe', 'jadoe', 'jose'}),
+    ('john doe', {'jdoe'}),
+    ('doe john', {'jdoe'}),
+    ('Doe, John', {'jdoe'}),
+    ('JOSE', {'jose'}),
+    ('jo doe', {'jdoe', 'jose'}),
+    ('xyz', set()),
+))
+def test_search_users_name(search_users_data, name, expected):
+    assert search_users(name=name) == {search_users_data[x] for x in expected}
+
+
+def test_build_user_search_query_ranked(search_users_data):
+    query = build_user_search_query({'name': 'jose doe'})
+    assert query.all() == [search_users_data['jose']]
+    query = build_user_search_query({'last_name': 'doe'})
+    assert query.all()[:2] == [search_users_data['jadoe'], search_users_data['jdoe']]
+    assert query.all()[2] == search_users_data['jose']
+
+
+def test_search_identities_cached(mocker):
+    provider = mocker.Mock(supports_search=True, supports_refresh=False,
+                           settings={'mapping': {'email': 'mail'}, 'identity_info_keys': None})
+    provider.name = 'test'
+    identity = IdentityInfo(provider, '123', mail='foo@example.com')
+    multipass = mocker.patch('indico.modules.users.util.multipass')
+    multipass.identity_providers = {'test': provider}
+    multipass.search_identities.return_value = iter([identity])
+    cache = mocker.patch('indico.modules.users.util._external_search_cache')
+    cache.get.return_value = None
+    assert search_identities(email='foo') == [identity]
+    key, cached, ttl = cache.set.call_args[0]
+    assert key == (False, [('email', 'foo')])
+    assert cached == [('test', '123', None, identity.data)]
+    cache.get.return_value = cached
+    result, = search_identities(email='foo')
+    assert multipass.search_identities.call_count == 1
+    assert result.provider == provider
+    assert result.identifier == '123'
+    assert result.data['email'] == 'foo@example.com'
+
+
+def test_get_linked_events(db, dummy_user, dummy_reg, create_user, create_event):
+    other_user = create_user(123)
+    event = dummy_reg.event
+    lecture = create_event(1, type_=EventType.lecture, start_dt=event.start_dt + timedelta(days=1),
+                           end_dt=event.end_dt + timedelta(days=1))
+    past_event = create_event(2, start_dt=now_utc() - timedelta(days=30), end_dt=now_utc() - timedelta(days=29))
+    create_event(3, is_deleted=True)
+    lecture.person_links.append(EventPersonLink(person=EventPerson.create_from_user(dummy_user, lecture)))
+    lecture.update_principal(other_user, full_access=True)
+    event.update_principal(dummy_user, permissions={'paper_manager', 'review_all_abstracts'})
+    session = Session(event=event, title='Session')
+    session.update_principal(dummy_user, permissions={'coordinate'})
+    db.session.flush()
+    dt = now_utc() - timedelta(days=7)
+    assert get_linked_event_roles(dummy_user, dt) == [
+        (event.id, {'conference_creator', 'registration_registrant', 'conference_manager', 'paper_manager',
+                    'abstract_reviewer', 'session_coordinator'}),
+        (lecture.id, {'conference_creator', 'lecture_speaker'}),
+    ]
+    assert get_linked_event_roles(dummy_user, dt, limit=1) == [get_linked_event_roles(dummy_user, dt)[0]]
+    assert get_linked_event_roles(dummy_user, None)[0] == (past_event.id, {'conference_creator'})
+    assert get_linked_events(other_user, dt) == {lecture: {'conference_manager'}}
+
+
+def test_get_events_helpers(db, dummy_user, dummy_reg, create_event):
+    event = dummy_reg.event
+    lecture = create_event(1, type_=EventType.lecture)
+    lecture.person_links.append(EventPersonLink(person=EventPerson.create_from_user(dummy_user, lecture)))
+    event.update_principal(dummy_user, permissions={'paper_manager'})
+    db.session.flush()
+    assert get_events_registered(dummy_user) == {event.id}
+    assert get_events_managed_by(dummy_user) == {event.id}
+    assert get_events_with_paper_roles(dummy_user) == {event.id: {'paper_manager'}}
+    assert get_events_with_linked_event_persons(dummy_user) == {lecture.id: 'lecture_speaker'}
+
+
+def test_get_linked_events_cached(mocker, dummy_user, dummy_event):
+    cache = {}
+    cache_mock = mocker.patch('indico.modules.users.util._linked_events_cache')
+    cache_mock.get.side_effect = cache.get
+    cache_mock.set.side_effect = lambda key, val, ttl: cache.__setitem__(key, val)
+    cache_mock.delete.side_effect = lambda key: cache.pop(key, None)
+    assert get_linked_event_roles(dummy_user, None) == [(dummy_event.id, {'conference_creator'})]
+    cache[next(key for key in cache if isinstance(key, tuple))] = []
+    assert get_linked_event_roles(dummy_user, None) == []
+    dummy_event.update_principal(dummy_user, full_access=True)
+    assert get_linked_event_roles(dummy_user, None) == [(dummy_event.id, {'conference_creator',
+                                                                          'conference_manager'})]
+
+
+def test_get_linked_events_removed_links(mocker, db, dummy_user, create_event):
+    mocker.patch('indico.modules.users.util._linked_events_cache', DictCache())
+    lecture = create_event(1, type_=EventType.lecture)
+    lecture.person_links.append(EventPersonLink(person=EventPerson.create_from_user(dummy_user, lecture)))
+    session = Session(event=lecture, title='Session')
+    session.update_principal(dummy_user, permissions={'coordinate'})
+    db.session.flush()
+    assert get_linked_event_roles(dummy_user, None) == [(lecture.id, {'conference_creator', 'lecture_speaker',
+                                                                      'session_coordinator'})]
+    old_person_links = lecture.person_links[:]
+    lecture.person_links = []
+    db.session.flush()
+    signals.event.updated.send(lecture, changes={'person_links': (old_person_links, lecture.person_links)})
+    assert get_linked_event_roles(dummy_user, None) == [(lecture.id, {'conference_creator', 'session_coordinator'})]
+    session.is_deleted = True
+    db.session.flush()
+    signals.event.session_deleted.send(session)
+    assert get_linked_event_roles(dummy_user, None) == [(lecture.id, {'conference_creator'})]
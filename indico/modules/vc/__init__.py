@@ -75,8 +75,14 @@ def _session_deleted(sess, **kwargs):
 
 @signals.event.deleted.connect
 def _event_deleted(event, **kwargs):
+    _events_deleted([event])
+
+
+@signals.event.deleted_many.connect
+def _events_deleted(events, **kwargs):
     user = session.user if has_request_context() and session.user else User.get_system_user()
-    for event_vc_room in VCRoomEventAssociation.find_for_event(event, include_hidden=True, include_deleted=True):
+    query = VCRoomEventAssociation.query.filter(VCRoomEventAssociation.event_id.in_({e.id for e in events}))
+    for event_vc_room in query:
         event_vc_room.delete(user)
 
 
@@ -176,3 +176,13 @@ def extract_logs(caplog, required=True, count=None, one=False, regex=False, **kw
     if one:
         return found[0] if found else None
     return found
+
+
+class DictCache(dict):
+    """A dict-based stand-in for a `GenericCache` in tests."""
+
+    def set(self, key, val, time=0):
+        self[key] = val
+
+    def delete(self, key):
+        self.pop(key, None)
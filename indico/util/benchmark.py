@@ -5,11 +5,19 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from __future__ import print_function
+from __future__ import absolute_import, division, print_function
 
+import json
+import resource
 import time
+from collections import namedtuple
+from contextlib import contextmanager
 from math import isinf
 
+from sqlalchemy.engine import Engine
+from sqlalchemy.event import listen, remove
+from terminaltables import AsciiTable
+
 from indico.util.console import cformat
 
 
@@ -69,3 +77,148 @@ class Benchmark(object):
             print(cformat('%{yellow!}{}').format(self))
         else:
             print(cformat('%{green!}{}').format(self))
+
+
+@contextmanager
+def count_queries():
+    """Count the SQL queries executed within the context.
+
+    Usage::
+
+        with count_queries() as count:
+            do_stuff()
+        print(count())
+    """
+    counter = [0]
+
+    def _after_cursor_execute(*args, **kwargs):
+        counter[0] += 1
+
+    listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    try:
+        yield lambda: counter[0]
+    finally:
+        remove(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _get_max_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class BenchmarkResult(namedtuple('BenchmarkResult', ('name', 'timings', 'queries', 'memory'))):
+    """The result of running a benchmark multiple times.
+
+    - ``timings`` -- the duration of each run in seconds
+    - ``queries`` -- the number of SQL queries of each run
+    - ``memory`` -- the growth of the peak memory usage in KiB
+    """
+
+    @property
+    def best(self):
+        return min(self.timings)
+
+    @property
+    def median(self):
+        timings = sorted(self.timings)
+        middle = len(timings) // 2
+        if len(timings) % 2:
+            return timings[middle]
+        return (timings[middle - 1] + timings[middle]) / 2
+
+    @property
+    def max_queries(self):
+        return max(self.queries)
+
+    def to_dict(self):
+        return {'median': self.median, 'best': self.best, 'queries': self.max_queries, 'memory': self.memory}
+
+
+def run_benchmark(name, func, repeat=5, warmup=1, setup=None):
+    """Run a function several times and measure it.
+
+    :param name: The name of the benchmark
+    :param func: The callable to benchmark
+    :param repeat: How many times to run (and measure) `func`
+    :param warmup: How many times to run `func` before measuring it,
+                   e.g. to fill caches which are not supposed to be
+                   benchmarked
+    :param setup: A callable which is invoked before each run of
+                  `func` and not included in the measurements
+    :return: A :class:`BenchmarkResult`
+    """
+    for __ in xrange(warmup):
+        if setup is not None:
+            setup()
+        func()
+    timings = []
+    queries = []
+    rss_before = _get_max_rss()
+    for __ in xrange(repeat):
+        if setup is not None:
+            setup()
+        with count_queries() as query_count, Benchmark() as b:
+            func()
+        timings.append(float(b))
+        queries.append(query_count())
+    return BenchmarkResult(name, timings, queries, _get_max_rss() - rss_before)
+
+
+def save_baseline(results, path):
+    """Store benchmark results as a baseline in a JSON file."""
+    with open(path, 'w') as f:
+        json.dump({r.name: r.to_dict() for r in results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Load a baseline created using :func:`save_baseline`."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_with_baseline(result, baseline, tolerance=0.2):
+    """Compare a benchmark result with the baseline.
+
+    :param result: A :class:`BenchmarkResult`
+    :param baseline: A baseline dict as returned by :func:`load_baseline`
+    :param tolerance: How much slower (relative) the median may be
+                      without the benchmark being considered a regression
+    :return: ``None`` if there is no baseline for the benchmark, otherwise
+             a ``(ratio, regression)`` tuple containing the ratio between
+             the new and the baseline median and whether the result is
+             a regression.  More queries than in the baseline are always
+             considered a regression.
+    """
+    reference = baseline.get(result.name)
+    if reference is None:
+        return None
+    ratio = (result.median / reference['median']) if reference['median'] else 1
+    regression = ratio > (1 + tolerance) or result.max_queries > reference['queries']
+    return ratio, regression
+
+
+def print_results(results, baseline=None, tolerance=0.2):
+    """Print a table containing benchmark results.
+
+    :return: ``True`` if any of the results is a regression compared to
+             the baseline.
+    """
+    headers = ['Benchmark', 'Median', 'Best', 'Queries', 'Memory (KiB)']
+    if baseline is not None:
+        headers.append('Baseline')
+    table_data = [[cformat('%{white!}{}%{reset}').format(h) for h in headers]]
+    any_regression = False
+    for result in results:
+        row = [result.name, '{:.05f}'.format(result.median), '{:.05f}'.format(result.best),
+               str(result.max_queries), str(result.memory)]
+        if baseline is not None:
+            comparison = compare_with_baseline(result, baseline, tolerance)
+            if comparison is None:
+                row.append(cformat('%{blue!}n/a%{reset}'))
+            else:
+                ratio, regression = comparison
+                any_regression = any_regression or regression
+                color = '%{red!}' if regression else '%{green!}'
+                row.append(cformat(color + '{:.02f}x%{reset}').format(ratio))
+        table_data.append(row)
+    print(AsciiTable(table_data).table)
+    return any_regression
@@ -0,0 +1,53 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from indico.core.db import db
+from indico.util.benchmark import (BenchmarkResult, compare_with_baseline, load_baseline, run_benchmark,
+                                   save_baseline)
+
+
+@pytest.mark.usefixtures('db')
+def test_run_benchmark():
+    calls = []
+    result = run_benchmark('test', lambda: calls.append(db.session.execute('SELECT 1')), repeat=3, warmup=2)
+    assert len(calls) == 5
+    assert result.name == 'test'
+    assert len(result.timings) == 3
+    assert result.queries == [1, 1, 1]
+
+
+@pytest.mark.parametrize(('timings', 'median'), (
+    ([1], 1),
+    ([3, 1, 2], 2),
+    ([4, 1, 3, 2], 2.5),
+))
+def test_benchmark_result_median(timings, median):
+    assert BenchmarkResult('test', timings, [0], 0).median == median
+
+
+@pytest.mark.parametrize(('median', 'queries', 'expected'), (
+    (1.0, 10, (1.0, False)),
+    (1.1, 10, (1.1, False)),
+    (1.5, 10, (1.5, True)),
+    (0.5, 10, (0.5, False)),
+    (1.0, 11, (1.0, True)),
+))
+def test_compare_with_baseline(median, queries, expected):
+    baseline = {'test': {'median': 1.0, 'best': 1.0, 'queries': 10, 'memory': 0}}
+    result = BenchmarkResult('test', [median], [queries], 0)
+    assert compare_with_baseline(result, baseline) == pytest.approx(expected)
+    assert compare_with_baseline(result._replace(name='other'), baseline) is None
+
+
+def test_baseline_roundtrip(tmpdir):
+    path = tmpdir.join('baseline.json').strpath
+    save_baseline([BenchmarkResult('test', [2, 1, 3], [5, 6, 5], 123)], path)
+    assert load_baseline(path) == {'test': {'median': 2, 'best': 1, 'queries': 6, 'memory': 123}}
@@ -5,8 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from collections import OrderedDict
 from functools import wraps
 from inspect import getcallargs
+from threading import Lock
 
 from flask import current_app, g, has_request_context
 
@@ -26,6 +28,44 @@ def make_hashable(obj):
     return obj
 
 
+class LRUCache(object):
+    """A thread-safe in-memory cache with a limited size.
+
+    When the cache is full, the least recently used entry is removed
+    to make room for a new one.
+
+    :param maxsize: The maximum number of entries in the cache.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
 # http://wiki.python.org/moin/PythonDecoratorLibrary#Alternate_memoize_as_nested_functions
 # Not thread-safe. Don't use it in places where thread-safety is important!
 def memoize(obj):
@@ -6,7 +6,7 @@
 # LICENSE file for more details.
 import pytest
 
-from indico.util.caching import memoize_request
+from indico.util.caching import LRUCache, memoize_request
 
 
 @pytest.fixture
@@ -73,3 +73,19 @@ def test_memoize_request_legacy_class():
         fn(New)
         fn(new_instance)
     assert calls == [Old, old_instance, New, new_instance]
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    # 'b' is the least recently used entry
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('b', 'default') == 'default'
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    cache.clear()
+    assert len(cache) == 0
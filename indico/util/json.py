@@ -8,8 +8,10 @@
 from __future__ import absolute_import
 
 from datetime import date, datetime
+from operator import attrgetter
 from UserDict import UserDict
 
+from enum import Enum
 from speaklater import _LazyString
 
 
@@ -19,10 +21,47 @@ except ImportError:
     import json as _json
 
 
+#: The string representations of the timezones used in datetimes
+_tz_names = {}
+
+
+def _encode_datetime(dt):
+    tzinfo = dt.tzinfo
+    try:
+        tz_name = _tz_names[tzinfo]
+    except KeyError:
+        tz_name = _tz_names[tzinfo] = str(tzinfo)
+    return {'date': dt.date().isoformat(), 'time': dt.time().isoformat(), 'tz': tz_name}
+
+
+#: Functions converting objects which cannot be serialized natively.
+#: The first entry matching the class of an object is used.
+_TYPE_ENCODERS = [
+    (_LazyString, attrgetter('value')),
+    (UserDict, dict),
+    (datetime, _encode_datetime),
+    (date, date.isoformat),
+    (Enum, attrgetter('name')),
+]
+#: Maps classes to their entry in `_TYPE_ENCODERS` so the lookup only
+#: happens once for each class.  Subclasses are added on first use.
+_type_encoders = {datetime: _encode_datetime, date: date.isoformat}
+#: How many levels of nested lists/dicts are encoded separately by `dump`
+_DUMP_SPLIT_DEPTH = 2
+
+
+def _get_type_encoder(cls):
+    func = next((func for base, func in _TYPE_ENCODERS if issubclass(cls, base)), None)
+    _type_encoders[cls] = func
+    return func
+
+
 class IndicoJSONEncoder(_json.JSONEncoder):
     """
     Custom JSON encoder that supports more types
-     * datetime objects
+     * datetime and date objects
+     * lazy strings
+     * enums (using their name)
     """
     def __init__(self, *args, **kwargs):
         if kwargs.get('separators') is None:
@@ -30,25 +69,34 @@ class IndicoJSONEncoder(_json.JSONEncoder):
         super(IndicoJSONEncoder, self).__init__(*args, **kwargs)
 
     def default(self, o):
-        if isinstance(o, _LazyString):
-            return o.value
-        elif isinstance(o, UserDict):
-            return dict(o)
-        elif isinstance(o, datetime):
-            return {'date': str(o.date()), 'time': str(o.time()), 'tz': str(o.tzinfo)}
-        elif isinstance(o, date):
-            return str(o)
-        return _json.JSONEncoder.default(self, o)
+        # `__class__` instead of `type()` since UserDict is an old-style class
+        try:
+            func = _type_encoders[o.__class__]
+        except KeyError:
+            func = _get_type_encoder(o.__class__)
+        if func is None:
+            return _json.JSONEncoder.default(self, o)
+        return func(o)
+
+
+_default_encoder = IndicoJSONEncoder()
+
+
+def _get_encoder(kwargs):
+    if kwargs.pop('pretty', False):
+        kwargs['indent'] = 4 * ' '
+    return IndicoJSONEncoder(**kwargs) if kwargs else _default_encoder
 
 
 def dumps(obj, **kwargs):
     """
     Simple wrapper around json.dumps()
     """
-    if kwargs.pop('pretty', False):
-        kwargs['indent'] = 4 * ' '
     textarea = kwargs.pop('textarea', False)
-    ret = _json.dumps(obj, cls=IndicoJSONEncoder, **kwargs).replace('/', '\\/')
+    # the C encoder of simplejson cannot escape additional characters,
+    # but a single replace on its output is still much faster than
+    # using the pure-python encoder
+    ret = _get_encoder(kwargs).encode(obj).replace('/', '\\/')
 
     if textarea:
         return '<html><head></head><body><textarea>%s</textarea></body></html>' % ret
@@ -56,6 +104,47 @@ def dumps(obj, **kwargs):
         return ret
 
 
+def _iterencode(encoder, obj, depth):
+    # exact type checks since e.g. namedtuples are not encoded as lists
+    if depth and type(obj) in (list, tuple):
+        yield '['
+        for i, item in enumerate(obj):
+            if i:
+                yield encoder.item_separator
+            for chunk in _iterencode(encoder, item, depth - 1):
+                yield chunk
+        yield ']'
+    elif depth and type(obj) is dict and all(isinstance(key, basestring) for key in obj):
+        yield '{'
+        for i, key in enumerate(sorted(obj) if encoder.sort_keys else obj):
+            if i:
+                yield encoder.item_separator
+            yield encoder.encode(key) + encoder.key_separator
+            for chunk in _iterencode(encoder, obj[key], depth - 1):
+                yield chunk
+        yield '}'
+    else:
+        yield encoder.encode(obj)
+
+
+def dump(obj, fp, **kwargs):
+    """Serialize an object as JSON to a file-like object.
+
+    Unlike :func:`dumps`, the whole output never needs to be in memory
+    at once: the elements of the outer lists and dicts are encoded and
+    written one by one.  The output is the same as the one of
+    :func:`dumps`.
+    """
+    encoder = _get_encoder(kwargs)
+    if encoder.indent is not None:
+        # the C encoder does not support indentation anyway
+        chunks = encoder.iterencode(obj)
+    else:
+        chunks = _iterencode(encoder, obj, _DUMP_SPLIT_DEPTH)
+    for chunk in chunks:
+        fp.write(chunk.replace('/', '\\/'))
+
+
 def loads(string):
     """
     Simple wrapper around json.decode()
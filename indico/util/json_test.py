@@ -0,0 +1,57 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from collections import namedtuple
+from datetime import date, datetime
+from io import BytesIO
+from UserDict import UserDict
+
+import pytest
+from markupsafe import Markup
+from pytz import timezone
+from speaklater import make_lazy_string
+
+from indico.util.json import dump, dumps
+from indico.util.struct.enum import IndicoEnum
+
+
+class _Color(IndicoEnum):
+    red = 1
+
+
+_Point = namedtuple('_Point', ('x', 'y'))
+
+
+def test_dumps():
+    dt = timezone('Europe/Zurich').localize(datetime(2020, 3, 14, 15, 9, 26))
+    data = {'dt': dt, 'date': date(2020, 3, 14), 'lazy': make_lazy_string(lambda: 'lazy'), 'color': _Color.red,
+            'markup': Markup('<b>x</b>'), 'dict': UserDict({'a': 1}), 'url': 'http://example.com/'}
+    assert dumps(data, sort_keys=True) == (
+        '{"color":"red","date":"2020-03-14","dict":{"a":1},"dt":{"date":"2020-03-14","time":"15:09:26",'
+        '"tz":"Europe\\/Zurich"},"lazy":"lazy","markup":"<b>x<\\/b>","url":"http:\\/\\/example.com\\/"}'
+    )
+
+
+def test_dumps_unsupported():
+    with pytest.raises(TypeError):
+        dumps(object())
+
+
+@pytest.mark.parametrize('data', (
+    {'results': [{'a': 'x/y', 'b': [1, 2, {'c': datetime(2020, 1, 1)}]}], 'count': 1, 'none': None},
+    [[1, [2, [3, [4]]]], {'a': {'b': {'c': {}}}}],
+    {1: 'non-string key', 'point': _Point(1, 2), 'tuple': (1, 2)},
+    'a/b',
+    [],
+))
+@pytest.mark.parametrize('kwargs', ({}, {'sort_keys': True}, {'pretty': True}))
+def test_dump(data, kwargs):
+    buf = BytesIO()
+    dump(data, buf, **kwargs)
+    assert buf.getvalue() == dumps(data, **kwargs)
@@ -177,10 +177,88 @@ class ParametrizedPlaceholder(Placeholder):
         raise NotImplementedError
 
 
+class PlaceholderTemplate(object):
+    """A text containing placeholders which has been parsed already.
+
+    The text is split into literal strings and placeholders once, using
+    a single regex matching all the placeholders, so rendering it is
+    cheap.  This makes it suitable for texts which are rendered many
+    times with different arguments, e.g. when sending personalized
+    emails to many people.
+
+    Use :func:`compile_placeholders` to create a template.
+
+    :param placeholders: the placeholders available in the text
+    :param text: the text containing the placeholders
+    :param kwargs: arguments specific to the placeholders' context
+    """
+
+    def __init__(self, placeholders, text, **kwargs):
+        self.text = text
+        self._segments = []
+        # maps the index of each placeholder's group in the combined
+        # regex to the placeholder and the index of its param group
+        groups = {}
+        patterns = []
+        index = 1
+        for placeholder in placeholders:
+            regex = placeholder.get_regex(**kwargs)
+            param_index = (index + 1) if issubclass(placeholder, ParametrizedPlaceholder) else None
+            groups[index] = placeholder, param_index
+            patterns.append('({})'.format(regex.pattern))
+            index += regex.groups + 1
+        pos = 0
+        if patterns:
+            for match in re.finditer('|'.join(patterns), text):
+                placeholder, param_index = groups[match.lastindex]
+                args = (match.group(param_index),) if param_index is not None else ()
+                if match.start() > pos:
+                    self._segments.append(text[pos:match.start()])
+                self._segments.append((placeholder, args))
+                pos = match.end()
+        if pos < len(text):
+            self._segments.append(text[pos:])
+
+    def render(self, escape_html=True, **kwargs):
+        """Replace the placeholders in the text.
+
+        :param escape_html: whether HTML escaping should be done
+        :param kwargs: arguments specific to the placeholders' context
+        """
+        rendered = {}
+        parts = []
+        for segment in self._segments:
+            if isinstance(segment, basestring):
+                parts.append(segment)
+                continue
+            if segment not in rendered:
+                placeholder, args = segment
+                value = placeholder.render(*args, **kwargs)
+                rendered[segment] = escape(value) if escape_html else value
+            parts.append(rendered[segment])
+        return ''.join(parts)
+
+
 def get_placeholders(context, **kwargs):
     return named_objects_from_signal(signals.get_placeholders.send(context, **kwargs))
 
 
+def compile_placeholders(context, text, **kwargs):
+    """Parses a string containing placeholders.
+
+    Use this instead of :func:`replace_placeholders` when rendering
+    the same text for many objects.  The arguments passed here are
+    only used to determine the available placeholders, so arguments
+    which are specific to a single object may be ``None``.
+
+    :param context: the context where the placeholders are used
+    :param text: the text containing the placeholders
+    :param kwargs: arguments specific to the context
+    :return: a :class:`PlaceholderTemplate`
+    """
+    return PlaceholderTemplate(get_placeholders(context, **kwargs).viewvalues(), text, **kwargs)
+
+
 def replace_placeholders(context, text, escape_html=True, **kwargs):
     """Replaces placeholders in a string.
 
@@ -189,9 +267,7 @@ def replace_placeholders(context, text, escape_html=True, **kwargs):
     :param escape_html: whether HTML escaping should be done
     :param kwargs: arguments specific to the context
     """
-    for placeholder in get_placeholders(context, **kwargs).viewvalues():
-        text = placeholder.replace(text, escape_html=escape_html, **kwargs)
-    return text
+    return compile_placeholders(context, text, **kwargs).render(escape_html=escape_html, **kwargs)
 
 
 def get_empty_placeholders(context, text, **kwargs):
@@ -0,0 +1,89 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import pytest
+from markupsafe import Markup
+
+from indico.core import signals
+from indico.util.placeholders import (ParametrizedPlaceholder, Placeholder, PlaceholderTemplate, compile_placeholders,
+                                      replace_placeholders)
+
+
+class NamePlaceholder(Placeholder):
+    name = 'name'
+
+    @classmethod
+    def render(cls, person):
+        return person['name']
+
+
+class LinkPlaceholder(Placeholder):
+    name = 'link'
+
+    @classmethod
+    def render(cls, person):
+        return Markup('<a href="#">{}</a>').format(person['name'])
+
+
+class InfoPlaceholder(ParametrizedPlaceholder):
+    name = 'info'
+    param_restricted = True
+
+    @classmethod
+    def render(cls, param, person):
+        return person.get(param, '?')
+
+    @classmethod
+    def iter_param_info(cls, person):
+        yield 'age', 'Age'
+        yield 'city', 'City'
+
+
+@pytest.fixture
+def placeholder_context():
+    def _get_placeholders(sender, **kwargs):
+        yield NamePlaceholder
+        yield LinkPlaceholder
+        yield InfoPlaceholder
+
+    with signals.get_placeholders.connected_to(_get_placeholders, sender='test-context'):
+        yield 'test-context'
+
+
+@pytest.mark.parametrize(('text', 'expected'), (
+    ('', ''),
+    ('Hello', 'Hello'),
+    ('{name}', 'Guinea Pig'),
+    ('Hi {name}, {name}!', 'Hi Guinea Pig, Guinea Pig!'),
+    ('{link}', '<a href="#">Guinea Pig</a>'),
+    ('{info:age} {info:city} {info:size} {info}', '42 Geneva {info:size} ?'),
+    ('{unknown} {name', '{unknown} {name'),
+))
+def test_placeholder_template(text, expected):
+    tpl = PlaceholderTemplate([NamePlaceholder, LinkPlaceholder, InfoPlaceholder], text, person=None)
+    assert tpl.render(person={'name': 'Guinea Pig', 'age': '42', 'city': 'Geneva'}) == expected
+
+
+def test_placeholder_template_single_pass():
+    # placeholders contained in a rendered value must not be replaced
+    tpl = PlaceholderTemplate([NamePlaceholder, LinkPlaceholder], '{name} {link}', person=None)
+    assert tpl.render(person={'name': '{link}'}) == '{link} <a href="#">{link}</a>'
+
+
+def test_compile_placeholders(placeholder_context):
+    tpl = compile_placeholders(placeholder_context, 'Dear {name} from {info:city}', person=None)
+    assert tpl.render(person={'name': 'Guinea Pig', 'city': 'Geneva'}) == 'Dear Guinea Pig from Geneva'
+    assert tpl.render(person={'name': 'Pig', 'city': 'Bern'}) == 'Dear Pig from Bern'
+
+
+def test_replace_placeholders(placeholder_context):
+    person = {'name': '<Guinea> Pig'}
+    assert replace_placeholders(placeholder_context, '{name}: {link}', person=person) == \
+        '&lt;Guinea&gt; Pig: <a href="#">&lt;Guinea&gt; Pig</a>'
+    assert replace_placeholders(placeholder_context, '{name}', escape_html=False, person=person) == '<Guinea> Pig'
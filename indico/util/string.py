@@ -13,6 +13,7 @@ from __future__ import absolute_import
 
 import binascii
 import functools
+import hashlib
 import os
 import re
 import string
@@ -33,6 +34,8 @@ from markupsafe import Markup, escape
 from speaklater import _LazyString, is_lazy_string
 from sqlalchemy import ForeignKeyConstraint, inspect
 
+from indico.util.caching import LRUCache
+
 
 # basic list of tags, used for markdown content
 BLEACH_ALLOWED_TAGS = bleach.ALLOWED_TAGS + [
@@ -73,6 +76,17 @@ BLEACH_ALLOWED_STYLES_HTML = [
 
 LATEX_MATH_PLACEHOLDER = u"\uE000"
 
+#: The number of rendered texts which are kept in memory by each process
+RENDER_CACHE_SIZE = 1000
+#: The minimum length of a text to keep its rendered version in the
+#: shared cache; for shorter texts rendering is not much slower than
+#: retrieving them from the cache
+RENDER_CACHE_SHARED_MIN_LENGTH = 500
+RENDER_CACHE_SHARED_TTL = 86400
+
+_render_cache = LRUCache(RENDER_CACHE_SIZE)
+_render_cache_shared = None
+
 
 def encode_if_unicode(s):
     if isinstance(s, _LazyString) and isinstance(s.value, unicode):
@@ -205,6 +219,44 @@ def strip_tags(text):
     return text.encode('utf-8') if encode else text
 
 
+def _get_render_cache_shared():
+    global _render_cache_shared
+    if _render_cache_shared is None:
+        from indico.legacy.common.cache import GenericCache
+        _render_cache_shared = GenericCache('rendered-text')
+    return _render_cache_shared
+
+
+def _render_cached(func, text, *args, **kwargs):
+    """Render a text, using cached results for a text with the same content.
+
+    Since the cache key is a hash of the text and the arguments passed
+    to the rendering function, a text which changes is simply rendered
+    again and no explicit invalidation is needed.  The rendered text is
+    kept in memory and, for longer texts, in the shared cache as well.
+
+    :param func: The function rendering the text; it must always return
+                 the same result for the same arguments.
+    :param text: The text to render.
+    :param args, kwargs: Additional arguments passed to `func`.
+    """
+    text = to_unicode(text)
+    options = repr((func.__name__, args, sorted(kwargs.iteritems())))
+    key = hashlib.sha1(options + b'\0' + text.encode('utf-8')).hexdigest()
+    rv = _render_cache.get(key)
+    if rv is not None:
+        return rv
+    shared = len(text) >= RENDER_CACHE_SHARED_MIN_LENGTH
+    if shared:
+        rv = _get_render_cache_shared().get(key)
+    if rv is None:
+        rv = func(text, *args, **kwargs)
+        if shared:
+            _get_render_cache_shared().set(key, rv, RENDER_CACHE_SHARED_TTL)
+    _render_cache.set(key, rv)
+    return rv
+
+
 def render_markdown(text, escape_latex_math=True, md=None, **kwargs):
     """ Mako markdown to HTML filter
         :param text: Markdown source to convert to HTML
@@ -215,6 +267,12 @@ def render_markdown(text, escape_latex_math=True, md=None, **kwargs):
         :param kwargs: Extra arguments to pass on to the markdown
                        processor
     """
+    if md is None and not callable(escape_latex_math):
+        return _render_cached(_render_markdown, text, escape_latex_math, **kwargs)
+    return _render_markdown(text, escape_latex_math, md, **kwargs)
+
+
+def _render_markdown(text, escape_latex_math=True, md=None, **kwargs):
     if escape_latex_math:
         math_segments = []
 
@@ -557,6 +615,10 @@ def sanitize_email(email, require_valid=False):
 
 
 def sanitize_html(string):
+    return _render_cached(_sanitize_html, string)
+
+
+def _sanitize_html(string):
     return bleach.clean(string, tags=BLEACH_ALLOWED_TAGS_HTML, attributes=BLEACH_ALLOWED_ATTRIBUTES_HTML,
                         styles=BLEACH_ALLOWED_STYLES_HTML)
 
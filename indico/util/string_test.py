@@ -10,9 +10,10 @@ from itertools import count
 
 import pytest
 
+from indico.util.caching import LRUCache
 from indico.util.string import (camelize, camelize_keys, crc32, format_repr, html_to_plaintext, make_unique_token,
-                                normalize_phone_number, render_markdown, sanitize_email, seems_html, slugify, snakify,
-                                snakify_keys, strip_tags, text_to_repr, to_unicode)
+                                normalize_phone_number, render_markdown, sanitize_email, sanitize_html, seems_html,
+                                slugify, snakify, snakify_keys, strip_tags, text_to_repr, to_unicode)
 
 
 def test_seems_html():
@@ -226,3 +227,32 @@ def test_html_to_plaintext(input, output):
 ))
 def test_markdown(input, output):
     assert render_markdown(input,  extensions=('tables',)) == output
+
+
+def test_render_cached(mocker):
+    mocker.patch('indico.util.string._render_cache', LRUCache(1))
+    markdown = mocker.patch('indico.util.string.markdown.markdown', side_effect=lambda text, **kw: text.upper())
+    assert render_markdown('cached text') == 'CACHED TEXT'
+    assert render_markdown('cached text') == 'CACHED TEXT'
+    assert markdown.call_count == 1
+    # different arguments or content are rendered again
+    assert render_markdown('cached text', extensions=('nl2br',)) == 'CACHED TEXT'
+    assert render_markdown('other text') == 'OTHER TEXT'
+    assert markdown.call_count == 3
+    # only the most recently used text is kept
+    assert render_markdown('cached text') == 'CACHED TEXT'
+    assert markdown.call_count == 4
+
+
+def test_render_cached_shared(mocker):
+    shared_cache = mocker.patch('indico.util.string._get_render_cache_shared').return_value
+    shared_cache.get.return_value = None
+    # short texts are only cached in memory
+    assert sanitize_html('<b>short</b><script>') == '<b>short</b>&lt;script&gt;'
+    assert not shared_cache.get.called
+    assert not shared_cache.set.called
+    long_text = 'x' * 1000
+    assert sanitize_html(long_text + '<script>') == long_text + '&lt;script&gt;'
+    assert shared_cache.set.call_args[0][1] == long_text + '&lt;script&gt;'
+    shared_cache.get.return_value = 'from cache'
+    assert sanitize_html('y' * 1000) == 'from cache'
@@ -12,11 +12,15 @@ from datetime import date, timedelta
 
 from sqlalchemy.orm import joinedload, load_only
 
+from indico.core.db import db
 from indico.modules.events import Event
-from indico.modules.events.abstracts.util import get_events_with_abstract_persons
-from indico.modules.events.contributions.util import get_events_with_linked_contributions
-from indico.modules.events.registration.util import get_events_registered
-from indico.modules.events.surveys.util import get_events_with_submitted_surveys
+from indico.modules.events.abstracts.models.abstracts import Abstract, AbstractState
+from indico.modules.events.contributions import Contribution
+from indico.modules.events.contributions.models.principals import ContributionPrincipal
+from indico.modules.events.registration.models.forms import RegistrationForm
+from indico.modules.events.registration.models.registrations import Registration
+from indico.modules.events.surveys.models.submissions import SurveySubmission
+from indico.modules.events.surveys.models.surveys import Survey
 from indico.util.date_time import now_utc, utc_to_server
 from indico.util.struct.iterables import window
 
@@ -43,7 +47,42 @@ def _query_categ_events(categ, start_dt, end_dt):
             .options(load_only('id', 'start_dt', 'end_dt')))
 
 
-def _get_category_score(user, categ, attended_events, debug=False):
+class _CategoryEvents(object):
+    """Provide the events in a category for calculating scores.
+
+    By default each lookup results in a database query.  When scores
+    are calculated for many users at once, the events of each category
+    are loaded only once and then filtered in memory.
+    """
+
+    def __init__(self, cache=False):
+        self.cache = {} if cache else None
+
+    def _get_all(self, categ):
+        try:
+            return self.cache[categ]
+        except KeyError:
+            events = (Event.query
+                      .with_parent(categ)
+                      .options(load_only('id', 'start_dt', 'end_dt'))
+                      .order_by(Event.start_dt, Event.id)
+                      .all())
+            self.cache[categ] = events
+            return events
+
+    def get(self, categ, start_dt, end_dt, event_ids=None):
+        if self.cache is None:
+            query = _query_categ_events(categ, start_dt, end_dt)
+            if event_ids is not None:
+                query = query.filter(Event.id.in_(event_ids))
+            return query.all()
+        return [e for e in self._get_all(categ)
+                if e.happens_between(start_dt, end_dt) and (event_ids is None or e.id in event_ids)]
+
+
+def _get_category_score(user, categ, attended_events, debug=False, categ_events=None):
+    if categ_events is None:
+        categ_events = _CategoryEvents()
     if debug:
         print(repr(categ))
     # We care about events in the whole timespan where the user attended some events.
@@ -52,7 +91,7 @@ def _get_category_score(user, categ, attended_events, debug=False):
     # to the start time of the newest block)
     first_event_date = attended_events[0].start_dt.replace(hour=0, minute=0)
     last_event_date = attended_events[-1].start_dt.replace(hour=0, minute=0) + timedelta(days=1)
-    blocks = _get_blocks(_query_categ_events(categ, first_event_date, last_event_date), attended_events)
+    blocks = _get_blocks(categ_events.get(categ, first_event_date, last_event_date), attended_events)
     for a, b in window(blocks):
         # More than 3 months between blocks? Ignore the old block!
         if b[0].start_dt - a[-1].start_dt > timedelta(weeks=12):
@@ -64,14 +103,14 @@ def _get_category_score(user, categ, attended_events, debug=False):
         print('{0:+.3f} - initial'.format(score))
     # Attendance percentage goes to the score directly. If the attendance is high chances are good that the user
     # is either very interested in whatever goes on in the category or it's something he has to attend regularily.
-    total = _query_categ_events(categ, first_event_date, last_event_date).count()
+    total = len(categ_events.get(categ, first_event_date, last_event_date))
     if total:
         attended_block_event_count = sum(1 for e in attended_events if e.start_dt >= first_event_date)
         score += attended_block_event_count / total
     if debug:
         print('{0:+.3f} - attendance'.format(score))
     # If there are lots/few unattended events after the last attended one we also update the score with that
-    total_after = _query_categ_events(categ, last_event_date + timedelta(days=1), None).count()
+    total_after = len(categ_events.get(categ, last_event_date + timedelta(days=1), None))
     if total_after < total * 0.05:
         score += 0.25
     elif total_after > total * 0.25:
@@ -88,9 +127,7 @@ def _get_category_score(user, categ, attended_events, debug=False):
         print('{0:+.3f} - days since last event'.format(score))
     # For events in the future however we raise the score
     now_local = utc_to_server(now_utc())
-    attending_future = (_query_categ_events(categ, now_local, last_event_date)
-                        .filter(Event.id.in_(e.id for e in attended_events))
-                        .all())
+    attending_future = categ_events.get(categ, now_local, last_event_date, {e.id for e in attended_events})
     if attending_future:
         score += 0.25 * len(attending_future)
         if debug:
@@ -102,26 +139,85 @@ def _get_category_score(user, categ, attended_events, debug=False):
     return score
 
 
-def get_category_scores(user, debug=False):
+def _get_attended_event_ids(user_ids):
+    """Get the events which users likely attended.
+
+    :param user_ids: A collection of user ids
+    :return: A dict mapping user ids to sets of event ids
+    """
     # XXX: check if we can add some more roles such as 'contributor' to assume attendance
-    event_ids = set()
-    event_ids.update(id_
-                     for id_, roles in get_events_with_abstract_persons(user).iteritems()
-                     if 'abstract_submitter' in roles)
-    event_ids.update(id_
-                     for id_, roles in get_events_with_linked_contributions(user).iteritems()
-                     if 'contribution_submission' in roles)
-    event_ids |= get_events_registered(user)
-    event_ids |= get_events_with_submitted_surveys(user)
-    if not event_ids:
-        return {}
-    attended = (Event.query
-                .filter(Event.id.in_(event_ids), ~Event.is_deleted)
-                .options(joinedload('category'))
-                .order_by(Event.start_dt, Event.id)
-                .all())
-    categ_events = defaultdict(list)
-    for event in attended:
-        categ_events[event.category].append(event)
-    return dict((categ, _get_category_score(user, categ, events, debug))
-                for categ, events in categ_events.iteritems())
+    bad_abstract_states = {AbstractState.withdrawn, AbstractState.rejected}
+    queries = [
+        # abstract submitters
+        (db.session.query(Abstract.submitter_id, Abstract.event_id)
+         .join(Abstract.event)
+         .filter(Abstract.submitter_id.in_(user_ids),
+                 ~Abstract.is_deleted,
+                 ~Abstract.state.in_(bad_abstract_states),
+                 ~Event.is_deleted)),
+        # contribution submitters
+        (db.session.query(ContributionPrincipal.user_id, Contribution.event_id)
+         .join(ContributionPrincipal.contribution)
+         .join(Contribution.event)
+         .filter(ContributionPrincipal.user_id.in_(user_ids),
+                 ContributionPrincipal.permissions.any('submit'),
+                 ~Contribution.is_deleted,
+                 ~Event.is_deleted)),
+        # registrants
+        (db.session.query(Registration.user_id, RegistrationForm.event_id)
+         .join(Registration.registration_form)
+         .join(RegistrationForm.event)
+         .filter(Registration.user_id.in_(user_ids),
+                 Registration.is_active,
+                 ~RegistrationForm.is_deleted,
+                 ~Event.is_deleted)),
+        # survey participants
+        (db.session.query(SurveySubmission.user_id, Survey.event_id)
+         .join(SurveySubmission.survey)
+         .join(Survey.event)
+         .filter(SurveySubmission.user_id.in_(user_ids),
+                 ~Survey.is_deleted,
+                 ~Event.is_deleted)),
+    ]
+    event_ids = defaultdict(set)
+    for query in queries:
+        for user_id, event_id in query:
+            event_ids[user_id].add(event_id)
+    return event_ids
+
+
+def get_category_scores_for_users(users, debug=False):
+    """Calculate the category scores for multiple users at once.
+
+    The events relevant for the users are loaded in bulk and the
+    events of each category are only loaded once, no matter how many
+    of the users attended events in it.
+
+    :param users: A collection of users
+    :return: A dict mapping each user to a dict containing the
+             category scores of that user
+    """
+    attended_ids = _get_attended_event_ids({u.id for u in users})
+    all_event_ids = set().union(*attended_ids.values())
+    if not all_event_ids:
+        return {user: {} for user in users}
+    events = (Event.query
+              .filter(Event.id.in_(all_event_ids), ~Event.is_deleted)
+              .options(joinedload('category'))
+              .order_by(Event.start_dt, Event.id)
+              .all())
+    categ_events = _CategoryEvents(cache=(len(users) > 1))
+    scores = {}
+    for user in users:
+        user_event_ids = attended_ids.get(user.id, set())
+        attended_by_categ = defaultdict(list)
+        for event in events:
+            if event.id in user_event_ids:
+                attended_by_categ[event.category].append(event)
+        scores[user] = {categ: _get_category_score(user, categ, attended, debug, categ_events=categ_events)
+                        for categ, attended in attended_by_categ.iteritems()}
+    return scores
+
+
+def get_category_scores(user, debug=False):
+    return get_category_scores_for_users([user], debug=debug)[user]
@@ -0,0 +1,187 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import absolute_import, unicode_literals
+
+import struct
+import zlib
+from contextlib import closing
+from datetime import datetime
+
+from flask import current_app, stream_with_context
+
+from indico.web.flask.util import make_content_disposition_args
+
+
+#: The size of the chunks in which the files are read
+ZIP_CHUNK_SIZE = 1024 * 1024
+#: Sizes and offsets above this limit require the ZIP64 extensions
+ZIP64_LIMIT = (1 << 31) - 1
+#: Archives with more entries require the ZIP64 extensions
+ZIP_FILECOUNT_LIMIT = 0xFFFF
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP_VERSION = 20
+_ZIP64_VERSION = 45
+
+
+class _ZipEntry(object):
+    def __init__(self, name, dt, offset, zip64, compress):
+        try:
+            self.name = name.encode('ascii')
+            self.flags = _FLAG_DATA_DESCRIPTOR
+        except UnicodeEncodeError:
+            self.name = name.encode('utf-8')
+            self.flags = _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8
+        self.dos_date = (dt.year - 1980) << 9 | dt.month << 5 | dt.day
+        self.dos_time = dt.hour << 11 | dt.minute << 5 | dt.second // 2
+        self.offset = offset
+        self.zip64 = zip64
+        self.method = _ZIP_DEFLATED if compress else _ZIP_STORED
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+    @property
+    def version(self):
+        return _ZIP64_VERSION if self.zip64 or self.offset > ZIP64_LIMIT else _ZIP_VERSION
+
+    def local_header(self):
+        extra = struct.pack(b'<HHQQ', 1, 16, 0, 0) if self.zip64 else b''
+        size = 0xFFFFFFFF if self.zip64 else 0
+        return struct.pack(b'<4s2B4HL2L2H', b'PK\x03\x04', self.version, 0, self.flags, self.method,
+                           self.dos_time, self.dos_date, 0, size, size, len(self.name), len(extra)) + self.name + extra
+
+    def iter_data(self, fileobj):
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) if self.method else None
+        while True:
+            data = fileobj.read(ZIP_CHUNK_SIZE)
+            if not data:
+                break
+            self.crc = zlib.crc32(data, self.crc)
+            self.file_size += len(data)
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                self.compress_size += len(data)
+                yield data
+        if compressor:
+            data = compressor.flush()
+            self.compress_size += len(data)
+            yield data
+        self.crc &= 0xFFFFFFFF
+
+    def data_descriptor(self):
+        if self.zip64:
+            return struct.pack(b'<4sLQQ', b'PK\x07\x08', self.crc, self.compress_size, self.file_size)
+        return struct.pack(b'<4sLLL', b'PK\x07\x08', self.crc, self.compress_size, self.file_size)
+
+    def central_directory_record(self):
+        file_size, compress_size, offset = self.file_size, self.compress_size, self.offset
+        extra_values = []
+        if file_size > ZIP64_LIMIT:
+            extra_values.append(file_size)
+            file_size = 0xFFFFFFFF
+        if compress_size > ZIP64_LIMIT:
+            extra_values.append(compress_size)
+            compress_size = 0xFFFFFFFF
+        if offset > ZIP64_LIMIT:
+            extra_values.append(offset)
+            offset = 0xFFFFFFFF
+        extra = b''
+        if extra_values:
+            extra = struct.pack(b'<HH{}Q'.format(len(extra_values)).encode('ascii'), 1, 8 * len(extra_values),
+                                *extra_values)
+        return struct.pack(b'<4s4B4HL2L5H2L', b'PK\x01\x02', self.version, 3, self.version, 0, self.flags,
+                           self.method, self.dos_time, self.dos_date, self.crc, compress_size, file_size,
+                           len(self.name), len(extra), 0, 0, 0, 0o644 << 16, offset) + self.name + extra
+
+
+class ZipStream(object):
+    """A ZIP archive which is generated while it is being sent.
+
+    The files are read in chunks and the CRC and sizes of each file
+    are written after its data, so memory usage does not depend on
+    the size of the files and nothing needs to be written to disk.
+    Iterating over the object yields the data of the archive.
+
+    :param compress: Whether to compress the files.  It makes sense to
+                     disable it when most files are already compressed.
+    """
+
+    def __init__(self, compress=True):
+        self.compress = compress
+        self._files = []
+
+    def add_file(self, name, open_file, size, dt=None):
+        """Add a file to the archive.
+
+        :param name: The path of the file within the archive.
+        :param open_file: A callable returning a file-like object with
+                          the data of the file.  It is only called once
+                          the file is written to the archive.
+        :param size: The size of the file in bytes; used to decide
+                     whether the ZIP64 extensions are needed.
+        :param dt: The modification time of the file.
+        """
+        self._files.append((name, open_file, size, dt or datetime.now()))
+
+    def __iter__(self):
+        offset = 0
+        entries = []
+        for name, open_file, size, dt in self._files:
+            # compressed data may be slightly larger than the original one
+            entry = _ZipEntry(name, dt, offset, zip64=(size * 1.05 > ZIP64_LIMIT), compress=self.compress)
+            header = entry.local_header()
+            offset += len(header)
+            yield header
+            with closing(open_file()) as f:
+                for chunk in entry.iter_data(f):
+                    offset += len(chunk)
+                    yield chunk
+            if not entry.zip64 and max(entry.file_size, entry.compress_size) > ZIP64_LIMIT:
+                raise ValueError('File {} is larger than expected'.format(name))
+            descriptor = entry.data_descriptor()
+            offset += len(descriptor)
+            yield descriptor
+            entries.append(entry)
+
+        cd_offset = offset
+        for entry in entries:
+            record = entry.central_directory_record()
+            offset += len(record)
+            yield record
+        yield self._end_records(len(entries), cd_offset, offset - cd_offset)
+
+    def _end_records(self, count, cd_offset, cd_size):
+        data = b''
+        if count > ZIP_FILECOUNT_LIMIT or cd_offset > ZIP64_LIMIT or cd_size > ZIP64_LIMIT:
+            zip64_offset = cd_offset + cd_size
+            data += struct.pack(b'<4sQ2H2L4Q', b'PK\x06\x06', 44, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0, count, count,
+                                cd_size, cd_offset)
+            data += struct.pack(b'<4sLQL', b'PK\x06\x07', 0, zip64_offset, 1)
+            count = min(count, ZIP_FILECOUNT_LIMIT)
+            cd_offset = min(cd_offset, 0xFFFFFFFF)
+            cd_size = min(cd_size, 0xFFFFFFFF)
+        return data + struct.pack(b'<4s4H2LH', b'PK\x05\x06', 0, 0, count, count, cd_size, cd_offset, 0)
+
+
+def send_zip_stream(filename, zip_stream):
+    """Send a ZIP archive which is generated while it is being sent.
+
+    :param filename: The name of the downloaded file.
+    :param zip_stream: A :class:`ZipStream`.
+    """
+    rv = current_app.response_class(stream_with_context(iter(zip_stream)), mimetype='application/zip',
+                                    direct_passthrough=True)
+    rv.headers.add('Content-Disposition', 'attachment', **make_content_disposition_args(filename))
+    rv.cache_control.private = True
+    rv.cache_control.no_cache = True
+    return rv
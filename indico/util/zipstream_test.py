@@ -0,0 +1,78 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+import os
+from datetime import datetime
+from io import BytesIO
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from indico.util.zipstream import ZipStream
+
+
+def _make_stream(files, compress=True):
+    stream = ZipStream(compress=compress)
+    for name, data in files:
+        stream.add_file(name, lambda data=data: BytesIO(data), len(data), datetime(2020, 3, 14, 15, 9, 26))
+    return stream
+
+
+@pytest.mark.parametrize('compress', (True, False))
+def test_zip_stream(compress):
+    files = [('a.txt', b'hello world' * 1000), ('folder/b.bin', os.urandom(5000)), ('empty', b''),
+             ('f\xfc\xdfe.txt', b'unicode')]
+    data = b''.join(_make_stream(files, compress))
+    with ZipFile(BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [name for name, __ in files]
+        for name, content in files:
+            assert zf.read(name) == content
+        info = zf.getinfo('a.txt')
+        assert info.compress_type == (ZIP_DEFLATED if compress else ZIP_STORED)
+        assert info.date_time == (2020, 3, 14, 15, 9, 26)
+
+
+def test_zip_stream_reads_lazily():
+    opened = []
+
+    def _open(name):
+        opened.append(name)
+        return BytesIO(b'data')
+
+    stream = ZipStream()
+    stream.add_file('a', lambda: _open('a'), 4)
+    stream.add_file('b', lambda: _open('b'), 4)
+    chunks = iter(stream)
+    assert not opened
+    next(chunks)
+    assert not opened
+    next(chunks)
+    assert opened == ['a']
+    list(chunks)
+    assert opened == ['a', 'b']
+
+
+def test_zip_stream_zip64(mocker):
+    mocker.patch('indico.util.zipstream.ZIP64_LIMIT', 100)
+    mocker.patch('indico.util.zipstream.ZIP_FILECOUNT_LIMIT', 2)
+    files = [('file{}'.format(i), os.urandom(120)) for i in xrange(3)]
+    data = b''.join(_make_stream(files, compress=False))
+    with ZipFile(BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        for name, content in files:
+            assert zf.read(name) == content
+
+
+def test_zip_stream_unexpected_size(mocker):
+    mocker.patch('indico.util.zipstream.ZIP64_LIMIT', 100)
+    stream = ZipStream(compress=False)
+    stream.add_file('file', lambda: BytesIO(b'x' * 200), 10)
+    with pytest.raises(ValueError):
+        list(stream)
@@ -8,6 +8,8 @@
 from __future__ import unicode_literals
 
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from flask import g, request_started
 from sqlalchemy.engine import Engine
@@ -21,6 +23,27 @@ def request_stats_request_started():
     g.query_count = 0
     g.query_duration = 0
     g.req_start_ts = time.time()
+    g.req_phases = OrderedDict()
+
+
+@contextmanager
+def request_stats_phase(name):
+    """Measure the time and queries spent in a phase of the request.
+
+    The results are available in the ``phases`` of the request stats.
+    If a phase runs more than once, the values are added up.
+    """
+    if not g.get('request_stats_initialized'):
+        yield
+        return
+    start_ts = time.time()
+    start_query_count = g.query_count
+    try:
+        yield
+    finally:
+        phase = g.req_phases.setdefault(name, {'duration': 0, 'query_count': 0})
+        phase['duration'] += time.time() - start_ts
+        phase['query_count'] += g.query_count - start_query_count
 
 
 def setup_request_stats(app):
@@ -48,5 +71,6 @@ def get_request_stats():
     return {
         'query_count': g.query_count if initialized else 0,
         'query_duration': g.query_duration if initialized else 0,
-        'req_duration': (time.time() - g.req_start_ts) if initialized else 0
+        'req_duration': (time.time() - g.req_start_ts) if initialized else 0,
+        'phases': g.req_phases if initialized else {}
     }
@@ -0,0 +1,32 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2020 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from __future__ import unicode_literals
+
+from indico.modules.users import User
+from indico.web.flask.stats import get_request_stats, request_stats_phase, request_stats_request_started
+
+
+def test_request_stats_phase(db, request_context, dummy_user):
+    request_stats_request_started()
+    with request_stats_phase('process_args'):
+        User.query.all()
+    with request_stats_phase('process'):
+        pass
+    with request_stats_phase('process_args'):
+        User.query.all()
+    phases = get_request_stats()['phases']
+    assert phases.keys() == ['process_args', 'process']
+    assert phases['process_args']['query_count'] == 2
+    assert phases['process']['query_count'] == 0
+    assert phases['process_args']['duration'] > 0
+
+
+def test_request_stats_phase_not_initialized(request_context):
+    with request_stats_phase('process'):
+        pass
+    assert get_request_stats()['phases'] == {}
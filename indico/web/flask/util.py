@@ -73,9 +73,22 @@ def make_view_func(obj):
     """Turns an object in to a view function.
 
     This function is called on each view_func passed to IndicoBlueprint.add_url_route().
-    It handles RH classes and normal functions.
+    It handles RH classes and normal functions.  A ``'module:name'`` string
+    may be used instead of the RH class or function itself; in this case the
+    module is only imported when the view is used for the first time, which
+    keeps rarely used modules from slowing down the app startup.
     """
-    if inspect.isclass(obj):
+    if isinstance(obj, basestring):
+        module_name, _, name = obj.partition(':')
+        if not module_name or not name:
+            raise ValueError('Unexpected lazy view func: %r' % obj)
+
+        def wrapper(**kwargs):
+            return make_view_func(getattr(import_module(module_name), name))(**kwargs)
+
+        wrapper.__name__ = str(name)
+        return wrapper
+    elif inspect.isclass(obj):
         # Some class
         if hasattr(obj, 'process'):
             # Indico RH
@@ -251,7 +264,7 @@ def make_content_disposition_args(attachment_filename):
 
 
 def send_file(name, path_or_fd, mimetype, last_modified=None, no_cache=True, inline=None, conditional=False, safe=True,
-              **kwargs):
+              etag=None, **kwargs):
     """Sends a file to the user.
 
     `name` is required and should be the filename visible to the user.
@@ -266,6 +279,8 @@ def send_file(name, path_or_fd, mimetype, last_modified=None, no_cache=True, inl
     the file only if it has been modified (based on mtime and size).
     `safe` adds some basic security features such a adding a content-security-policy and forcing inline=False for
     text/html mimetypes
+    `etag` may contain an ETag (e.g. the hash of the file) to use instead of the one based on mtime and size. When it
+    is set, the response is always conditional and supports range requests.
     """
 
     name = re.sub(r'\s+', ' ', name).strip()  # get rid of crap like linebreaks
@@ -281,7 +296,7 @@ def send_file(name, path_or_fd, mimetype, last_modified=None, no_cache=True, inl
         inline = False
     try:
         rv = _send_file(path_or_fd, mimetype=mimetype, as_attachment=not inline, attachment_filename=name,
-                        conditional=conditional, **kwargs)
+                        conditional=(conditional and etag is None), add_etags=(etag is None), **kwargs)
     except IOError:
         if not current_app.debug:
             raise
@@ -292,7 +307,7 @@ def send_file(name, path_or_fd, mimetype, last_modified=None, no_cache=True, inl
         # send_file does not add this header if as_attachment is False
         rv.headers.add('Content-Disposition', 'inline', **make_content_disposition_args(name))
     if last_modified:
-        if not isinstance(last_modified, int):
+        if not isinstance(last_modified, int) and getattr(last_modified, 'tzinfo', None) is None:
             last_modified = int(time.mktime(last_modified.timetuple()))
         rv.last_modified = last_modified
     if no_cache:
@@ -301,6 +316,38 @@ def send_file(name, path_or_fd, mimetype, last_modified=None, no_cache=True, inl
         rv.cache_control.public = False
         rv.cache_control.private = True
         rv.cache_control.no_cache = True
+    if etag is not None:
+        rv = make_conditional_response(rv, etag)
+    return rv
+
+
+def make_conditional_response(rv, etag=None, last_modified=None):
+    """Makes a file response conditional and adds range support.
+
+    Requests with a matching ``If-None-Match`` or ``If-Modified-Since``
+    header get an empty 304 response and requests containing a ``Range``
+    header only get the requested part of the file.  When the file is
+    sent using ``X-Sendfile``, ranges are left to the web server.
+
+    :param rv: A response containing the full file.  Any other response
+               (e.g. a redirect) is returned unchanged.
+    :param etag: The ETag of the file, usually its hash.
+    :param last_modified: A datetime or unix timestamp indicating when
+                          the file was last modified.
+    """
+    if rv.status_code != 200:
+        return rv
+    if etag:
+        rv.set_etag(etag)
+    if last_modified:
+        rv.last_modified = last_modified
+    if 'X-Sendfile' in rv.headers:
+        # the web server sends the whole file, so it also needs to handle ranges
+        rv = rv.make_conditional(request)
+    else:
+        rv = rv.make_conditional(request, accept_ranges=True, complete_length=rv.content_length)
+    if rv.status_code == 304:
+        rv.headers.pop('X-Sendfile', None)
     return rv
 
 
@@ -7,9 +7,11 @@
 
 from __future__ import unicode_literals
 
+import sys
+
 import pytest
 
-from indico.web.flask.util import endpoint_for_url
+from indico.web.flask.util import endpoint_for_url, make_view_func
 
 
 @pytest.mark.parametrize(('base_url', 'url', 'endpoint'), (
@@ -27,3 +29,19 @@ def test_endpoint_for_url(base_url, url, endpoint):
     else:
         assert data is not None
         assert data[0] == endpoint
+
+
+def test_make_view_func_lazy(mocker):
+    module = mocker.Mock(view=mocker.Mock(return_value='rv'))
+    mocker.patch.dict(sys.modules, {'indico_lazy_view_test': module})
+    view_func = make_view_func('indico_lazy_view_test:view')
+    assert view_func.__name__ == 'view'
+    assert not module.view.called
+    assert view_func(foo='bar') == 'rv'
+    module.view.assert_called_once_with(foo='bar')
+
+
+@pytest.mark.parametrize('name', ('foo', 'foo:', ':bar'))
+def test_make_view_func_lazy_invalid(name):
+    with pytest.raises(ValueError):
+        make_view_func(name)
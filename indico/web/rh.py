@@ -32,6 +32,7 @@ from indico.util import fossilize
 from indico.util.i18n import _
 from indico.util.locators import get_locator
 from indico.util.signals import values_from_signal
+from indico.web.flask.stats import get_request_stats, request_stats_phase
 from indico.web.flask.util import url_for
 from indico.web.util import is_signed_url_valid
 
@@ -215,19 +216,22 @@ class RH(object):
 
     def _do_process(self):
         try:
-            args_result = self._process_args()
-            signals.rh.process_args.send(type(self), rh=self, result=args_result)
+            with request_stats_phase('process_args'):
+                args_result = self._process_args()
+                signals.rh.process_args.send(type(self), rh=self, result=args_result)
             if isinstance(args_result, (current_app.response_class, Response)):
                 return args_result
         except NoResultFound:  # sqlalchemy .one() not finding anything
             raise NotFound(_('The specified item could not be found.'))
 
-        rv = self.normalize_url()
+        with request_stats_phase('normalize_url'):
+            rv = self.normalize_url()
         if rv is not None:
             return rv
 
-        self._check_access()
-        signals.rh.check_access.send(type(self), rh=self)
+        with request_stats_phase('check_access'):
+            self._check_access()
+            signals.rh.check_access.send(type(self), rh=self)
 
         signal_rv = values_from_signal(signals.rh.before_process.send(type(self), rh=self),
                                        single_value=True, as_list=True)
@@ -236,13 +240,14 @@ class RH(object):
         elif signal_rv:
             return signal_rv[0]
 
-        if config.PROFILE:
-            result = [None]
-            profile_path = os.path.join(config.TEMP_DIR, '{}-{}.prof'.format(type(self).__name__, time.time()))
-            cProfile.runctx('result[0] = self._process()', globals(), locals(), profile_path)
-            rv = result[0]
-        else:
-            rv = self._process()
+        with request_stats_phase('process'):
+            if config.PROFILE:
+                result = [None]
+                profile_path = os.path.join(config.TEMP_DIR, '{}-{}.prof'.format(type(self).__name__, time.time()))
+                cProfile.runctx('result[0] = self._process()', globals(), locals(), profile_path)
+                rv = result[0]
+            else:
+                rv = self._process()
 
         signal_rv = values_from_signal(signals.rh.process.send(type(self), rh=self, result=rv),
                                        single_value=True, as_list=True)
@@ -263,7 +268,8 @@ class RH(object):
         sentry_set_tags({'rh': self.__class__.__name__})
 
         if self.EVENT_FEATURE is not None:
-            self._check_event_feature()
+            with request_stats_phase('check_event_feature'):
+                self._check_event_feature()
 
         logger.info('%s %s [IP=%s] [PID=%s] [UID=%r]',
                     request.method, request.relative_url, request.remote_addr, os.getpid(), session.get('_user_id'))
@@ -271,7 +277,8 @@ class RH(object):
         try:
             fossilize.clearCache()
             init_email_queue()
-            self._check_csrf()
+            with request_stats_phase('check_csrf'):
+                self._check_csrf()
             res = self._do_process()
             signals.after_process.send()
 
@@ -288,7 +295,7 @@ class RH(object):
             # within the indico layout may trigger an auto-flush
             db.session.rollback()
             raise
-        logger.debug('Request successful')
+        logger.debug('Request successful (%s)', _format_request_phases(get_request_stats()['phases']))
 
         if res is None:
             # flask doesn't accept None but we might be returning it in some places...
@@ -300,6 +307,11 @@ class RH(object):
         return response
 
 
+def _format_request_phases(phases):
+    return ', '.join('{}: {:.0f}ms/{}q'.format(name, phase['duration'] * 1000, phase['query_count'])
+                     for name, phase in phases.iteritems())
+
+
 class RHSimple(RH):
     """A simple RH that calls a function to build the response
 